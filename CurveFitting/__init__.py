@@ -1,5 +1,64 @@
 """
     CurveFitting
 
+    Submodules, and their principal classes and functions, are imported lazily on first access,
+    such that fitting alone never imports sympy or plotly.
+
 """
+import importlib
+
 __version__ = "v0.0.1"
+
+_submodules = (
+    "batch",
+    "cache",
+    "core",
+    "dataframes",
+    "expressions",
+    "global_fit",
+    "goodness_of_fit",
+    "multistart",
+    "parallel",
+    "plotting",
+    "reports",
+    "resampling",
+    "selection",
+    "streaming",
+    "telemetry",
+    "utils",
+)
+
+_attributes = dict(
+    BatchGoodness="batch",
+    KernelCache="cache",
+    Equation="core",
+    fit_grouped="dataframes",
+    Expression="expressions",
+    GlobalGoodness="global_fit",
+    Goodness="goodness_of_fit",
+    summarize="goodness_of_fit",
+    MultiStart="multistart",
+    fit_many="parallel",
+    Plotting="plotting",
+    render_reports="reports",
+    Bootstrap="resampling",
+    bootstrap="resampling",
+    select_model="selection",
+    StreamingGoodness="streaming",
+    FitInfo="telemetry",
+    Telemetry="telemetry",
+)
+
+__all__ = [*_submodules, *_attributes]
+
+
+def __getattr__(name: str):
+    if name in _submodules:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _attributes:
+        return getattr(importlib.import_module(f".{_attributes[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,286 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/batch.py
+
+"""
+# Python Dependencies
+import numpy as np
+
+from typing import Optional, Tuple
+
+from .core import Equation
+from .goodness_of_fit import Summary, summarize
+
+
+class BatchGoodness:
+    """Goodness of Fit for Many Curves Sharing One Equation, Fit Simultaneously.
+
+    Args:
+        equation (Equation): Equation describing every curve
+        xdata (np.ndarray): Observed X Values, shape (n_curves, n_points) or (n_points,)
+        ydata (np.ndarray): Observed Y Values, shape (n_curves, n_points)
+        yerror (np.ndarray): Observed Error (standard deviation) in Y Values, same shape as ydata
+        best_fit (np.ndarray): Best Fit parameters, shape (n_curves, k)
+        covariance (np.ndarray): Covariance Matrices, shape (n_curves, k, k)
+
+    Notes:
+        Ragged data are supported by padding with NaN; any point with a non-finite x, y, or
+        yerror value is excluded from its curve. Every curve is solved at once with a vectorized
+        Levenberg-Marquardt loop, where curves drop out of the computation as they converge.
+        Curves failing to converge are reported with NaN best fit and covariance, as in Goodness.
+
+    """
+    def __init__(self,
+                 equation: Equation,
+                 xdata: np.ndarray,
+                 ydata: np.ndarray,
+                 yerror: Optional[np.ndarray] = None,
+                 best_fit: Optional[np.ndarray] = None,
+                 covariance: Optional[np.ndarray] = None,
+                 ) -> None:
+        self.equation = equation
+        self.ydata = np.atleast_2d(np.asarray(ydata, dtype=float))
+        self.xdata = np.broadcast_to(np.asarray(xdata, dtype=float), self.ydata.shape)
+        self.yerror = yerror if yerror is None else np.broadcast_to(
+            np.asarray(yerror, dtype=float), self.ydata.shape
+        )
+
+        self.best_fit = best_fit
+        self.covariance = covariance
+        self.converged = None
+        self.iterations = None
+
+    @property
+    def mask(self) -> np.ndarray:
+        """Valid (finite) observations of each curve."""
+        valid = np.isfinite(self.xdata) & np.isfinite(self.ydata)
+        if self.yerror is not None:
+            valid &= np.isfinite(self.yerror) & (self.yerror > 0)
+        return valid
+
+    def _prepare(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Observations with padding filled, and square root weights (zero where padded).
+
+        Padded x are filled with a valid x of the same curve, where the model (and its jacobian) is
+        as finite as on the observations, such that zero weights cancel padding without masking.
+
+        """
+        mask = self.mask
+        first = np.take_along_axis(self.xdata, np.argmax(mask, axis=1)[:, None], axis=1)
+        x = np.where(mask, self.xdata, np.where(np.isfinite(first), first, 0.0))
+        y = np.where(mask, self.ydata, 0.0)
+        if self.yerror is None:
+            weights = mask.astype(float)
+        else:
+            weights = np.where(mask, 1.0 / np.where(mask, self.yerror, 1.0), 0.0)
+        return x, y, weights
+
+    def _evaluate(self, x: np.ndarray, params: np.ndarray) -> np.ndarray:
+        return np.broadcast_to(self.equation.equation(x, *params.T[..., None]), x.shape)
+
+    def _residual(self, x, y, weights, params) -> np.ndarray:
+        """Weighted residuals, zero where padded."""
+        return (y - self._evaluate(x, params)) * weights
+
+    def _jacobian(self, x, weights, params) -> np.ndarray:
+        """Weighted model jacobian, zero where padded."""
+        return self.equation.jacobian(x, *params.T[..., None]) * weights[..., None]
+
+    def _initial(self, p0: Optional[np.ndarray]) -> np.ndarray:
+        n = self.ydata.shape[0]
+        if p0 is None and self.equation.expression.guess is not None:
+            p0 = self.equation.expression.initial_guess(self.xdata, self.ydata)
+        elif p0 is None:
+            p0 = np.ones(self.k)
+        return np.array(np.broadcast_to(np.asarray(p0, dtype=float), (n, self.k)))
+
+    @staticmethod
+    def _solve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        try:
+            return np.linalg.solve(a, b[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            # At least one singular system; fall back to least squares solutions
+            return (np.linalg.pinv(np.nan_to_num(a)) @ np.nan_to_num(b)[..., None])[..., 0]
+
+    def fit(self,
+            p0: Optional[np.ndarray] = None,
+            max_iterations: int = 200,
+            ftol: float = 1.5e-8,
+            xtol: float = 1.5e-8,
+            ) -> None:
+        """Fits every curve with a vectorized Levenberg-Marquardt algorithm.
+
+        Args:
+            p0 (np.ndarray): Initial parameters, shape (k,) or (n_curves, k), defaulting to the
+                expression's initial guess for each curve when available, otherwise ones
+            max_iterations (int): Maximum number of iterations
+            ftol (float): Relative tolerance on reduction in the sum of squares
+            xtol (float): Relative tolerance on step size of the parameters
+
+        """
+        x, y, weights = self._prepare()
+        params = self._initial(p0)
+        n = params.shape[0]
+
+        with np.errstate(all="ignore"):
+            residual = self._residual(x, y, weights, params)
+            cost = np.einsum("ij,ij->i", residual, residual)
+            damping = np.full(n, 1e-3)
+            active = np.isfinite(cost) & (self.dof >= self.k)
+            converged = np.zeros(n, dtype=bool)
+            iterations = np.zeros(n, dtype=int)
+
+            size = -1
+            for _ in range(max_iterations):
+                idx = np.flatnonzero(active)
+                if idx.size == 0:
+                    break
+                # Curves only ever leave the active set, whose observations are copied once per change
+                if idx.size != size:
+                    size, xa, ya, wa = idx.size, x[idx], y[idx], weights[idx]
+
+                pa = params[idx]
+                jac = self._jacobian(xa, wa, pa)
+                jt = jac.transpose(0, 2, 1)
+                a = jt @ jac
+                g = (jt @ residual[idx][..., None])[..., 0]
+
+                scale = np.maximum(np.diagonal(a, axis1=1, axis2=2), np.finfo(float).tiny)
+                a[:, np.arange(self.k), np.arange(self.k)] += damping[idx, None] * scale
+                step = self._solve(a, g)
+
+                trial = pa + step
+                trial_residual = self._residual(xa, ya, wa, trial)
+                trial_cost = np.einsum("ij,ij->i", trial_residual, trial_residual)
+                better = trial_cost < cost[idx]
+
+                reduction = cost[idx] - trial_cost
+                small_f = better & (reduction <= ftol * cost[idx])
+                small_x = better & (np.linalg.norm(step, axis=1) <= xtol * (np.linalg.norm(pa, axis=1) + xtol))
+
+                accepted = idx[better]
+                params[accepted] = trial[better]
+                residual[accepted] = trial_residual[better]
+                cost[accepted] = trial_cost[better]
+                damping[idx] = np.where(better, damping[idx] / 10, damping[idx] * 10)
+                iterations[idx] += 1
+
+                # Unable to improve further within numerical precision
+                stalled = (damping[idx] > 1e16) | (cost[idx] == 0)
+                done = small_f | small_x | stalled
+                converged[idx[done]] = True
+                active[idx[done]] = False
+
+            converged &= np.all(np.isfinite(params), axis=1)
+            idx = np.flatnonzero(converged)
+            a = self._jacobian(x[idx], weights[idx], params[idx])
+            a = a.transpose(0, 2, 1) @ a
+            finite = np.all(np.isfinite(a), axis=(1, 2))
+            converged[idx[~finite]] = False
+            idx, a = idx[finite], a[finite]
+
+            covariance = np.full((n, self.k, self.k), np.nan)
+            covariance[idx] = np.linalg.pinv(a)
+            covariance[idx] *= (cost[idx] / (self.dof[idx] - self.k))[:, None, None]
+
+        params[~converged] = np.nan
+        self.best_fit = params
+        self.covariance = covariance
+        self.converged = converged
+        self.iterations = iterations
+
+    def expect(self, x: np.ndarray) -> np.ndarray:
+        """Returns the Values Expected at x (per curve) for each curve's best fit parameters."""
+        x = np.broadcast_to(np.asarray(x, dtype=float), (self.best_fit.shape[0], np.shape(x)[-1]))
+        return self._evaluate(x, self.best_fit)
+
+    def summary(self) -> Summary:
+        """Summary of Goodness of Fit Statistics for every curve, as arrays."""
+        return summarize(self.residuals, self.ydata, self.k, self.yerror, self.covariance)
+
+    @property
+    def parameters(self) -> np.ndarray:
+        """Parameter names of the Equation."""
+        return np.asarray([c.name for c in self.equation.expression.constants])
+
+    @property
+    def std(self) -> np.ndarray:
+        """Standard Deviation (std) of Best Fit Parameters."""
+        return np.sqrt(np.diagonal(self.covariance, axis1=1, axis2=2))
+
+    @property
+    def expected(self) -> np.ndarray:
+        """Expected Value given best fit parameters, NaN where padded."""
+        with np.errstate(all="ignore"):
+            return np.where(self.mask, self.expect(self.xdata), np.nan)
+
+    @property
+    def residuals(self) -> np.ndarray:
+        """Residual Difference between Observed and Expected."""
+        return self.ydata - self.expected
+
+    @property
+    def ssr(self) -> np.ndarray:
+        """Sum of Squared Residuals (SSR)"""
+        return np.nansum(np.power(self.residuals, 2), axis=1)
+
+    @property
+    def dfm(self) -> np.ndarray:
+        """Distance from the Mean"""
+        y = np.where(self.mask, self.ydata, np.nan)
+        return y - np.nanmean(y, axis=1, keepdims=True)
+
+    @property
+    def sse(self) -> np.ndarray:
+        """Sum of Squared Error (SSE)."""
+        return np.nansum(np.power(self.dfm, 2), axis=1)
+
+    @property
+    def dof(self) -> np.ndarray:
+        """Degrees of Freedom (DOF), n"""
+        return self.mask.sum(axis=1)
+
+    @property
+    def k(self) -> int:
+        """Number of Parameters, k"""
+        return len(self.equation.expression.constants)
+
+    @property
+    def rmse(self) -> np.ndarray:
+        """Root Mean Squared Error (RMSE)"""
+        return (self.ssr / self.dof) ** 0.5
+
+    @property
+    def syx(self) -> np.ndarray:
+        """Alternative Form of RMSE, modifying degrees of freedom by number of fit variables"""
+        return (self.ssr / (self.dof - self.k)) ** 0.5
+
+    @property
+    def rsq(self) -> np.ndarray:
+        """Pearson's Correlation Coefficient, R-Squared"""
+        return 1.0 - (self.ssr / self.sse)
+
+    @property
+    def rsq_adj(self) -> np.ndarray:
+        """Adjusted R-Squared Value"""
+        return 1 - (1 - self.rsq) * (self.dof - 1.0) / (self.dof - self.k)
@@ -0,0 +1,151 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/cache.py
+
+"""
+# Python Dependencies
+import os
+import json
+import hashlib
+import tempfile
+
+import sympy as sm
+
+from typing import List, Optional
+
+from . import __version__
+from .expressions import Expression
+
+
+def default_directory() -> str:
+    """Cache Directory, configurable through the `CURVEFITTING_CACHE_DIR` environment variable."""
+    return os.environ.get(
+        "CURVEFITTING_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "CurveFitting"),
+    )
+
+
+class KernelCache:
+    """Content Addressed, On-Disk Cache of Lambdified Kernel Source Code.
+
+    Args:
+        directory (str): Location of cache entries, defaulting to `default_directory()`
+        max_size (int): Maximum total size (bytes) of entries, evicting the least recently used
+
+    Notes:
+        Each entry is a small json document holding the generated source, the sympy
+        representation, and the latex documentation of a single kernel. Entries are keyed on
+        the sympy representation of the expression, the backend modules, the kernel kind, and
+        both package and sympy versions. Writes are atomic (write to a temporary file, then
+        rename), such that many processes may safely share one cache directory.
+
+    """
+    __slots__ = ("directory", "max_size")
+
+    def __init__(self, directory: Optional[str] = None, max_size: int = 64 * 2 ** 20):
+        self.directory = directory or default_directory()
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(expression: Expression, backend: Optional[List[str]], kind: str) -> str:
+        """Content Address of a kernel."""
+        content = json.dumps([
+            sm.srepr(expression.expression),
+            backend,
+            kind,
+            __version__,
+            sm.__version__,
+        ])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        """Retrieve an entry, marking it as recently used. Returns None on a cache miss."""
+        path = self.path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """Atomically store an entry, evicting least recently used entries above max size."""
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(temp, self.path(key))
+        except OSError:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def _entries(self) -> List[os.DirEntry]:
+        with os.scandir(self.directory) as it:
+            return [i for i in it if i.name.endswith(".json")]
+
+    @property
+    def size(self) -> int:
+        """Total Size (bytes) of cache entries."""
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits within max size."""
+        stats = []
+        for entry in self._entries():
+            try:
+                stats.append((entry.stat().st_mtime, entry.stat().st_size, entry.path))
+            except OSError:
+                pass
+
+        total = sum(s[1] for s in stats)
+        for _, size, path in sorted(stats):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -24,18 +24,199 @@
 
 """
 # Python Dependencies
+import builtins
+import dis
+import functools
+import inspect
+import multiprocessing
+import threading
+
+import numpy as np
 import sympy as sm
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Union
 
+from .cache import KernelCache
+from . import expressions
 from .expressions import Expression
 
 
+# Default time budget in seconds of symbolic integration
+INTEGRATION_TIMEOUT = 10.0
+
+_namespaces: Dict[Optional[tuple], dict] = {}
+
+
+def _namespace(backend: Optional[List[str]]) -> dict:
+    """Global namespace lambdify would assign to a function generated for backend modules."""
+    key = None if backend is None else tuple(backend)
+    if key not in _namespaces:
+        _namespaces[key] = sm.lambdify((), 0, backend).__globals__
+    return _namespaces[key]
+
+
+def _integrate_into(connection, expression: sm.Expr, variables: List[sm.Symbol]) -> None:
+    """Send the sympy representation of an antiderivative through a connection (None on failure)."""
+    try:
+        connection.send(sm.srepr(sm.integrate(expression, *variables)))
+    except Exception:
+        connection.send(None)
+    finally:
+        connection.close()
+
+
+def _integrate(expression: sm.Expr,
+               variables: List[sm.Symbol],
+               timeout: Optional[float],
+               process: bool = False,
+               ) -> sm.Expr:
+    """Antiderivative of an expression, integrated symbolically within timeout seconds.
+
+    Args:
+        expression (sm.Expr): Expression to integrate
+        variables (List[sm.Symbol]): Variables of integration
+        timeout (float): Time budget in seconds, integrating without a bound if None
+        process (bool): Integrate in a child process, terminated once the budget is spent
+
+    Returns:
+        sm.Expr: Antiderivative, or an unevaluated sympy Integral if integration failed
+
+    Raises:
+        TimeoutError: If no antiderivative was found within the budget
+
+    Notes:
+        By default, integration runs in a daemon thread, which is waited upon for at most timeout
+        seconds, then abandoned (running on in the background until sympy returns). A child
+        process stops the work outright, but forks (or spawns, re-importing the main module) the
+        calling process, hence is opt-in. Daemonic processes (e.g. pool workers) may not have
+        children, and integrate in a thread instead.
+
+    """
+    unevaluated = sm.Integral(expression, *variables)
+    if timeout is None:
+        try:
+            return sm.integrate(expression, *variables)
+        except Exception:
+            return unevaluated
+
+    if not process or multiprocessing.current_process().daemon:
+        result = []
+
+        def integrate():
+            try:
+                result.append(sm.integrate(expression, *variables))
+            except Exception:
+                result.append(unevaluated)
+
+        thread = threading.Thread(target=integrate, name="integrate", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if not result:
+            raise TimeoutError(f"Integration exceeded {timeout} seconds: {expression}")
+        return result[0]
+
+    context = multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=_integrate_into, args=(sender, expression, variables), daemon=True)
+    child.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            raise TimeoutError(f"Integration exceeded {timeout} seconds: {expression}")
+        result = receiver.recv()
+    except EOFError:
+        result = None
+    finally:
+        receiver.close()
+        child.terminate()
+        child.join()
+
+    return unevaluated if result is None else sm.sympify(result)
+
+
+def _resolves(function: Callable) -> bool:
+    """Whether every global name referenced by a (lambdified) function is defined."""
+    return all(
+        i.argval in function.__globals__ or hasattr(builtins, i.argval)
+        for i in dis.get_instructions(function) if i.opname == "LOAD_GLOBAL"
+    )
+
+
+def _cumulative_simpson(y: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Cumulative Simpson's rule of y over (at least 3) strictly ascending x, starting from zero.
+
+    Intervals are integrated in pairs, each under the quadratic through its three points (and an
+    odd last interval under that through the two points before it), as by
+    scipy.integrate.cumulative_simpson, which requires SciPy 1.12 (Python 3.9) or later.
+
+    """
+    h1, h2 = np.diff(x[:-1]), np.diff(x[1:])
+    y0, y1, y2 = y[:-2], y[1:-1], y[2:]
+    # Integrals over the first, and the second interval of every three consecutive points
+    first = h1 / 6 * (y0 * (2 * h1 + 3 * h2) / (h1 + h2) + y1 * (h1 + 3 * h2) / h2 - y2 * h1 ** 2 / (h2 * (h1 + h2)))
+    second = h2 / 6 * (y2 * (3 * h1 + 2 * h2) / (h1 + h2) + y1 * (3 * h1 + h2) / h1 - y0 * h2 ** 2 / (h1 * (h1 + h2)))
+
+    intervals = np.empty(x.size - 1)
+    intervals[:-1:2] = first[::2]
+    intervals[1::2] = second[::2]
+    intervals[-1] = second[-1]
+    return np.concatenate([[0.0], np.cumsum(intervals)])
+
+
+def _cumulative(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Cumulative integral of y over (unordered) x, anchored at zero on the smallest x.
+
+    Integrated by cumulative Simpson's rule over the unique values of x in ascending order.
+
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    grid, first, inverse = np.unique(x.ravel(), return_index=True, return_inverse=True)
+    if grid.size < 2:
+        return np.zeros(x.shape)
+    if grid.size < 3:
+        values = np.array([0.0, 0.5 * (grid[1] - grid[0]) * (y.flat[first[0]] + y.flat[first[1]])])
+    else:
+        values = _cumulative_simpson(y.ravel()[first], grid)
+    return values[inverse].reshape(x.shape)
+
+
+def _fold(expression: Union[sm.Expr, List[sm.Expr]]) -> Union[sm.Expr, List[sm.Expr]]:
+    """Constant subexpressions (e.g. sqrt(2), pi/4, 1/3) evaluated into floating point literals."""
+    if isinstance(expression, (list, tuple)):
+        return [_fold(e) for e in expression]
+    return expression.evalf()
+
+
 class Equation:
     """Class to Handle Conversion to Derivative and Integral.
 
     Args:
         expression (Expression): Expression Class Interface
         backend (List[str]): Backend Modules used to evaluate the expression into a function.
+        cache (KernelCache): Optional on-disk cache of generated kernel source code.
+        integration_timeout (float): Time budget in seconds for symbolic integration (None is unbounded).
+        integration_process (bool): Bound symbolic integration in a child process, terminated once the
+            budget is spent, rather than in a thread abandoned to run on (see _integrate).
+        dtype (np.dtype): Floating point type of every evaluation (e.g. np.float32), None for numpy defaults.
+
+    Notes:
+        Only the equation itself is lambdified on construction. The derivative, second
+        derivative, and integral (both expression and function) are built on first access,
+        and cached on the instance thereafter.
+
+        When a cache is provided, generated kernels are first looked up from disk, skipping
+        symbolic differentiation, integration, and code generation entirely on a warm cache.
+
+        Expressions shipping a precomputed derivative or integral skip symbolic work altogether.
+        Otherwise, symbolic integration is bounded by integration_timeout. When no closed form
+        antiderivative is found (in time, or it cannot be evaluated by the backend), the integral
+        is computed numerically instead, by a cumulative Simpson's rule over the requested grid,
+        anchored at zero on its smallest value.
+
+        When a dtype is given, x and the parameters are cast to it before evaluation, and results
+        are returned as it, such that reduced precision inputs are not promoted to float64 (by
+        float64 parameters, or numpy constants within the generated code). Constant subexpressions
+        are evaluated into python floats ahead of code generation for the purpose. Numeric
+        integrals are accumulated in float64 nonetheless.
 
     References:
         1. https://docs.sympy.org/latest/modules/utilities/lambdify.html
@@ -43,44 +224,280 @@ class Equation:
     """
     __slots__ = (
         "expression",
+        "backend",
+        "cache",
+        "integration_timeout",
+        "integration_process",
+        "dtype",
         "equation",
-        "derivative_expression",
-        "derivative",
-        "second_derivative_expression",
-        "second_derivative",
-        "integral_expression",
-        "integral",
+        "_derivative_expression",
+        "_derivative",
+        "_second_derivative_expression",
+        "_second_derivative",
+        "_integral_expression",
+        "_integral",
+        "_numeric_integral",
+        "_jacobian_expression",
+        "_jacobian",
+        "_kernel",
     )
 
-    def __init__(self, expression: Expression, backend: Optional[List[str]] = None):
+    def __init__(self,
+                 expression: Expression,
+                 backend: Optional[List[str]] = None,
+                 cache: Optional[KernelCache] = None,
+                 integration_timeout: Optional[float] = INTEGRATION_TIMEOUT,
+                 integration_process: bool = False,
+                 dtype: Optional[np.dtype] = None,
+                 ):
         self.expression = expression
-        self.equation = sm.lambdify(expression.args, expression.expression, backend)
-        self.equation.__doc__ = sm.latex(expression.expression)
-
-        self.derivative_expression = sm.Derivative(
-            expression.expression, *expression.variables, evaluate=True
-        )
-        self.derivative = sm.lambdify(
-            expression.args,
-            self.derivative_expression,
-            backend
-        )
-        self.derivative.__doc__ = sm.latex(self.derivative_expression)
-
-        self.second_derivative_expression = sm.Derivative(
-            self.derivative_expression, *self.expression.variables, evaluate=True
-        )
-        self.second_derivative = sm.lambdify(
-            expression.args,
-            self.second_derivative_expression,
-            backend
-        )
-        self.second_derivative.__doc__ = sm.latex(self.second_derivative_expression)
-
-        self.integral_expression = sm.integrate(expression.expression, expression.variables)
-        self.integral = sm.lambdify(
-            expression.args,
-            self.integral_expression,
-            backend
-        )
-        self.integral.__doc__ = sm.latex(self.integral_expression)
+        self.backend = backend
+        self.cache = cache
+        self.integration_timeout = integration_timeout
+        self.integration_process = integration_process
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.equation = self._typed(self._function("equation", lambda: expression.expression))
+
+        self._derivative_expression = None
+        self._derivative = None
+        self._second_derivative_expression = None
+        self._second_derivative = None
+        self._integral_expression = None
+        self._integral = None
+        self._numeric_integral = None
+        self._jacobian_expression = None
+        self._jacobian = None
+        self._kernel = None
+
+    def _lambdify(self, expression: sm.Expr, cse: bool = False) -> Callable:
+        """Lambdify an expression of the equation arguments, documented by its latex form."""
+        function = sm.lambdify(self.expression.args, expression, self.backend, cse=cse)
+        function.__doc__ = sm.latex(expression)
+        return function
+
+    def _compile(self, entry: dict) -> Callable:
+        """Compile a function from the generated source code of a cache entry."""
+        namespace = dict(_namespace(self.backend))
+        exec(entry["source"], namespace)
+        function = namespace["_lambdifygenerated"]
+        function.__doc__ = entry["doc"]
+        return function
+
+    def _entry(self, kind: str) -> Optional[dict]:
+        if self.cache is None:
+            return None
+        return self.cache.get(self.cache.key(self.expression, self.backend, kind))
+
+    def _put(self, kind: str, expression: sm.Expr, function: Optional[Callable] = None) -> None:
+        if self.cache is not None:
+            self.cache.put(self.cache.key(self.expression, self.backend, kind), dict(
+                source=None if function is None else inspect.getsource(function),
+                expression=sm.srepr(expression),
+                doc=None if function is None else function.__doc__,
+            ))
+
+    def _symbolic(self, kind: str, build: Callable[[], sm.Expr], store: bool = False) -> sm.Expr:
+        """Retrieve a symbolic expression from cache if available, otherwise build it (and store)."""
+        entry = self._entry(kind)
+        if entry is not None:
+            return sm.sympify(entry["expression"])
+        expression = build()
+        if store:
+            self._put(kind, expression)
+        return expression
+
+    def _function(self, kind: str, build: Callable[[], sm.Expr], cse: bool = False) -> Callable:
+        """Retrieve a compiled kernel from cache if available, otherwise lambdify (and store)."""
+        if self.dtype is not None:
+            kind = f"{kind}:{self.dtype.name}"
+        entry = self._entry(kind)
+        if entry is not None and entry.get("source") is not None:
+            return self._compile(entry)
+
+        expression = build() if self.dtype is None else _fold(build())
+        function = self._lambdify(expression, cse)
+        self._put(kind, expression, function)
+        return function
+
+    def _arguments(self, x, params) -> tuple:
+        """Arguments of a generated function, cast to dtype (if any)."""
+        if self.dtype is None:
+            return (x, *params)
+        return (np.asarray(x, dtype=self.dtype), *(np.asarray(p, dtype=self.dtype) for p in params))
+
+    def _typed(self, function: Callable) -> Callable:
+        """Function evaluated on arguments cast to dtype, returning dtype (unchanged without a dtype)."""
+        if self.dtype is None:
+            return function
+        dtype, arguments = self.dtype, self._arguments
+
+        def typed(x, *params):
+            return np.asarray(function(*arguments(x, params)), dtype=dtype)
+
+        typed.__doc__ = function.__doc__
+        typed.__signature__ = inspect.signature(function)
+        return typed
+
+    def _closed_integral(self) -> Optional[Callable]:
+        """Antiderivative function, or None lacking a closed form the backend is able to evaluate."""
+        if self.integral_expression.has(sm.Integral):
+            return None
+        try:
+            function = self._function("integral", lambda: self.integral_expression)
+        except NotImplementedError:
+            return None
+        return function if _resolves(function) else None
+
+    @property
+    def derivative_expression(self) -> sm.Expr:
+        """First Derivative of the expression with respect to its variables."""
+        if self._derivative_expression is None:
+            self._derivative_expression = self.expression.derivative
+        if self._derivative_expression is None:
+            self._derivative_expression = self._symbolic("derivative", lambda: sm.Derivative(
+                self.expression.expression, *self.expression.variables, evaluate=True
+            ))
+        return self._derivative_expression
+
+    @property
+    def derivative(self) -> Callable:
+        """First Derivative of the equation."""
+        if self._derivative is None:
+            self._derivative = self._typed(self._function("derivative", lambda: self.derivative_expression))
+        return self._derivative
+
+    @property
+    def second_derivative_expression(self) -> sm.Expr:
+        """Second Derivative of the expression with respect to its variables."""
+        if self._second_derivative_expression is None:
+            self._second_derivative_expression = self._symbolic("second_derivative", lambda: sm.Derivative(
+                self.derivative_expression, *self.expression.variables, evaluate=True
+            ))
+        return self._second_derivative_expression
+
+    @property
+    def second_derivative(self) -> Callable:
+        """Second Derivative of the equation."""
+        if self._second_derivative is None:
+            self._second_derivative = self._typed(self._function(
+                "second_derivative", lambda: self.second_derivative_expression
+            ))
+        return self._second_derivative
+
+    @property
+    def integral_expression(self) -> sm.Expr:
+        """Indefinite Integral of the expression with respect to its variables.
+
+        An unevaluated sympy Integral if no closed form was found within the time budget.
+
+        """
+        if self._integral_expression is None:
+            self._integral_expression = self.expression.integral
+        if self._integral_expression is None:
+            try:
+                self._integral_expression = self._symbolic("integral", lambda: _integrate(
+                    self.expression.expression,
+                    self.expression.variables,
+                    self.integration_timeout,
+                    self.integration_process,
+                ), store=True)
+            except TimeoutError:
+                # Left out of the cache, where a larger budget (or faster machine) may yet integrate it
+                self._integral_expression = sm.Integral(self.expression.expression, *self.expression.variables)
+        return self._integral_expression
+
+    @property
+    def numeric_integral(self) -> bool:
+        """Whether the integral is computed numerically, lacking a usable closed form."""
+        if self._numeric_integral is None:
+            self.integral
+        return self._numeric_integral
+
+    @property
+    def integral(self) -> Callable:
+        """Indefinite Integral of the equation."""
+        if self._integral is None:
+            function = self._closed_integral()
+            self._numeric_integral = function is None
+            if function is None:
+                equation = self.equation
+
+                def function(x, *params):
+                    return _cumulative(x, equation(x, *params))
+
+                function.__doc__ = sm.latex(self.integral_expression)
+            self._integral = self._typed(function)
+        return self._integral
+
+    @property
+    def jacobian_expression(self) -> List[sm.Expr]:
+        """Partial Derivatives of the expression with respect to each of its constants."""
+        if self._jacobian_expression is None:
+            self._jacobian_expression = self._symbolic("jacobian", lambda: [
+                sm.diff(self.expression.expression, c) for c in self.expression.constants
+            ])
+        return self._jacobian_expression
+
+    @property
+    def jacobian(self) -> Callable:
+        """Parameter Jacobian of the equation, returning an array of shape (*x.shape, k).
+
+        Common subexpressions shared among partial derivatives are evaluated only once.
+
+        """
+        if self._jacobian is None:
+            columns = self._function("jacobian", lambda: self.jacobian_expression, cse=True)
+            dtype, arguments = self.dtype or float, self._arguments
+
+            def jacobian(x, *params):
+                values = columns(*arguments(x, params))
+                result = np.empty(np.shape(x) + (len(values),), dtype=dtype)
+                for n, value in enumerate(values):
+                    result[..., n] = value
+                return result
+
+            jacobian.__doc__ = columns.__doc__
+            self._jacobian = jacobian
+        return self._jacobian
+
+    @property
+    def kernel(self) -> Callable:
+        """Fused evaluation of the equation, derivative, second derivative, and integral.
+
+        Returns an array of shape (4, *x.shape), evaluating subexpressions shared among all four
+        expressions only once. A numeric integral is accumulated from the evaluated equation.
+
+        """
+        if self._kernel is None:
+            numeric = self.numeric_integral
+            outputs = self._function("kernel", lambda: [
+                self.expression.expression,
+                self.derivative_expression,
+                self.second_derivative_expression,
+                *([] if numeric else [self.integral_expression]),
+            ], cse=True)
+
+            dtype, arguments = self.dtype or float, self._arguments
+
+            def kernel(x, *params):
+                values = outputs(*arguments(x, params))
+                result = np.empty((4,) + np.shape(x), dtype=dtype)
+                for n, value in enumerate(values):
+                    result[n] = value
+                if numeric:
+                    result[3] = _cumulative(x, result[0])
+                return result
+
+            kernel.__doc__ = outputs.__doc__
+            self._kernel = kernel
+        return self._kernel
+
+
+@functools.lru_cache(maxsize=None)
+def _get_equation(name: str, backend: Optional[tuple]) -> Equation:
+    return Equation(expressions.get(name), None if backend is None else list(backend))
+
+
+def get_equation(name: str, backend: Optional[List[str]] = None) -> Equation:
+    """Equation of a registered expression by name, built once per process (and backend)."""
+    return _get_equation(name, None if backend is None else tuple(backend))
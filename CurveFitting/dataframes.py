@@ -0,0 +1,304 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/dataframes.py
+
+"""
+# Python Dependencies
+import numpy as np
+import pandas as pd
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+from .batch import BatchGoodness
+from .core import Equation, get_equation
+from .expressions import Expression
+from .goodness_of_fit import summarize
+from .parallel import fit_many
+
+
+STATISTICS = ("n", "ssr", "rmse", "syx", "rsq", "rsq_adj", "aic", "aicc", "bic", "chisq")
+
+
+def group_arrays(df: pd.DataFrame,
+                 columns: Sequence[str],
+                 by: Sequence[str] = (),
+                 ) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """Columns of every group as rows of NaN padded arrays, without per-row python work.
+
+    Args:
+        df (pd.DataFrame): Data, in long form
+        columns (Sequence[str]): Columns to extract
+        by (Sequence[str]): Columns identifying each group; rows with missing keys are dropped
+
+    Returns:
+        (pd.DataFrame, Dict[str, np.ndarray]): Keys of each group, and arrays of shape
+            (n_groups, largest group) by column, in order of the group keys
+
+    """
+    by = list(by)
+    if by:
+        codes = df.groupby(by, sort=True).ngroup().fillna(-1).to_numpy(dtype=int)
+    else:
+        codes = np.zeros(len(df), dtype=int)
+    valid = np.flatnonzero(codes >= 0)
+    order = valid[np.argsort(codes[valid], kind="stable")]
+    codes = codes[order]
+
+    counts = np.bincount(codes) if codes.size else np.zeros(0, dtype=int)
+    starts = np.cumsum(counts) - counts
+    position = np.arange(codes.size) - np.repeat(starts, counts)
+    shape = (counts.size, counts.max() if counts.size else 0)
+
+    arrays = {}
+    for column in columns:
+        array = np.full(shape, np.nan)
+        array[codes, position] = df[column].to_numpy(dtype=float)[order]
+        arrays[column] = array
+
+    keys = df[by].iloc[order[starts]].reset_index(drop=True)
+    return keys, arrays
+
+
+def _equation(expression: Union[str, Expression, Equation]) -> Equation:
+    if isinstance(expression, Equation):
+        return expression
+    if isinstance(expression, Expression):
+        return Equation(expression)
+    return get_equation(expression)
+
+
+def fit_arrays(expression: Union[str, Expression, Equation],
+               xdata: np.ndarray,
+               ydata: np.ndarray,
+               yerror: Optional[np.ndarray] = None,
+               parallel: bool = False,
+               **kwargs
+               ) -> pd.DataFrame:
+    """Fit stacked, NaN padded curves, tabulating best fits, standard errors, and statistics.
+
+    Args:
+        expression (str | Expression | Equation): Registered expression name, or expression
+        xdata (np.ndarray): Observed X Values, shape (n_curves, n_points)
+        ydata (np.ndarray): Observed Y Values, shape (n_curves, n_points)
+        yerror (np.ndarray): Observed Error (standard deviation) in Y Values
+        parallel (bool): Fit across a pool of processes (see parallel.fit_many), otherwise all
+            at once with a vectorized batch (see batch.BatchGoodness)
+        **kwargs: Keyword arguments passed to `fit_many` or `BatchGoodness.fit`
+
+    Returns:
+        pd.DataFrame: One row per curve, with a column of each parameter and its standard error
+            (suffixed _std), and every statistic
+
+    """
+    equation = _equation(expression)
+    if parallel:
+        best_fit, covariance = fit_many(equation.expression, xdata, ydata, yerror, **kwargs)
+    else:
+        batch = BatchGoodness(equation, xdata, ydata, yerror)
+        batch.fit(**kwargs)
+        best_fit, covariance = batch.best_fit, batch.covariance
+
+    with np.errstate(all="ignore"):
+        residuals = ydata - equation.equation(xdata, *best_fit.T[..., None])
+        summary = summarize(residuals, ydata, best_fit.shape[1], yerror, covariance)
+
+    names = [c.name for c in equation.expression.constants]
+    columns = {}
+    for j, name in enumerate(names):
+        columns[name] = best_fit[:, j]
+        columns[f"{name}_std"] = summary.std[:, j]
+    for statistic in STATISTICS:
+        columns[statistic] = getattr(summary, statistic)
+    columns["converged"] = np.all(np.isfinite(best_fit), axis=1)
+    return pd.DataFrame(columns)
+
+
+def fit_grouped(df: pd.DataFrame,
+                expression: Union[str, Expression, Equation],
+                x: str,
+                y: str,
+                yerror: Optional[str] = None,
+                by: Union[str, Sequence[str]] = (),
+                parallel: bool = False,
+                **kwargs
+                ) -> pd.DataFrame:
+    """Fit every group of a long form DataFrame, tabulating best fits, standard errors, and statistics.
+
+    Args:
+        df (pd.DataFrame): Data, in long form
+        expression (str | Expression | Equation): Registered expression name, or expression
+        x (str): Column of X Values
+        y (str): Column of Y Values
+        yerror (str): Column of Error (standard deviation) in Y Values
+        by (str | Sequence[str]): Columns identifying each group (curve)
+        parallel (bool): Fit across a pool of processes, otherwise all at once with a vectorized batch
+        **kwargs: Keyword arguments whose meaning depends upon parallel, passed to `BatchGoodness.fit`
+            (e.g. p0, max_iterations, ftol) by default, or to `fit_many` when parallel (e.g.
+            max_workers, chunksize, and otherwise `Goodness.fit` options such as bounds)
+
+    Returns:
+        pd.DataFrame: One row per group, with its keys, a column of each parameter and its standard
+            error (suffixed _std), and every statistic
+
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    columns = [x, y] if yerror is None else [x, y, yerror]
+    keys, arrays = group_arrays(df, columns, by)
+    return _tabulate(keys, arrays, expression, x, y, yerror, parallel, **kwargs)
+
+
+def _tabulate(keys: pd.DataFrame,
+              arrays: Dict[str, np.ndarray],
+              expression: Union[str, Expression, Equation],
+              x: str,
+              y: str,
+              yerror: Optional[str],
+              parallel: bool = False,
+              **kwargs
+              ) -> pd.DataFrame:
+    """Fit the arrays of every group, tabulated alongside the keys of each group (if any)."""
+    results = fit_arrays(
+        expression,
+        arrays[x],
+        arrays[y],
+        None if yerror is None else arrays[yerror],
+        parallel,
+        **kwargs
+    )
+    return pd.concat([keys, results], axis=1) if len(keys.columns) else results
+
+
+def _columns(x: str, y: str, yerror: Optional[str], by: Union[str, Sequence[str]]) -> list:
+    by = [by] if isinstance(by, str) else list(by)
+    return [*by, x, y] if yerror is None else [*by, x, y, yerror]
+
+
+def _stream(chunks: Iterable[pd.DataFrame],
+            columns: Sequence[str],
+            by: Union[str, Sequence[str]],
+            ) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """Group arrays (as group_arrays) of chunks of a long form table, reduced as they are read.
+
+    Each chunk is reduced to float arrays of the required columns, and an integer code of its
+    group, such that key columns (e.g. strings) are never held for more than one chunk.
+
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    values = {column: [] for column in columns}
+    codes = []
+    index = {}
+    for chunk in chunks:
+        for column in columns:
+            values[column].append(chunk[column].to_numpy(dtype=float))
+        if not by:
+            codes.append(np.zeros(len(chunk), dtype=int))
+            continue
+        groups = chunk.groupby(by, sort=False)
+        local = groups.ngroup().fillna(-1).to_numpy(dtype=int)
+        # Codes across chunks by key, the last entry mapping rows with missing keys (-1) to -1
+        mapping = np.array([
+            index.setdefault(key if isinstance(key, tuple) else (key,), len(index)) for key in groups.size().index
+        ] + [-1])
+        codes.append(mapping[local])
+
+    codes = np.concatenate(codes) if codes else np.zeros(0, dtype=int)
+    valid = codes >= 0
+    keys = pd.DataFrame(list(index), columns=by)
+    order = keys.sort_values(by).index.to_numpy() if by else np.zeros(0, dtype=int)
+    rank = np.empty(order.size, dtype=int)
+    rank[order] = np.arange(order.size)
+
+    df = pd.DataFrame({
+        column: np.concatenate(values[column])[valid] if codes.size else np.zeros(0) for column in columns
+    })
+    df["group"] = rank[codes[valid]] if by else 0
+    _, arrays = group_arrays(df, columns, ["group"] if by else [])
+    return keys.iloc[order].reset_index(drop=True), arrays
+
+
+def fit_csv(path: str,
+            expression: Union[str, Expression, Equation],
+            x: str,
+            y: str,
+            yerror: Optional[str] = None,
+            by: Union[str, Sequence[str]] = (),
+            chunksize: int = 1_000_000,
+            read_kwargs: Optional[dict] = None,
+            **kwargs
+            ) -> pd.DataFrame:
+    """Fit every group of a long form CSV file, reading only the required columns in chunks.
+
+    Each chunk is reduced to float arrays and an integer group code as it is read, such that
+    memory use is that of the x, y (and yerror) values, rather than of a DataFrame holding
+    every (e.g. string) key of every row.
+
+    Args:
+        path (str): Path to a CSV file
+        expression (str | Expression | Equation): Registered expression name, or expression
+        x (str): Column of X Values
+        y (str): Column of Y Values
+        yerror (str): Column of Error (standard deviation) in Y Values
+        by (str | Sequence[str]): Columns identifying each group (curve)
+        chunksize (int): Number of rows read at once
+        read_kwargs (dict): Keyword arguments passed to `pandas.read_csv`
+        **kwargs: Keyword arguments as of `fit_grouped` (e.g. parallel, and fit options)
+
+    """
+    reader = pd.read_csv(path, usecols=_columns(x, y, yerror, by), chunksize=chunksize, **(read_kwargs or {}))
+    with reader:
+        keys, arrays = _stream(reader, _columns(x, y, yerror, ()), by)
+    return _tabulate(keys, arrays, expression, x, y, yerror, **kwargs)
+
+
+def fit_parquet(path: str,
+                expression: Union[str, Expression, Equation],
+                x: str,
+                y: str,
+                yerror: Optional[str] = None,
+                by: Union[str, Sequence[str]] = (),
+                batch_size: int = 1_000_000,
+                **kwargs
+                ) -> pd.DataFrame:
+    """Fit every group of a long form Parquet file, reading only the required columns in batches.
+
+    Each batch is reduced as it is read, as by `fit_csv`.
+
+    Args:
+        path (str): Path to a Parquet file
+        expression (str | Expression | Equation): Registered expression name, or expression
+        x (str): Column of X Values
+        y (str): Column of Y Values
+        yerror (str): Column of Error (standard deviation) in Y Values
+        by (str | Sequence[str]): Columns identifying each group (curve)
+        batch_size (int): Number of rows read at once
+        **kwargs: Keyword arguments as of `fit_grouped` (e.g. parallel, and fit options)
+
+    Notes:
+        Requires pyarrow.
+
+    """
+    from pyarrow import parquet
+
+    batches = parquet.ParquetFile(path).iter_batches(batch_size=batch_size, columns=_columns(x, y, yerror, by))
+    keys, arrays = _stream((batch.to_pandas() for batch in batches), _columns(x, y, yerror, ()), by)
+    return _tabulate(keys, arrays, expression, x, y, yerror, **kwargs)
@@ -24,8 +24,11 @@
 
 """
 # Python Dependencies
+import warnings
+
+import numpy as np
 import sympy as sm
-from typing import List, Union
+from typing import Callable, Dict, List, Optional, Union
 
 
 class Expression:
@@ -33,18 +36,45 @@ class Expression:
 
     Args:
         expression (sm.core.add.Add | sm.core.mul.Mul | sm.core.mod.Mod): sympy equation
+        guess (Callable): Data driven initial guess, f(x, y) -> {constant name: value}
+        derivative (sm.Expr): Precomputed first derivative with respect to the variables
+        integral (sm.Expr): Precomputed antiderivative with respect to the variables
 
     Notes:
         Be certain that sympy expressions use symbols correctly defining constants.
 
+        A precomputed derivative or integral skips symbolic differentiation or integration.
+        An unevaluated sympy Integral marks an expression without a closed form antiderivative,
+        which is then integrated numerically.
+
+        Initial guess routines reduce along the last axis, such that stacked (n_curves, n_points)
+        observations produce a guess for each curve. Any constant omitted defaults to one.
+
     """
-    __slots__ = ("expression", "_symbols")
+    __slots__ = ("expression", "_symbols", "guess", "derivative", "integral")
 
     def __init__(self,
                  expression: Union[sm.core.add.Add, sm.core.mul.Mul, sm.core.mod.Mod],
+                 guess: Optional[Callable[[np.ndarray, np.ndarray], Dict[str, np.ndarray]]] = None,
+                 derivative: Optional[sm.Expr] = None,
+                 integral: Optional[sm.Expr] = None,
                  ):
         self.expression = expression
         self._symbols = [*self.expression.free_symbols]
+        self.guess = guess
+        self.derivative = derivative
+        self.integral = integral
+
+    def initial_guess(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Initial parameters, ordered as constants, with shape (..., k)."""
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        with warnings.catch_warnings(), np.errstate(all="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            values = self.guess(x, y) if self.guess is not None else {}
+        shape = y.shape[:-1]
+        return np.stack([
+            np.broadcast_to(values.get(c.name, 1.0), shape).astype(float) for c in self.constants
+        ], axis=-1)
 
     @property
     def args(self):
@@ -66,6 +96,109 @@ class Expression:
         return [z[t] for t in idx]
 
 
+def _at(values: np.ndarray, where: np.ndarray) -> np.ndarray:
+    """Finite value located at the minimum of where, along the last axis."""
+    idx = np.argmin(np.where(np.isfinite(where) & np.isfinite(values), where, np.inf), axis=-1)
+    return np.take_along_axis(values, idx[..., None], axis=-1)[..., 0]
+
+
+def _crossing(x: np.ndarray, y: np.ndarray, level: np.ndarray) -> np.ndarray:
+    """Approximate x where y crosses a level, i.e. the observation closest to level."""
+    return _at(x, np.abs(y - level[..., None]))
+
+
+def _ends(x: np.ndarray, y: np.ndarray):
+    """Y values observed at the lowest and highest x."""
+    return _at(y, x), _at(y, -x)
+
+
+def _sigmoid(x: np.ndarray, y: np.ndarray):
+    """Baseline (low x), peak (high x), midpoint, and distance between quartile crossings."""
+    low, high = np.nanmin(y, axis=-1), np.nanmax(y, axis=-1)
+    first, last = _ends(x, y)
+    increasing = last >= first
+    baseline = np.where(increasing, low, high)
+    peak = np.where(increasing, high, low)
+    span = peak - baseline
+    midpoint = _crossing(x, y, baseline + 0.5 * span)
+    width = np.abs(_crossing(x, y, baseline + 0.75 * span) - _crossing(x, y, baseline + 0.25 * span))
+    width = np.where(width > 0, width, np.nanmax(x, axis=-1) - np.nanmin(x, axis=-1))
+    return baseline, peak, midpoint, width
+
+
+def _half_life(x: np.ndarray, y: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Rate constant of an exponential approach from start to end, from its half way crossing."""
+    elapsed = _crossing(x, y, start + 0.5 * (end - start)) - np.nanmin(x, axis=-1)
+    elapsed = np.where(elapsed > 0, elapsed, 0.5 * (np.nanmax(x, axis=-1) - np.nanmin(x, axis=-1)))
+    return np.log(2) / elapsed
+
+
+def _moments(x: np.ndarray, y: np.ndarray):
+    """Mean and standard deviation of x, weighted by (non-negative) y."""
+    w = np.where(np.isfinite(x) & np.isfinite(y), np.clip(y, 0, None), 0.0)
+    x = np.where(np.isfinite(x), x, 0.0)
+    mean = (w * x).sum(axis=-1) / w.sum(axis=-1)
+    variance = (w * (x - mean[..., None]) ** 2).sum(axis=-1) / w.sum(axis=-1)
+    return mean, np.sqrt(variance)
+
+
+def _guess_dose_response(x, y):
+    baseline, peak, midpoint, width = _sigmoid(x, y)
+    return dict(baseline=baseline, peak=peak, pEC50=midpoint, HillSlope=2 * np.log10(3) / width)
+
+
+def _guess_boltzman(x, y):
+    baseline, peak, midpoint, width = _sigmoid(x, y)
+    return dict(baseline=baseline, peak=peak, pEC50=midpoint, HillSlope=width / (2 * np.log(3)))
+
+
+def _growth(x, y):
+    """Baseline (positive, at low x), peak, and time elapsed until half way between them."""
+    baseline, _ = _ends(x, y)
+    peak = np.nanmax(y, axis=-1)
+    baseline = np.clip(baseline, 0.01 * peak, None)
+    elapsed = _crossing(x, y, 0.5 * (baseline + peak)) - np.nanmin(x, axis=-1)
+    elapsed = np.where(elapsed > 0, elapsed, 0.5 * (np.nanmax(x, axis=-1) - np.nanmin(x, axis=-1)))
+    return baseline, peak, elapsed
+
+
+def _guess_logistic(x, y):
+    baseline, peak, elapsed = _growth(x, y)
+    return dict(baseline=baseline, peak=peak, K=np.log((baseline + peak) / baseline) / elapsed)
+
+
+def _guess_gompertz(x, y):
+    baseline, peak, elapsed = _growth(x, y)
+    ratio = np.log((baseline + peak) / (2 * peak)) / np.log(baseline / peak)
+    return dict(baseline=baseline, peak=peak, K=-np.log(ratio) / elapsed)
+
+
+def _guess_binding(x, y):
+    bmax = np.nanmax(y, axis=-1)
+    return dict(Bmax=bmax, Kd=_crossing(x, y, 0.5 * bmax))
+
+
+def _guess_total_binding(x, y):
+    baseline, _ = _ends(x, y)
+    bmax = np.nanmax(y, axis=-1) - baseline
+    return dict(Bmax=bmax, Kd=_crossing(x, y, baseline + 0.5 * bmax), NS=0.0, baseline=baseline)
+
+
+def _guess_dissociation(x, y):
+    start, end = _ends(x, y)
+    return dict(Y0=start, NS=end, K=_half_life(x, y, start, end))
+
+
+def _guess_gaussian(x, y):
+    mu, sigma = _moments(x, y)
+    return dict(mu=mu, sigma=sigma)
+
+
+def _guess_poisson(x, y):
+    mu, _ = _moments(x, y)
+    return dict(mu=mu)
+
+
 # Symbols
 x = sm.Symbol("x", real=True)
 a = sm.Symbol("a", constant=True, real=True)
@@ -86,52 +219,174 @@ B1 = sm.Symbol("B1", constant=True, real=True)
 K = sm.Symbol("K", constant=True, real=True)
 Y0 = sm.Symbol("Y0", constant=True, real=True)
 
+# Gauss hypergeometric function, resolved by name from the scipy backend
+hyp2f1 = sm.Function("hyp2f1")
 
-# Expression Definitions
-VariableSlopeDoseResponse = Expression(
-    expression=baseline + (peak - baseline) / (1 + 10 ** ((pEC50 - x) * HillSlope))
-)
 
-BoltzmanSigmoidal = Expression(
-    expression=baseline + (peak - baseline) / (1 + sm.exp((pEC50 - x) / HillSlope))
-)
+# Expression Definitions, built on first lookup
+def _dose_response() -> Expression:
+    u = 10 ** ((pEC50 - x) * HillSlope)
+    return Expression(
+        expression=baseline + (peak - baseline) / (1 + u),
+        guess=_guess_dose_response,
+        derivative=sm.log(10) * HillSlope * (peak - baseline) * u / (1 + u) ** 2,
+        integral=peak * x + (peak - baseline) * sm.log(1 + u) / (HillSlope * sm.log(10)),
+    )
 
-LogisticGrowth = Expression(
-    expression=baseline * peak / ((peak - baseline) * sm.exp(-K * x) + baseline)
-)
 
-GompertzGrowth = Expression(
-    expression=peak * (baseline / peak) ** sm.exp(-K * x)
-)
+def _boltzman() -> Expression:
+    v = sm.exp((pEC50 - x) / HillSlope)
+    return Expression(
+        expression=baseline + (peak - baseline) / (1 + v),
+        guess=_guess_boltzman,
+        derivative=(peak - baseline) * v / (HillSlope * (1 + v) ** 2),
+        integral=peak * x + (peak - baseline) * HillSlope * sm.log(1 + v),
+    )
 
-OneSiteTotalBinding = Expression(
-    expression=Bmax * x / (Kd + x) + NS * x + baseline
-)
 
-OneSiteSpecificBinding = Expression(
-    expression=Bmax * x / (Kd + x)
-)
+def _logistic() -> Expression:
+    v = (peak - baseline) * sm.exp(-K * x)
+    return Expression(
+        expression=baseline * peak / (v + baseline),
+        guess=_guess_logistic,
+        derivative=K * baseline * peak * v / (v + baseline) ** 2,
+        integral=peak * sm.log(baseline * sm.exp(K * x) + peak - baseline) / K,
+    )
 
-SlopedSpecificBinding = Expression(
-    expression=(Bmax * (x ** HillSlope)) / (Kd ** HillSlope + x ** HillSlope)
-)
 
-PadeApproximant = Expression(
-    expression=(A0 + A1 * x) / (1 + B1 * x)
-)
+def _gompertz() -> Expression:
+    v = sm.exp(-K * x)
+    f = peak * (baseline / peak) ** v
+    return Expression(
+        expression=f,
+        guess=_guess_gompertz,
+        derivative=-K * sm.log(baseline / peak) * v * f,
+        integral=-peak * sm.Ei(sm.log(baseline / peak) * v) / K,
+    )
 
-DissociationKinetics = Expression(
-    expression=(Y0 - NS) * sm.exp(-K * x) + NS
-)
 
-Parabola = Expression(
-    expression=a * x ** 2 + b * x + c
-)
+def _total_binding() -> Expression:
+    return Expression(
+        expression=Bmax * x / (Kd + x) + NS * x + baseline,
+        guess=_guess_total_binding,
+        derivative=Bmax * Kd / (Kd + x) ** 2 + NS,
+        integral=Bmax * (x - Kd * sm.log(Kd + x)) + NS * x ** 2 / 2 + baseline * x,
+    )
+
+
+def _specific_binding() -> Expression:
+    return Expression(
+        expression=Bmax * x / (Kd + x),
+        guess=_guess_binding,
+        derivative=Bmax * Kd / (Kd + x) ** 2,
+        integral=Bmax * (x - Kd * sm.log(Kd + x)),
+    )
+
+
+def _sloped_binding() -> Expression:
+    return Expression(
+        expression=(Bmax * (x ** HillSlope)) / (Kd ** HillSlope + x ** HillSlope),
+        guess=_guess_binding,
+        derivative=Bmax * HillSlope * Kd ** HillSlope * x ** (HillSlope - 1) / (
+            Kd ** HillSlope + x ** HillSlope) ** 2,
+        integral=Bmax * x * (1 - hyp2f1(1, 1 / HillSlope, 1 + 1 / HillSlope, -(x / Kd) ** HillSlope)),
+    )
+
+
+def _pade() -> Expression:
+    return Expression(
+        expression=(A0 + A1 * x) / (1 + B1 * x),
+        derivative=(A1 - A0 * B1) / (1 + B1 * x) ** 2,
+        integral=A1 * x / B1 + (A0 * B1 - A1) * sm.log(1 + B1 * x) / B1 ** 2,
+    )
+
+
+def _dissociation() -> Expression:
+    return Expression(
+        expression=(Y0 - NS) * sm.exp(-K * x) + NS,
+        guess=_guess_dissociation,
+        derivative=-K * (Y0 - NS) * sm.exp(-K * x),
+        integral=NS * x - (Y0 - NS) * sm.exp(-K * x) / K,
+    )
 
-Gaussian = Expression(
-    expression=sm.exp(-0.5 * ((x - mu) / sigma) ** 2) / (sigma * sm.sqrt(2 * sm.pi))
-)
 
-Poisson = Expression(
-    expression=(mu ** x) * sm.exp(-mu) / sm.gamma(x + 1)
+def _parabola() -> Expression:
+    return Expression(
+        expression=a * x ** 2 + b * x + c,
+        derivative=2 * a * x + b,
+        integral=a * x ** 3 / 3 + b * x ** 2 / 2 + c * x,
+    )
+
+
+def _gaussian() -> Expression:
+    f = sm.exp(-0.5 * ((x - mu) / sigma) ** 2) / (sigma * sm.sqrt(2 * sm.pi))
+    return Expression(
+        expression=f,
+        guess=_guess_gaussian,
+        derivative=-(x - mu) * f / sigma ** 2,
+        integral=sm.erf((x - mu) / (sigma * sm.sqrt(2))) / 2,
+    )
+
+
+def _poisson() -> Expression:
+    f = (mu ** x) * sm.exp(-mu) / sm.gamma(x + 1)
+    return Expression(
+        expression=f,
+        guess=_guess_poisson,
+        derivative=f * (sm.log(mu) - sm.polygamma(0, x + 1)),
+        integral=sm.Integral(f, x),  # No closed form, integrated numerically
+    )
+
+
+_builders: Dict[str, Callable[[], Expression]] = dict(
+    VariableSlopeDoseResponse=_dose_response,
+    BoltzmanSigmoidal=_boltzman,
+    LogisticGrowth=_logistic,
+    GompertzGrowth=_gompertz,
+    OneSiteTotalBinding=_total_binding,
+    OneSiteSpecificBinding=_specific_binding,
+    SlopedSpecificBinding=_sloped_binding,
+    PadeApproximant=_pade,
+    DissociationKinetics=_dissociation,
+    Parabola=_parabola,
+    Gaussian=_gaussian,
+    Poisson=_poisson,
 )
+_built: Dict[str, Expression] = {}
+
+
+def register(name: str, builder: Callable[[], Expression]) -> None:
+    """Register an expression by name, built by builder on first lookup."""
+    _builders[name] = builder
+    _built.pop(name, None)
+
+
+def available() -> List[str]:
+    """Names of registered expressions."""
+    return list(_builders)
+
+
+def get(name: str) -> Expression:
+    """Registered expression by name, built once on first lookup."""
+    if name not in _built:
+        try:
+            builder = _builders[name]
+        except KeyError:
+            raise KeyError(f"Unknown expression: {name}. Available: {', '.join(_builders)}") from None
+        _built[name] = builder()
+    return _built[name]
+
+
+def name_of(expression: Expression) -> Optional[str]:
+    """Registered name of an expression, if it was built by lookup (None otherwise)."""
+    return next((name for name, built in _built.items() if built is expression), None)
+
+
+def __getattr__(name: str) -> Expression:
+    if name in _builders:
+        return get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_builders])
@@ -0,0 +1,221 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/global_fit.py
+
+"""
+# Python Dependencies
+import warnings
+
+import numpy as np
+
+from typing import List, Optional, Sequence
+from scipy import sparse
+from scipy.optimize import least_squares
+
+from .core import Equation
+from .goodness_of_fit import Summary, summarize
+
+
+class GlobalGoodness:
+    """Goodness of Fit for Many Datasets Sharing Some Parameters of One Equation, Fit Globally.
+
+    Args:
+        equation (Equation): Equation describing every dataset
+        xdata (Sequence[np.ndarray]): Observed X Values of each dataset
+        ydata (Sequence[np.ndarray]): Observed Y Values of each dataset
+        yerror (Sequence[np.ndarray]): Observed Error (standard deviation) in Y Values of each dataset
+        shared (Sequence[str]): Names of constants shared by every dataset; all others are local
+        best_fit (np.ndarray): Best Fit parameters of each dataset, shape (n_datasets, k)
+        covariance (np.ndarray): Covariance Matrix of the free parameters
+
+    Notes:
+        Free parameters are ordered as the shared constants, followed by the local constants of
+        each dataset in turn. Datasets may differ in length, and are stacked into one residual
+        vector. Each residual depends only upon the shared parameters and the local parameters
+        of its own dataset, such that the jacobian is block sparse. It is solved by scipy's trust
+        region reflective algorithm with an iterative (lsmr) solver, scaling to many datasets.
+
+        Non-finite observations are excluded.
+
+    """
+    def __init__(self,
+                 equation: Equation,
+                 xdata: Sequence[np.ndarray],
+                 ydata: Sequence[np.ndarray],
+                 yerror: Optional[Sequence[np.ndarray]] = None,
+                 shared: Sequence[str] = (),
+                 best_fit: Optional[np.ndarray] = None,
+                 covariance: Optional[np.ndarray] = None,
+                 ) -> None:
+        assert len(xdata) == len(ydata), "Must provide X and Y Data for every dataset."
+        names = [c.name for c in equation.expression.constants]
+        unknown = set(shared) - set(names)
+        assert not unknown, f"Unknown constants: {', '.join(sorted(unknown))}"
+
+        self.equation = equation
+        self.xdata = [np.asarray(i, dtype=float) for i in xdata]
+        self.ydata = [np.asarray(i, dtype=float) for i in ydata]
+        self.yerror = yerror if yerror is None else [np.asarray(i, dtype=float) for i in yerror]
+        for n, (x, y) in enumerate(zip(self.xdata, self.ydata)):
+            assert x.shape == y.shape, f"X and Y Data of dataset {n} Must Be the Same Shape."
+
+        self.shared = [i for i in names if i in shared]
+        self.local = [i for i in names if i not in shared]
+        self.best_fit = best_fit
+        self.covariance = covariance
+        self.result = None
+
+        # Stacked observations, and the dataset of each
+        x, y = np.concatenate(self.xdata), np.concatenate(self.ydata)
+        group = np.repeat(np.arange(len(self.ydata)), [i.size for i in self.ydata])
+        weights = np.ones(y.size) if self.yerror is None else 1.0 / np.concatenate(self.yerror)
+        mask = np.isfinite(x) & np.isfinite(y) & np.isfinite(weights)
+        self._x, self._y, self._weights, self._group = x[mask], y[mask], weights[mask], group[mask]
+
+        # Column of the free parameter vector, for each constant (columns) of each dataset (rows)
+        m, s, n_local = self.n_datasets, len(self.shared), len(self.local)
+        self._columns = np.empty((m, len(names)), dtype=int)
+        for j, name in enumerate(names):
+            if name in self.shared:
+                self._columns[:, j] = self.shared.index(name)
+            else:
+                self._columns[:, j] = s + np.arange(m) * n_local + self.local.index(name)
+
+    @property
+    def n_datasets(self) -> int:
+        return len(self.ydata)
+
+    @property
+    def parameters(self) -> np.ndarray:
+        """Parameter names of the Equation."""
+        return np.asarray([c.name for c in self.equation.expression.constants])
+
+    @property
+    def k(self) -> int:
+        """Number of Free Parameters, k"""
+        return len(self.shared) + self.n_datasets * len(self.local)
+
+    @property
+    def dof(self) -> int:
+        """Degrees of Freedom (DOF), n"""
+        return self._y.size
+
+    def expand(self, theta: np.ndarray) -> np.ndarray:
+        """Parameters of each dataset, shape (n_datasets, k), from the free parameter vector."""
+        return np.asarray(theta, dtype=float)[self._columns]
+
+    def reduce(self, params: np.ndarray) -> np.ndarray:
+        """Free parameter vector from parameters of each dataset, averaging shared constants."""
+        params = np.broadcast_to(np.asarray(params, dtype=float), self._columns.shape)
+        theta = np.zeros(self.k)
+        counts = np.zeros(self.k)
+        np.add.at(theta, self._columns, params)
+        np.add.at(counts, self._columns, 1)
+        return theta / counts
+
+    def _residual(self, theta: np.ndarray) -> np.ndarray:
+        params = self.expand(theta)[self._group]
+        return (self._y - self.equation.equation(self._x, *params.T)) * self._weights
+
+    def _jacobian(self, theta: np.ndarray) -> sparse.csr_matrix:
+        """Block sparse jacobian of the residuals, with one non-zero per point and constant."""
+        params = self.expand(theta)[self._group]
+        values = -self.equation.jacobian(self._x, *params.T) * self._weights[:, None]
+        rows = np.broadcast_to(np.arange(self._y.size)[:, None], values.shape)
+        columns = self._columns[self._group]
+        return sparse.csr_matrix(
+            (values.ravel(), (rows.ravel(), columns.ravel())), shape=(self._y.size, self.k)
+        )
+
+    def _initial(self, p0: Optional[np.ndarray]) -> np.ndarray:
+        if p0 is None and self.equation.expression.guess is not None:
+            p0 = np.stack([
+                self.equation.expression.initial_guess(x, y) for x, y in zip(self.xdata, self.ydata)
+            ])
+        elif p0 is None:
+            p0 = np.ones(len(self.parameters))
+        return self.reduce(p0)
+
+    def fit(self, p0: Optional[np.ndarray] = None, **kwargs) -> None:
+        """Fits every dataset at once, sharing parameters among them.
+
+        Args:
+            p0 (np.ndarray): Initial parameters, shape (k,) or (n_datasets, k), defaulting to the
+                expression's initial guess of each dataset when available, otherwise ones
+            **kwargs: Passed to scipy.optimize.least_squares
+
+        """
+        kwargs.setdefault("method", "trf")
+        kwargs.setdefault("tr_solver", "lsmr")
+        kwargs.setdefault("x_scale", "jac")
+        theta = self._initial(p0)
+        with np.errstate(all="ignore"):
+            self.result = least_squares(self._residual, theta, jac=self._jacobian, **kwargs)
+
+        if not self.result.success:
+            warnings.warn("Data Failed to be Fit using: %s" % self.equation.equation.__name__)
+            self.best_fit = np.full(self._columns.shape, np.nan)
+            self.covariance = np.full((self.k, self.k), np.nan)
+            return
+
+        # Only the (k, k) product is made dense, never the (n, k) jacobian
+        jac = self.result.jac
+        information = jac.T @ jac
+        information = information.toarray() if sparse.issparse(information) else information
+        cost = 2 * self.result.cost
+        self.best_fit = self.expand(self.result.x)
+        self.covariance = np.linalg.pinv(information) * cost / (self.dof - self.k)
+
+    @property
+    def theta(self) -> np.ndarray:
+        """Best Fit free parameter vector."""
+        return self.reduce(self.best_fit)
+
+    @property
+    def std(self) -> np.ndarray:
+        """Standard Deviation (std) of Best Fit Parameters of each dataset, shape (n_datasets, k)."""
+        return np.sqrt(self.covariance.diagonal())[self._columns]
+
+    def expect(self, x: np.ndarray, dataset: int) -> np.ndarray:
+        """Returns the Values Expected at x for the best fit parameters of one dataset."""
+        return self.equation.equation(x, *self.best_fit[dataset])
+
+    @property
+    def expected(self) -> List[np.ndarray]:
+        """Expected Values of each dataset given best fit parameters."""
+        return [self.expect(x, n) for n, x in enumerate(self.xdata)]
+
+    @property
+    def residuals(self) -> List[np.ndarray]:
+        """Residual Difference between Observed and Expected, of each dataset."""
+        return [y - e for y, e in zip(self.ydata, self.expected)]
+
+    def summary(self) -> Summary:
+        """Summary of Goodness of Fit Statistics of the global fit, over every stacked dataset."""
+        return summarize(
+            np.concatenate(self.residuals),
+            np.concatenate(self.ydata),
+            self.k,
+            None if self.yerror is None else np.concatenate(self.yerror),
+            self.covariance,
+        )
@@ -24,13 +24,204 @@
 
 """
 # Python Dependencies
+import time
 import warnings
+import functools
 
 import numpy as np
 
-from typing import Callable, Optional
+from typing import Callable, Iterator, NamedTuple, Optional, Sequence, Tuple, TYPE_CHECKING, Union
 from inspect import getfullargspec
-from scipy.optimize import curve_fit
+from scipy.optimize import Bounds, curve_fit
+
+from .telemetry import FitInfo, Meter, function_name, notify
+
+if TYPE_CHECKING:
+    from .core import Equation
+    from .multistart import MultiStart
+    from .resampling import Bootstrap
+
+
+# Number of observations per chunk, when streaming statistics over memory mapped data
+DEFAULT_CHUNK_SIZE = 2 ** 20
+
+
+def _cached(method: Callable) -> property:
+    """Property computed once, and cached until any attribute it may depend upon changes."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = self._cache[name] = method(self)
+            return value
+
+    return property(wrapper)
+
+
+class Summary(NamedTuple):
+    """Goodness of Fit Summary Statistics, scalars for one fit or arrays for stacked fits.
+
+    Attributes:
+        n: Number of (finite) observations
+        k: Number of Parameters
+        ssr: Sum of Squared Residuals (SSR)
+        sse: Sum of Squared Error (SSE), about the mean
+        rmse: Root Mean Squared Error (RMSE)
+        syx: Alternative Form of RMSE, modifying degrees of freedom by number of fit variables
+        rsq: Pearson's Correlation Coefficient, R-Squared
+        rsq_adj: Adjusted R-Squared Value
+        aic: Akaike Information Criterion (AIC)
+        aicc: AIC with Correction for small sample sizes (AICc)
+        bic: Bayesian Information Criterion (BIC)
+        chisq: Reduced Chi-Square, weighted by yerror when available
+        std: Standard Deviation (std) of Best Fit Parameters, if covariance is available
+
+    """
+    n: Union[int, np.ndarray]
+    k: int
+    ssr: Union[float, np.ndarray]
+    sse: Union[float, np.ndarray]
+    rmse: Union[float, np.ndarray]
+    syx: Union[float, np.ndarray]
+    rsq: Union[float, np.ndarray]
+    rsq_adj: Union[float, np.ndarray]
+    aic: Union[float, np.ndarray]
+    aicc: Union[float, np.ndarray]
+    bic: Union[float, np.ndarray]
+    chisq: Union[float, np.ndarray]
+    std: Optional[np.ndarray]
+
+
+def summarize(residuals: np.ndarray,
+              ydata: np.ndarray,
+              k: int,
+              yerror: Optional[np.ndarray] = None,
+              covariance: Optional[np.ndarray] = None,
+              ) -> Summary:
+    """Summary Statistics of one or many fits, from a handful of reductions over the residuals.
+
+    Args:
+        residuals (np.ndarray): Residuals, shape (n_points,) or stacked (n_fits, n_points)
+        ydata (np.ndarray): Observed Y Values, same shape as residuals
+        k (int): Number of Parameters
+        yerror (np.ndarray): Observed Error (standard deviation) in Y Values
+        covariance (np.ndarray): Covariance Matrix, shape (k, k) or stacked (n_fits, k, k)
+
+    Notes:
+        Non-finite residuals, y values, or errors (i.e. NaN padding) are excluded.
+
+    """
+    residuals = _floating(residuals)
+    ydata = _floating(ydata)
+    valid = np.isfinite(residuals) & np.isfinite(ydata)
+    if yerror is not None:
+        valid &= np.isfinite(yerror)
+
+    # Sums are accumulated in float64, whatever the precision of residuals and ydata
+    r = np.where(valid, residuals, 0.0)
+    n = valid.sum(axis=-1)
+    with np.errstate(all="ignore"):
+        ssr = np.einsum("...i,...i->...", r, r, dtype=np.float64)
+        mean = np.where(valid, ydata, 0.0).sum(axis=-1, dtype=np.float64) / n
+        dfm = np.where(valid, ydata - mean[..., None].astype(ydata.dtype), 0.0)
+        sse = np.einsum("...i,...i->...", dfm, dfm, dtype=np.float64)
+
+        chisq = ssr
+        if yerror is not None:
+            weighted = np.where(valid, residuals / yerror, 0.0)
+            chisq = np.einsum("...i,...i->...", weighted, weighted, dtype=np.float64)
+
+    return _summary(n, k, ssr, sse, chisq, covariance)
+
+
+def _bounds(kwargs: dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Lower and upper parameter bounds of curve_fit keyword arguments, as a tuple or scipy Bounds."""
+    bounds = kwargs.get("bounds", (-np.inf, np.inf))
+    lower, upper = (bounds.lb, bounds.ub) if isinstance(bounds, Bounds) else bounds
+    return np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+
+
+def _method(kwargs: dict) -> str:
+    """Solver curve_fit resolves for its keyword arguments, "lm" unless bounded (or specified)."""
+    method = kwargs.get("method")
+    if method is not None:
+        return method
+    lower, upper = _bounds(kwargs)
+    return "trf" if np.any(lower > -np.inf) or np.any(upper < np.inf) else "lm"
+
+
+def _floating(a: np.ndarray) -> np.ndarray:
+    """Array of a floating point type, preserving reduced precision (e.g. float32)."""
+    a = np.asarray(a)
+    return a if np.issubdtype(a.dtype, np.floating) else a.astype(float)
+
+
+def _summary(n, k: int, ssr, sse, chisq, covariance: Optional[np.ndarray]) -> Summary:
+    """Summary Statistics from the number of observations and sums of squares."""
+    with np.errstate(all="ignore"):
+        rsq = 1.0 - ssr / sse
+        likelihood = n * np.log(ssr / n)
+        aic = likelihood + 2 * k
+        std = None if covariance is None else np.sqrt(np.diagonal(covariance, axis1=-2, axis2=-1))
+
+        return Summary(
+            n=n,
+            k=k,
+            ssr=ssr,
+            sse=sse,
+            rmse=(ssr / n) ** 0.5,
+            syx=(ssr / (n - k)) ** 0.5,
+            rsq=rsq,
+            rsq_adj=1 - (1 - rsq) * (n - 1.0) / (n - k),
+            aic=aic,
+            aicc=aic + 2 * k * (k + 1) / (n - k - 1),
+            bic=likelihood + k * np.log(n),
+            chisq=chisq / (n - k),
+            std=std,
+        )
+
+
+def numeric_jacobian(function: Callable, x: np.ndarray, params: Sequence[float]) -> np.ndarray:
+    """Parameter Jacobian of function at x by central finite differences.
+
+    Args:
+        function (Callable): f(x, *params), returning an array of any shape
+        x (np.ndarray): X Values
+        params (Sequence[float]): Parameters about which to differentiate
+
+    Notes:
+        Requires 2k evaluations of function, returning an array of shape (*f(x).shape, k). Step
+        sizes are scaled by the precision of x, larger for reduced precision (float32) x values.
+
+    """
+    params = np.asarray(params, dtype=float)
+    # Steps suited to the precision of evaluation, e.g. float32 x values
+    eps = np.finfo(np.result_type(x, np.float32)).eps
+    steps = np.cbrt(eps) * np.maximum(np.abs(params), 1.0)
+    columns = []
+    for step, e in zip(steps, np.eye(params.size)):
+        upper = np.asarray(function(x, *(params + step * e)), dtype=float)
+        lower = np.asarray(function(x, *(params - step * e)), dtype=float)
+        columns.append((upper - lower) / (2 * step))
+    return np.stack(columns, axis=-1)
+
+
+def delta_variance(jacobian: np.ndarray, covariance: np.ndarray) -> np.ndarray:
+    """Variance propagated from parameters by the delta method, diag(J C J^T), for stacked J.
+
+    Args:
+        jacobian (np.ndarray): Parameter Jacobian, shape (..., k)
+        covariance (np.ndarray): Parameter Covariance Matrix, shape (k, k)
+
+    Notes:
+        Evaluated as one (n, k) x (k, k) matrix product and a row-wise reduction, never forming
+        the full (n, n) matrix.
+
+    """
+    return np.einsum("...i,...i->...", jacobian @ covariance, jacobian)
 
 
 class Goodness:
@@ -43,52 +234,314 @@ class Goodness:
         yerror (np.ndarray): Observed Error (standard deviation) in Y Values
         best_fit (np.ndarray): Best Fit parameters for the given function and data
         covariance (np.ndarray): Covariance Matrix
+        jacobian (Callable): Parameter Jacobian of function, returning an array of shape (n, k)
+        guess (Callable): Data driven initial parameters f(xdata, ydata), used when fit lacks p0
+        equation (Equation): Equation of function, if any, enabling vectorized refits (e.g. bootstrap)
+        chunk_size (int): Observations per chunk when streaming statistics (see Notes)
+        dtype (np.dtype): Floating point type of data and expected values (e.g. np.float32), see Notes
 
     Assumptions:
-        The first argument of the provided function must accept xdata
+        The first argument of the provided function (and jacobian) must accept xdata
+
+    Notes:
+        Expected values, residuals, distance from the mean, and parameter names are computed
+        once and cached. The cache is invalidated whenever function, xdata, ydata, yerror, or
+        best_fit are reassigned, but not when those arrays are modified in place.
+
+        When chunk_size is given, or xdata or ydata are memory mapped (e.g. `from_npy`), residual
+        based statistics (ssr, sse, and those derived, and the summary) are accumulated over
+        fixed size chunks in a single pass, excluding non-finite values, such that memory use is
+        independent of the number of observations. Full size arrays (expected, residuals, dfm) are
+        then only built if requested explicitly.
+
+        When dtype is given, data are cast to it on construction, and expected values, residuals,
+        and confidence bands are kept as it, halving memory and bandwidth for float32. Sums of
+        squares are accumulated in float64 regardless. Fitting is solved in float64 by curve_fit,
+        with finite difference steps suited to the precision of the function when it lacks a
+        jacobian.
 
     """
+    _invalidates = frozenset(("function", "xdata", "ydata", "yerror", "best_fit", "chunk_size", "dtype"))
+
     def __init__(self,
                  function: Callable,
                  xdata: np.ndarray,
                  ydata: np.ndarray,
                  yerror: Optional[np.ndarray] = None,
                  best_fit: Optional[np.ndarray] = None,
-                 covariance: Optional[np.ndarray] = None
+                 covariance: Optional[np.ndarray] = None,
+                 jacobian: Optional[Callable] = None,
+                 guess: Optional[Callable] = None,
+                 equation: Optional["Equation"] = None,
+                 chunk_size: Optional[int] = None,
+                 dtype: Optional[np.dtype] = None,
                  ) -> None:
+        self._cache = {}
+
         # Instance Args
+        self.dtype = None if dtype is None else np.dtype(dtype)
         self.function = function
-        self.xdata = xdata
-        self.ydata = ydata
-        self.yerror = yerror
+        self.xdata = self._typed(xdata)
+        self.ydata = self._typed(ydata)
+        self.yerror = yerror if yerror is None else self._typed(yerror)
 
         assert xdata.shape == ydata.shape, "X and Y Data Must Be the Same Shape."
 
         self.best_fit = best_fit
         self.covariance = covariance
+        self.jacobian = jacobian
+        self.guess = guess
+        self.equation = equation
+        self.chunk_size = chunk_size
+        self.info: Optional[FitInfo] = None
+
+    def __setattr__(self, name, value):
+        if name in self._invalidates:
+            self._cache.clear()
+        super().__setattr__(name, value)
+
+    @classmethod
+    def from_equation(cls,
+                      equation: "Equation",
+                      xdata: np.ndarray,
+                      ydata: np.ndarray,
+                      yerror: Optional[np.ndarray] = None,
+                      **kwargs
+                      ) -> "Goodness":
+        """Goodness of Fit for an Equation, fit using its analytic parameter jacobian.
+
+        When the expression carries an initial guess routine, it is used to start each fit, and
+        the equation's dtype (if any) is used unless another is given.
+
+        """
+        kwargs.setdefault("dtype", equation.dtype)
+        if equation.expression.guess is not None:
+            kwargs.setdefault("guess", equation.expression.initial_guess)
+        return cls(
+            function=equation.equation,
+            xdata=xdata,
+            ydata=ydata,
+            yerror=yerror,
+            jacobian=equation.jacobian,
+            equation=equation,
+            **kwargs
+        )
+
+    @classmethod
+    def from_npy(cls,
+                 function: Callable,
+                 xdata: str,
+                 ydata: str,
+                 yerror: Optional[str] = None,
+                 **kwargs
+                 ) -> "Goodness":
+        """Goodness of Fit for data saved as .npy files, memory mapped rather than read into memory."""
+        def load(path):
+            return None if path is None else np.load(path, mmap_mode="r")
 
-    def fit(self, **kwargs) -> None:
-        """Fits the data to a given function."""
+        return cls(function=function, xdata=load(xdata), ydata=load(ydata), yerror=load(yerror), **kwargs)
+
+    def fit(self,
+            callback: Optional[Callable[["Goodness", FitInfo], None]] = None,
+            fallback: Optional[dict] = None,
+            **kwargs
+            ) -> None:
+        """Fits the data to a given function.
+
+        Args:
+            callback (Callable): Called with (self, info) once fit, after any registered hooks
+            fallback (dict): Options of `multistart`, fit from many starting points should curve_fit
+                fail ({} for defaults), disabled by default
+            **kwargs: Keyword arguments passed to `scipy.optimize.curve_fit`
+
+        Notes:
+            Evaluation counts, termination status, and timings are recorded as `info` (FitInfo),
+            and passed to every hook registered by `telemetry.add_hook`, whether or not the
+            fit succeeds.
+
+        """
+        options = dict(kwargs)
+        if self.jacobian is not None:
+            kwargs.setdefault("jac", self.jacobian)
+        elif self.dtype is not None:
+            # Finite difference steps suited to reduced precision, named by the solver used
+            eps = np.finfo(self.dtype).eps
+            if _method(kwargs) == "lm":
+                kwargs.setdefault("epsfcn", eps)
+            else:
+                kwargs.setdefault("diff_step", np.sqrt(eps))
+        if self.guess is not None and kwargs.get("p0") is None:
+            # Clipped into bounds, as curve_fit requires of an initial guess
+            kwargs["p0"] = np.clip(self.guess(self.xdata, self.ydata), *_bounds(kwargs))
+
+        function, jacobian = Meter(), Meter()
+        if callable(kwargs.get("jac")):
+            kwargs["jac"] = jacobian.wrap(kwargs["jac"])
+        kwargs.pop("full_output", None)
+        start = time.perf_counter()
         try:
-            self.best_fit, self.covariance = curve_fit(
-                f=self.function,
+            self.best_fit, self.covariance, _, message, status = curve_fit(
+                f=function.wrap(self.function),
                 xdata=self.xdata,
                 ydata=self.ydata,
                 sigma=self.yerror,
+                full_output=True,
                 **kwargs
             )
+            success = True
 
-        except RuntimeError:
+        except RuntimeError as error:
             warnings.warn("Data Failed to be Fit using: %s" % self.function.__name__)
             size = self.k
             self.best_fit = np.array([np.nan] * size)
             self.covariance = np.array([np.nan] * size * size).reshape((size, size))
+            message, status, success = str(error), None, False
+
+        self.info = FitInfo(
+            name=function_name(self),
+            n=len(self.ydata),
+            k=self.k,
+            nfev=function.calls,
+            njev=jacobian.calls,
+            status=status,
+            message=message,
+            success=success,
+            elapsed=time.perf_counter() - start,
+            model_time=function.elapsed + jacobian.elapsed,
+        )
+        notify(self, self.info)
+        if callback is not None:
+            callback(self, self.info)
+
+        if not success and fallback is not None:
+            self.multistart(**dict(options, **fallback))
+
+    def multistart(self, **kwargs) -> "MultiStart":
+        """Fit from many starting points concurrently, keeping the best, see multistart.multistart."""
+        from .multistart import multistart
+
+        return multistart(self, **kwargs)
 
     def expect(self, x: np.ndarray) -> np.ndarray:
         """Returns the Values Expected at x for a given best fit parameters."""
-        return self.function(x, *self.best_fit)
+        return self._typed(self.function(x, *self.best_fit))
+
+    def _typed(self, a: np.ndarray) -> np.ndarray:
+        """Array cast to dtype (if any), without copying if already of dtype (or memory mapped)."""
+        return a if self.dtype is None else np.asanyarray(a, dtype=self.dtype)
+
+    def bootstrap(self,
+                  n_resamples: int = 2_000,
+                  method: str = "residual",
+                  level: float = 0.95,
+                  interval: str = "bca",
+                  seed: Optional[int] = None,
+                  ) -> "Bootstrap":
+        """Bootstrap Confidence Intervals of Best Fit Parameters, see resampling.bootstrap."""
+        from .resampling import bootstrap
+
+        return bootstrap(self, n_resamples, method, level, interval, seed)
+
+    def critical_value(self, level: float = 0.95) -> float:
+        """Two-sided critical value of Student's t distribution, with n - k degrees of freedom."""
+        assert 0 <= level < 1.0
+        # Deferred, such that scipy.stats is not imported on the fit only path
+        from scipy.stats import t as student
+
+        return student.ppf(0.5 + level / 2, self.dof - self.k)
+
+    def expected_variance(self, x: np.ndarray) -> np.ndarray:
+        """Variance of the expected values at x, propagated from the covariance of best fit.
+
+        Uses the parameter jacobian when available, otherwise central finite differences.
+
+        """
+        if self.jacobian is not None:
+            jacobian = self.jacobian(x, *self.best_fit)
+        else:
+            jacobian = numeric_jacobian(self.function, x, self.best_fit)
+        return delta_variance(jacobian, self.covariance)
+
+    def confidence_band(self, x: np.ndarray, level: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+        """Lower and Upper Confidence Band of the best fit curve at x (Delta Method).
+
+        Args:
+            x (np.ndarray): X Values
+            level (float): Confidence Level
+
+        """
+        expected = self.expect(x)
+        error = self._typed(self.critical_value(level) * np.sqrt(self.expected_variance(x)))
+        return expected - error, expected + error
+
+    def prediction_band(self, x: np.ndarray, level: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+        """Lower and Upper Prediction Band of new observations at x (Delta Method).
+
+        Args:
+            x (np.ndarray): X Values
+            level (float): Confidence Level
+
+        Notes:
+            Observation variance is estimated from the residuals, syx squared.
+
+        """
+        expected = self.expect(x)
+        error = self._typed(self.critical_value(level) * np.sqrt(self.expected_variance(x) + self.syx ** 2))
+        return expected - error, expected + error
+
+    def summary(self) -> Summary:
+        """Summary of Goodness of Fit Statistics, computed in a single pass over the residuals."""
+        if self.chunked:
+            moments = self._moments
+            return _summary(
+                moments["n"], self.k, moments["ssr"], moments["sse"], moments["chisq"], self.covariance
+            )
+        return summarize(self.residuals, self.ydata, self.k, self.yerror, self.covariance)
 
     @property
+    def chunked(self) -> bool:
+        """Whether statistics are streamed over chunks, rather than computed from full size arrays."""
+        memmap = isinstance(self.xdata, np.memmap) or isinstance(self.ydata, np.memmap)
+        return self.chunk_size is not None or memmap
+
+    def chunks(self) -> Iterator[slice]:
+        """Slices of consecutive observations, of chunk_size (default DEFAULT_CHUNK_SIZE)."""
+        size = self.chunk_size or DEFAULT_CHUNK_SIZE
+        for start in range(0, len(self.ydata), size):
+            yield slice(start, start + size)
+
+    @_cached
+    def _moments(self) -> dict:
+        """Number of finite observations, SSR, SSE, and weighted SSR, accumulated over chunks."""
+        n, ssr, chisq, mean, m2 = 0, 0.0, 0.0, 0.0, 0.0
+        for chunk in self.chunks():
+            y = np.asarray(self.ydata[chunk], dtype=float)
+            with np.errstate(all="ignore"):
+                r = y - self.expect(np.asarray(self.xdata[chunk], dtype=float))
+            valid = np.isfinite(r) & np.isfinite(y)
+            w = r
+            if self.yerror is not None:
+                error = np.asarray(self.yerror[chunk], dtype=float)
+                valid &= np.isfinite(error)
+                w = r / np.where(valid, error, 1.0)
+            count = np.count_nonzero(valid)
+            if count == 0:
+                continue
+            r, w, y = r[valid], w[valid], y[valid]
+            ssr += r @ r
+            chisq += w @ w
+
+            # Combine mean and sum of squared deviations of y with those of previous chunks
+            chunk_mean = y.mean()
+            delta = chunk_mean - mean
+            total = n + count
+            mean += delta * count / total
+            m2 += (y - chunk_mean) @ (y - chunk_mean) + delta ** 2 * n * count / total
+            n = total
+
+        return dict(n=n, ssr=ssr, sse=m2, chisq=chisq)
+
+    @_cached
     def parameters(self) -> np.ndarray:
         """Parameter names of a Given Function."""
         return np.asarray(getfullargspec(self.function).args[1:])
@@ -98,12 +551,12 @@ class Goodness:
         """Standard Deviation (std) of Best Fit Parameters."""
         return np.sqrt(self.covariance.diagonal())
 
-    @property
+    @_cached
     def expected(self) -> np.ndarray:
         """Expected Value given best fit parameters."""
         return self.expect(self.xdata)
 
-    @property
+    @_cached
     def residuals(self) -> np.ndarray:
         """Residual Difference between Observed and Expected."""
         return self.ydata - self.expected
@@ -111,9 +564,11 @@ class Goodness:
     @property
     def ssr(self) -> float:
         """Sum of Squared Residuals (SSR)"""
-        return np.power(self.residuals, 2).sum()
+        if self.chunked:
+            return self._moments["ssr"]
+        return np.power(self.residuals, 2).sum(dtype=np.float64)
 
-    @property
+    @_cached
     def dfm(self) -> np.ndarray:
         """Distance from the Mean"""
         return self.ydata - self.ydata.mean()
@@ -121,7 +576,9 @@ class Goodness:
     @property
     def sse(self) -> float:
         """Sum of Squared Error (SSE)."""
-        return np.power(self.dfm, 2).sum()
+        if self.chunked:
+            return self._moments["sse"]
+        return np.power(self.dfm, 2).sum(dtype=np.float64)
 
     @property
     def dof(self) -> int:
@@ -151,4 +608,4 @@ class Goodness:
     @property
     def rsq_adj(self) -> float:
         """Adjusted R-Squared Value"""
-        return (1 - self.rsq) * (self.dof - 1.0) / (self.k - 1.0)
+        return 1 - (1 - self.rsq) * (self.dof - 1.0) / (self.dof - self.k)
@@ -0,0 +1,222 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/multistart.py
+
+"""
+# Python Dependencies
+import warnings
+
+from contextlib import nullcontext
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import NamedTuple, Optional, Sequence, Tuple, Union
+from scipy.stats import qmc
+
+from .goodness_of_fit import Goodness
+from .telemetry import FitInfo
+
+
+SAMPLERS = ("sobol", "lhs")
+
+# Half width of the sampled range of unbounded parameters, relative to max(|reference|, 1)
+SPREAD = 10.0
+
+
+class MultiStart(NamedTuple):
+    """Outcome of every start of a multi-start fit.
+
+    Attributes:
+        starts: Initial parameters of every start, shape (n_starts, k)
+        ssr: Sum of Squared Residuals of every start's fit, NaN if failed or never run
+        converged: Whether each start was fit successfully
+        completed: Whether each start was run, rather than cancelled once stopped early
+        best: Index of the best converged start, or -1 if none converged
+        stopped: Whether remaining starts were cancelled, the best minimum having been reached
+
+    """
+    starts: np.ndarray
+    ssr: np.ndarray
+    converged: np.ndarray
+    completed: np.ndarray
+    best: int
+    stopped: bool
+
+
+def sample_starts(lower: np.ndarray,
+                  upper: np.ndarray,
+                  n_starts: int,
+                  sampler: str = "sobol",
+                  seed: Optional[int] = None,
+                  ) -> np.ndarray:
+    """Starting parameters spread over finite bounds, by a scrambled Sobol or Latin hypercube design."""
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler: {sampler}. Available: {', '.join(SAMPLERS)}")
+    lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+    assert np.all(np.isfinite(lower) & np.isfinite(upper)), "Bounds must be finite to sample."
+    assert np.all(lower < upper), "Lower bounds must be less than upper bounds."
+
+    design = qmc.Sobol(lower.size, seed=seed) if sampler == "sobol" else qmc.LatinHypercube(lower.size, seed=seed)
+    with warnings.catch_warnings():
+        # Sobol balance properties only hold for powers of two, acceptable here
+        warnings.simplefilter("ignore", UserWarning)
+        return qmc.scale(design.random(n_starts), lower, upper)
+
+
+def _box(good: Goodness, bounds: Optional[Tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    """Finite bounds to sample, about a reference point where a bound is infinite."""
+    k = good.k
+    lower, upper = (-np.inf, np.inf) if bounds is None else bounds
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), (k,))
+    upper = np.broadcast_to(np.asarray(upper, dtype=float), (k,))
+
+    reference = np.ones(k)
+    if good.best_fit is not None and np.all(np.isfinite(good.best_fit)):
+        reference = np.asarray(good.best_fit, dtype=float)
+    elif good.guess is not None:
+        guess = np.asarray(good.guess(good.xdata, good.ydata), dtype=float)
+        reference = np.where(np.isfinite(guess), guess, reference)
+    reference = np.clip(reference, lower, upper)
+
+    width = SPREAD * np.maximum(np.abs(reference), 1.0)
+    return np.where(np.isfinite(lower), lower, reference - width), np.where(np.isfinite(upper), upper, reference + width)
+
+
+def _start(good: Goodness,
+           p0: np.ndarray,
+           kwargs: dict,
+           quiet: bool = False,
+           ) -> Tuple[np.ndarray, np.ndarray, float, FitInfo]:
+    """Fit a copy of good from one starting point, ignoring its warnings when quiet (in a worker process)."""
+    start = Goodness(
+        good.function,
+        good.xdata,
+        good.ydata,
+        good.yerror,
+        jacobian=good.jacobian,
+        equation=good.equation,
+        dtype=good.dtype,
+    )
+    with warnings.catch_warnings() if quiet else nullcontext():
+        if quiet:
+            warnings.simplefilter("ignore")
+        try:
+            start.fit(p0=p0, **kwargs)
+        except (ValueError, np.linalg.LinAlgError):
+            start.best_fit = np.full(start.k, np.nan)
+            start.covariance = np.full((start.k, start.k), np.nan)
+    ssr = start.summary().ssr if np.all(np.isfinite(start.best_fit)) else np.nan
+    return start.best_fit, start.covariance, float(ssr), start.info
+
+
+def multistart(good: Goodness,
+               bounds: Optional[Tuple[Union[float, Sequence[float]], Union[float, Sequence[float]]]] = None,
+               n_starts: int = 16,
+               sampler: str = "sobol",
+               tolerance: Optional[float] = 1e-6,
+               agreement: int = 2,
+               executor: str = "thread",
+               max_workers: Optional[int] = None,
+               seed: Optional[int] = None,
+               **kwargs
+               ) -> MultiStart:
+    """Fit from many starting points concurrently, keeping the best fit on good.
+
+    Args:
+        good (Goodness): Goodness of Fit, updated with the best fit found (and its info)
+        bounds (Tuple): Lower and upper parameter bounds as for curve_fit, defaulting to
+            kwargs["bounds"], sampled over (see Notes) and passed on to every fit
+        n_starts (int): Number of starting points
+        sampler (str): Sample starting points by a "sobol" or Latin hypercube ("lhs") design
+        tolerance (float): Relative SSR within which converged starts reach the same minimum,
+            None to run every start
+        agreement (int): Number of converged starts reaching the lowest SSR found, before the
+            remaining starts are cancelled
+        executor (str): Fit starts on a pool of "thread"s or "process"es
+        max_workers (int): Number of workers, as defaulted by the pool
+        seed (int): Seed of the sampler
+        **kwargs: Keyword arguments passed to `Goodness.fit` (other than p0)
+
+    Notes:
+        Infinite bounds are replaced, for sampling only, by SPREAD times max(|reference|, 1)
+        about a reference point: the current best fit when finite, else the initial guess, else
+        ones. Starts already running when stopped early are completed, and taken into account.
+
+        A process pool requires the function (and jacobian) of good to be picklable, which
+        lambdified Equation functions are not.
+
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown executor: {executor}. Available: thread, process")
+    pool = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    if bounds is None:
+        bounds = kwargs.get("bounds")
+    elif "bounds" not in kwargs:
+        kwargs["bounds"] = bounds
+    kwargs.pop("p0", None)
+
+    starts = sample_starts(*_box(good, bounds), n_starts, sampler, seed)
+    results = {}
+    ssr = np.full(n_starts, np.nan)
+    converged = np.zeros(n_starts, dtype=bool)
+    stopped = False
+
+    # Warnings of individual starts are ignored, filtered once in this thread as catch_warnings
+    # is not thread safe (worker threads restoring filters concurrently would leak "ignore")
+    with warnings.catch_warnings(), pool(max_workers=max_workers) as workers:
+        warnings.simplefilter("ignore")
+        quiet = executor == "process"
+        futures = {workers.submit(_start, good, p0, kwargs, quiet): n for n, p0 in enumerate(starts)}
+        for future in as_completed(futures):
+            n = futures[future]
+            results[n] = future.result()
+            ssr[n] = results[n][2]
+            converged[n] = np.isfinite(ssr[n])
+            if tolerance is None or not converged.any():
+                continue
+            lowest = ssr[converged].min()
+            if np.count_nonzero(ssr[converged] <= lowest * (1 + tolerance)) >= agreement:
+                stopped = True
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    # Starts running when stopped have since completed
+    for future, n in futures.items():
+        if n not in results and future.done() and not future.cancelled():
+            results[n] = future.result()
+            ssr[n] = results[n][2]
+            converged[n] = np.isfinite(ssr[n])
+
+    completed = np.zeros(n_starts, dtype=bool)
+    completed[list(results)] = True
+    best = int(np.nanargmin(np.where(converged, ssr, np.nan))) if converged.any() else -1
+    if best < 0:
+        warnings.warn("Data Failed to be Fit from any of %d starts using: %s" % (
+            n_starts, getattr(good.function, "__name__", good.function)
+        ))
+    else:
+        good.best_fit, good.covariance, _, good.info = results[best]
+
+    return MultiStart(starts=starts, ssr=ssr, converged=converged, completed=completed, best=best, stopped=stopped)
@@ -0,0 +1,216 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/parallel.py
+
+"""
+# Python Dependencies
+import os
+import warnings
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .cache import KernelCache
+from .core import Equation
+from .expressions import Expression
+from .goodness_of_fit import Goodness
+
+
+# Worker State, built once per process by the pool initializer
+_worker: Dict[str, object] = {}
+
+
+class SharedArray:
+    """Numpy array backed by shared memory, referenced across processes by name.
+
+    Args:
+        array (np.ndarray): Data copied into a newly created shared memory block
+
+    """
+    __slots__ = ("shm", "array")
+
+    def __init__(self, array: np.ndarray):
+        array = np.ascontiguousarray(array, dtype=float)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self.shm.buf)
+        self.array[:] = array
+
+    @property
+    def spec(self) -> Tuple[str, tuple]:
+        """Name and shape, sufficient for another process to attach."""
+        return self.shm.name, self.array.shape
+
+    @staticmethod
+    def attach(spec: Tuple[str, tuple]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+        name, shape = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, np.ndarray(shape, dtype=float, buffer=shm.buf)
+
+    def release(self) -> None:
+        del self.array
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _initialize(expression: Expression,
+                backend: Optional[List[str]],
+                cache: Optional[KernelCache],
+                specs: Dict[str, Optional[Tuple[str, tuple]]],
+                ) -> None:
+    """Build the Equation once per worker, and attach to shared input arrays."""
+    _worker["equation"] = Equation(expression, backend, cache)
+    _worker["shm"] = []
+    for key, spec in specs.items():
+        if spec is None:
+            _worker[key] = None
+            continue
+        shm, array = SharedArray.attach(spec)
+        _worker["shm"].append(shm)
+        _worker[key] = array
+
+
+def _fit_chunk(start: int, stop: int, kwargs: dict) -> Tuple[int, int, np.ndarray, np.ndarray]:
+    """Fit rows [start, stop) of the shared arrays, ignoring non-finite observations."""
+    equation: Equation = _worker["equation"]
+    xdata, ydata, yerror = _worker["xdata"], _worker["ydata"], _worker["yerror"]
+    k = len(equation.expression.constants)
+    best_fit = np.full((stop - start, k), np.nan)
+    covariance = np.full((stop - start, k, k), np.nan)
+
+    for n, row in enumerate(range(start, stop)):
+        mask = np.isfinite(xdata[row]) & np.isfinite(ydata[row])
+        if yerror is not None:
+            mask &= np.isfinite(yerror[row])
+        if mask.sum() < k:
+            continue
+        good = Goodness.from_equation(
+            equation,
+            xdata[row][mask],
+            ydata[row][mask],
+            None if yerror is None else yerror[row][mask],
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            good.fit(**kwargs)
+        best_fit[n], covariance[n] = good.best_fit, good.covariance
+
+    return start, stop, best_fit, covariance
+
+
+def iter_fit_many(expression: Expression,
+                  xdata: np.ndarray,
+                  ydata: np.ndarray,
+                  yerror: Optional[np.ndarray] = None,
+                  backend: Optional[List[str]] = None,
+                  cache: Optional[KernelCache] = None,
+                  max_workers: Optional[int] = None,
+                  chunksize: Optional[int] = None,
+                  ordered: bool = True,
+                  **kwargs
+                  ) -> Iterator[Tuple[slice, np.ndarray, np.ndarray]]:
+    """Fit many independent curves across a pool of processes, yielding results by chunk.
+
+    Args:
+        expression (Expression): Expression describing every curve
+        xdata (np.ndarray): Observed X Values, shape (n_curves, n_points) or (n_points,)
+        ydata (np.ndarray): Observed Y Values, shape (n_curves, n_points), NaN padded if ragged
+        yerror (np.ndarray): Observed Error (standard deviation) in Y Values
+        backend (List[str]): Backend Modules used to evaluate the expression into a function.
+        cache (KernelCache): Optional on-disk cache of generated kernels, shared by workers
+        max_workers (int): Number of worker processes, defaulting to the number of processors
+        chunksize (int): Curves fit per task, defaulting to an even split of four tasks per worker
+        ordered (bool): Yield chunks in order, otherwise as they are completed
+        **kwargs: Keyword arguments passed to `Goodness.fit`
+
+    Yields:
+        (slice, np.ndarray, np.ndarray): Rows of the chunk, best fits (n, k), and covariances (n, k, k)
+
+    Notes:
+        Input arrays are copied once into shared memory, and only row offsets are sent with
+        each task. Every worker builds its own Equation once, when the pool starts.
+
+    """
+    ydata = np.atleast_2d(ydata)
+    arrays = dict(
+        xdata=np.broadcast_to(xdata, ydata.shape),
+        ydata=ydata,
+        yerror=None if yerror is None else np.broadcast_to(yerror, ydata.shape),
+    )
+    shared = {key: None if value is None else SharedArray(value) for key, value in arrays.items()}
+    n = ydata.shape[0]
+    if chunksize is None:
+        chunksize = max(1, -(-n // (4 * (max_workers or os.cpu_count() or 1))))
+
+    try:
+        specs = {key: None if value is None else value.spec for key, value in shared.items()}
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_initialize,
+            initargs=(expression, backend, cache, specs),
+        ) as executor:
+            futures = [
+                executor.submit(_fit_chunk, start, min(start + chunksize, n), kwargs)
+                for start in range(0, n, chunksize)
+            ]
+            for future in (futures if ordered else as_completed(futures)):
+                start, stop, best_fit, covariance = future.result()
+                yield slice(start, stop), best_fit, covariance
+
+    finally:
+        for value in shared.values():
+            if value is not None:
+                value.release()
+
+
+def fit_many(expression: Expression,
+             xdata: np.ndarray,
+             ydata: np.ndarray,
+             yerror: Optional[np.ndarray] = None,
+             **kwargs
+             ) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit many independent curves across a pool of processes.
+
+    Args:
+        expression (Expression): Expression describing every curve
+        xdata (np.ndarray): Observed X Values, shape (n_curves, n_points) or (n_points,)
+        ydata (np.ndarray): Observed Y Values, shape (n_curves, n_points), NaN padded if ragged
+        yerror (np.ndarray): Observed Error (standard deviation) in Y Values
+        **kwargs: Keyword arguments passed to `iter_fit_many`
+
+    Returns:
+        (np.ndarray, np.ndarray): Best fits (n_curves, k), and covariances (n_curves, k, k)
+
+    """
+    ydata = np.atleast_2d(ydata)
+    k = len(expression.constants)
+    best_fit = np.full((ydata.shape[0], k), np.nan)
+    covariance = np.full((ydata.shape[0], k, k), np.nan)
+
+    kwargs["ordered"] = False
+    for rows, params, cov in iter_fit_many(expression, xdata, ydata, yerror, **kwargs):
+        best_fit[rows], covariance[rows] = params, cov
+
+    return best_fit, covariance
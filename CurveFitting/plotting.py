@@ -26,14 +26,53 @@
 # Python Dependencies
 import numpy as np
 
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 from plotly import express as px
 from plotly import graph_objects as go
 
 from . import utils
 from .core import Equation
-from .goodness_of_fit import Goodness
+from .goodness_of_fit import Goodness, delta_variance, numeric_jacobian
+
+
+# Large Data: markers are drawn with WebGL above WEBGL_THRESHOLD points, and decimated (always
+# keeping outliers) above MAX_POINTS points
+WEBGL_THRESHOLD = 10_000
+MAX_POINTS = 5_000
+
+# Layouts of each kind of figure, built once and shared by every figure thereafter
+_layout_specs = dict(
+    fit=dict(
+        xaxis=dict(title="X"),
+        yaxis=dict(title="Y"),
+        font=dict(family="Times", size=12),
+    ),
+    residuals=dict(
+        xaxis=dict(title="X"),
+        yaxis=dict(title="Residuals"),
+        font=dict(family="Times", size=12),
+    ),
+    predicted=dict(
+        xaxis=dict(title="Observed Values"),
+        yaxis=dict(title="Anticipated Values"),
+        font=dict(family="Times", size=12),
+    ),
+    qqplot=dict(
+        title="Quantile-Quantile (QQ) Plot",
+        xaxis=dict(title="Observed RSD"),
+        yaxis=dict(title="Expected RSD"),
+        font=dict(family="times", size=12),
+    ),
+)
+_layouts: Dict[str, go.Layout] = {}
+
+
+def _layout(kind: str) -> go.Layout:
+    """Prebuilt layout of a kind of figure."""
+    if kind not in _layouts:
+        _layouts[kind] = go.Layout(**_layout_specs[kind])
+    return _layouts[kind]
 
 
 class Plotting:
@@ -58,86 +97,104 @@ class Plotting:
         return plot_predicted(self.good, color)
 
     def fit_all(self, equation: Equation, colors: Optional[List[str]] = None) -> go.Figure:
-        """Plot the Best Fit Parameters for the Original Data and given integral and derivatives."""
+        """Plot the Best Fit Parameters for the Original Data and given integral and derivatives.
+
+        Every curve is evaluated by the equation's fused kernel, sharing one grid. The 95% confidence
+        bands of all four curves are propagated from the full covariance (Delta Method), using
+        a finite difference jacobian of the kernel.
+
+        """
         if colors is None:
             colors = px.colors.qualitative.Prism[:]
         assert len(colors) > 3, "Must provide at least four colors."
-        figure = self.fit(colors[0], "f(x)")
-        _setup = zip(
-            [equation.derivative, equation.second_derivative, equation.integral],
-            [u"&#8706;f(x)", u"&#8706;&#8706;f(x)", u"&#x222b; f(x)"]
-        )
-        previous = self.good.function
+        good = self.good
+        x = _grid(good)
+        center = equation.kernel(x, *good.best_fit)
+        variance = delta_variance(numeric_jacobian(equation.kernel, x, good.best_fit), good.covariance)
+        error = (good.critical_value(0.95) * np.sqrt(variance)).astype(center.dtype)
+        upper, lower = center + error, center - error
+        names = ["f(x)", u"&#8706;f(x)", u"&#8706;&#8706;f(x)", u"&#x222b; f(x)"]
+
+        figure = go.Figure(layout=_layout("fit"))
+        _trace_data(figure, _markers(good, good.xdata, good.ydata, good.yerror, MAX_POINTS), colors[0])
+        for n, name in enumerate(names):
+            _trace_fit(figure, x, center[n], colors[n], name)
+            _plot_error(figure, x, lower[n], upper[n], colors[n], name)
 
-        for n, (eq, name) in enumerate(_setup, 1):
-            self.good.function = eq
-            _trace_fit(figure, self.good, colors[n], name)
-            _plot_error(figure, self.good, colors[n], name)
+        return figure
 
-        # Reset
-        self.good.function = previous
 
-        return figure
+def _grid(good: Goodness, size: int = 1_000) -> np.ndarray:
+    # For presentation purposes, refine the grid (up to size x values) where the fit is curved
+    x = utils.adaptive_grid(
+        good.expect,
+        np.nanmin(good.xdata),
+        np.nanmax(good.xdata),
+        size
+    )
+    # Evaluated (and serialized) in the precision of the data, when reduced
+    return x if good.dtype is None else x.astype(good.dtype)
 
 
-def qqplot(good: Goodness, color: str = "#579677"):
-    """Renders a Quantile-Quantile (QQ) Plot as a diagnostic QC tool for underlying fit."""
-    # Preparation
-    observed_rsd = good.dfm / good.ydata.std()
-    expect = good.expected
-    predicted_rsd = (expect - expect.mean()) / expect.std()
-    figure = go.Figure()
+def _scatter(size: int):
+    """Scatter trace type for a number of points, WebGL above the threshold."""
+    return go.Scattergl if size > WEBGL_THRESHOLD else go.Scatter
 
-    figure.add_trace(go.Scatter(
-        name="Quantile-Quantile",
-        x=observed_rsd,
-        y=predicted_rsd,
-        mode="markers",
-        marker=dict(
-            color=color,
-            size=4.5,
-        )
-    ))
 
-    figure.add_trace(go.Scatter(
-        name="fit",
-        mode="lines",
-        x=observed_rsd,
-        y=utils.line(observed_rsd, *utils.regression(observed_rsd, predicted_rsd)),
-        line=dict(
-            color=color,
-            shape="spline",
-            dash="dot",
-            width=1.25,
-        ),
-    ))
+def _sample(good: Goodness, x: np.ndarray, y: np.ndarray, max_points: Optional[int]):
+    """Index of drawn markers, decimated above max_points (None disables), keeping outliers."""
+    if max_points is None or np.size(x) <= max_points:
+        return slice(None)
+    return utils.decimate(x, y, max_points, keep=utils.outliers(good.residuals))
 
-    figure.update_layout(
-        title="Quantile-Quantile (QQ) Plot",
-        xaxis_title="Observed RSD",
-        yaxis_title="Expected RSD",
-        font=dict(
-            family="times",
-            size=12
-        )
-    )
 
-    return figure
+def _span(x: np.ndarray, idx) -> np.ndarray:
+    """X values of a straight line, only its end points when decimated."""
+    if isinstance(idx, slice):
+        return x
+    return np.array([np.nanmin(x), np.nanmax(x)])
 
 
-def _trace_fit(figure: go.Figure, good: Goodness, color: str, name: str):
-    # For presentation purposes (due to the nature of splining), use more x values
-    x = np.linspace(
-        np.nanmin(good.xdata),
-        np.nanmax(good.xdata),
-        1_000
-    )
+def _take(a: Optional[np.ndarray], idx) -> Optional[np.ndarray]:
+    return a if a is None else np.asarray(a)[idx]
+
+
+def _markers(good: Goodness,
+             x: np.ndarray,
+             y: np.ndarray,
+             error: Optional[np.ndarray],
+             max_points: Optional[int],
+             ) -> dict:
+    """Drawn markers (decimated when large) and their error, with the number of points observed."""
+    idx = _sample(good, x, y, max_points)
+    return dict(size=np.size(x), x=x[idx], y=y[idx], error=_take(error, idx), idx=idx)
+
+
+def _trace_data(figure: go.Figure, markers: dict, color: str):
+    figure.add_trace(_scatter(markers["size"])(
+        name="Data",
+        mode="markers",
+        x=markers["x"],
+        y=markers["y"],
+        error_y=dict(
+            type="data",
+            array=markers["error"],
+            color=color,
+            thickness=1.0,
+            width=1.75,
+        ),
+        marker=dict(
+            color=color
+        ),
+    ))
 
+
+def _trace_fit(figure: go.Figure, x: np.ndarray, y: np.ndarray, color: str, name: str):
     figure.add_trace(go.Scatter(
         name=f"{name} - Fit",
         mode="lines",
         x=x,
-        y=good.expect(x),
+        y=y,
         line=dict(
             color=color,
             shape="spline",
@@ -146,22 +203,12 @@ def _trace_fit(figure: go.Figure, good: Goodness, color: str, name: str):
     ))
 
 
-def _plot_error(figure: go.Figure, good: Goodness, color: str, name: str):
-    x = np.linspace(
-        np.nanmin(good.xdata),
-        np.nanmax(good.xdata),
-        1_000
-    )
-    error_95ci = utils.ci_x(good.std, 0.95)
-
+def _plot_error(figure: go.Figure, x: np.ndarray, lower: np.ndarray, upper: np.ndarray, color: str, name: str):
     figure.add_trace(go.Scatter(
         name=f"{name} - Error",
         mode="lines",
         x=np.concatenate((x, x[::-1])),
-        y=np.concatenate((
-            good.function(x, *(good.best_fit + error_95ci)),
-            good.function(x[::-1], *(good.best_fit - error_95ci)),
-        )),
+        y=np.concatenate((upper, lower[::-1])),
         line=dict(
             color=color,
             dash="dot",
@@ -172,54 +219,90 @@ def _plot_error(figure: go.Figure, good: Goodness, color: str, name: str):
     ))
 
 
-def plot_fit(good: Goodness, color: str = "rgb(29, 105, 150)", name: str = "f(x)"):
-    figure = go.Figure()
-
+def _trace_line(figure: go.Figure, x: np.ndarray, y: np.ndarray, color: str, width: float):
     figure.add_trace(go.Scatter(
-        name="Data",
-        mode="markers",
-        x=good.xdata,
-        y=good.ydata,
-        error_y=dict(
-            type="data",
-            array=good.yerror,
+        name="fit",
+        mode="lines",
+        x=x,
+        y=y,
+        line=dict(
             color=color,
-            thickness=1.0,
-            width=1.75,
-        ),
-        marker=dict(
-            color=color
+            shape="spline",
+            dash="dot",
+            width=width,
         ),
     ))
 
-    _trace_fit(figure, good, color, name)
-    _plot_error(figure, good, color, name)
 
-    figure.update_layout(
-        xaxis=dict(title="X"),
-        yaxis=dict(title="Y"),
-        font=dict(
-            family="Times",
-            size=12,
+# Figures are built in two steps: arrays are first computed from a Goodness of fit, from which the
+# figure is then built. Only the arrays are needed to build a figure (e.g. in another process).
+def _qqplot_data(good: Goodness, max_points: Optional[int] = MAX_POINTS) -> dict:
+    observed_rsd = good.dfm / good.ydata.std()
+    expect = good.expected
+    predicted_rsd = (expect - expect.mean()) / expect.std()
+    markers = _markers(good, observed_rsd, predicted_rsd, None, max_points)
+    x = _span(observed_rsd, markers["idx"])
+    return dict(markers=markers, x=x, y=utils.line(x, *utils.regression(observed_rsd, predicted_rsd)))
+
+
+def _qqplot_figure(data: dict, color: str = "#579677") -> go.Figure:
+    figure = go.Figure(layout=_layout("qqplot"))
+    markers = data["markers"]
+    figure.add_trace(_scatter(markers["size"])(
+        name="Quantile-Quantile",
+        x=markers["x"],
+        y=markers["y"],
+        mode="markers",
+        marker=dict(
+            color=color,
+            size=4.5,
         )
+    ))
+    _trace_line(figure, data["x"], data["y"], color, 1.25)
+    return figure
+
+
+def _fit_data(good: Goodness, max_points: Optional[int] = MAX_POINTS) -> dict:
+    x = _grid(good)
+    return dict(
+        markers=_markers(good, good.xdata, good.ydata, good.yerror, max_points),
+        x=x,
+        y=good.expect(x),
+        band=good.confidence_band(x, 0.95),
     )
 
+
+def _fit_figure(data: dict, color: str = "rgb(29, 105, 150)", name: str = "f(x)") -> go.Figure:
+    figure = go.Figure(layout=_layout("fit"))
+    _trace_data(figure, data["markers"], color)
+    _trace_fit(figure, data["x"], data["y"], color, name)
+    _plot_error(figure, data["x"], *data["band"], color, name)
     return figure
 
 
-def plot_residuals(good: Goodness, color: str = "rgb(56, 166, 165)", weighted: bool = True):
-    """Plots the Residuals of a Curve Fit Best Parameters."""
-    figure = go.Figure()
+def _residuals_data(good: Goodness, max_points: Optional[int] = MAX_POINTS, weighted: bool = True) -> dict:
     x, y = good.xdata, good.residuals
+    markers = _markers(good, x, y, good.yerror, max_points)
 
-    figure.add_trace(go.Scatter(
+    z = None
+    if weighted and good.yerror is not None:
+        z = utils.weights(good.yerror)
+
+    span = _span(x, markers["idx"])
+    return dict(markers=markers, x=span, y=utils.line(span, *utils.regression(x, y, z)))
+
+
+def _residuals_figure(data: dict, color: str = "rgb(56, 166, 165)") -> go.Figure:
+    figure = go.Figure(layout=_layout("residuals"))
+    markers = data["markers"]
+    figure.add_trace(_scatter(markers["size"])(
         name="data",
         mode="markers",
-        x=x,
-        y=y,
+        x=markers["x"],
+        y=markers["y"],
         error_y=dict(
             type="data",
-            array=good.yerror,
+            array=markers["error"],
             color=color,
             thickness=1.0,
             width=1.75,
@@ -229,50 +312,28 @@ def plot_residuals(good: Goodness, color: str = "rgb(56, 166, 165)", weighted: b
             size=4.5,
         ),
     ))
-
-    z = None
-    if weighted and good.yerror is not None:
-        z = utils.weights(good.yerror)
-
-    figure.add_trace(go.Scatter(
-        name="fit",
-        mode="lines",
-        x=x,
-        y=utils.line(x, *utils.regression(x, y, z)),
-        line=dict(
-            color=color,
-            shape="spline",
-            dash="dot",
-            width=1.25,
-        ),
-    ))
-
-    figure.update_layout(
-        xaxis=dict(title="X"),
-        yaxis=dict(title="Residuals"),
-        font=dict(
-            family="Times",
-            size=12,
-        )
-    )
-
+    _trace_line(figure, data["x"], data["y"], color, 1.25)
     return figure
 
 
-def plot_predicted(good: Goodness, color: str = "rgb(56, 166, 165)"):
-    """Plots Predicted"""
-    figure = go.Figure()
-
+def _predicted_data(good: Goodness, max_points: Optional[int] = MAX_POINTS) -> dict:
     x, y = good.ydata, good.expected
+    markers = _markers(good, x, y, good.yerror, max_points)
+    span = _span(x, markers["idx"])
+    return dict(markers=markers, x=span, y=utils.line(span, *utils.regression(x, y)))
 
-    figure.add_trace(go.Scatter(
+
+def _predicted_figure(data: dict, color: str = "rgb(56, 166, 165)") -> go.Figure:
+    figure = go.Figure(layout=_layout("predicted"))
+    markers = data["markers"]
+    figure.add_trace(_scatter(markers["size"])(
         name="data",
         mode="markers",
-        x=x,
-        y=y,
+        x=markers["x"],
+        y=markers["y"],
         error_x=dict(
             type="data",
-            array=good.yerror,
+            array=markers["error"],
             color=color,
             thickness=1.0,
             width=1.75,
@@ -282,27 +343,41 @@ def plot_predicted(good: Goodness, color: str = "rgb(56, 166, 165)"):
             size=4.0,
         ),
     ))
+    _trace_line(figure, data["x"], data["y"], color, 0.5)
+    return figure
 
-    figure.add_trace(go.Scatter(
-        name="fit",
-        mode="lines",
-        x=x,
-        y=utils.line(x, *utils.regression(x, y)),
-        line=dict(
-            color=color,
-            shape="spline",
-            dash="dot",
-            width=0.5
-        ),
-    ))
 
-    figure.update_layout(
-        xaxis=dict(title="Observed Values"),
-        yaxis=dict(title="Anticipated Values"),
-        font=dict(
-            family="Times",
-            size=12,
-        )
-    )
+# Arrays and figure builders of each kind of figure
+_figures: Dict[str, Tuple[Callable[..., dict], Callable[..., go.Figure]]] = dict(
+    fit=(_fit_data, _fit_figure),
+    residuals=(_residuals_data, _residuals_figure),
+    qqplot=(_qqplot_data, _qqplot_figure),
+    predicted=(_predicted_data, _predicted_figure),
+)
 
-    return figure
+
+def qqplot(good: Goodness, color: str = "#579677", max_points: Optional[int] = MAX_POINTS):
+    """Renders a Quantile-Quantile (QQ) Plot as a diagnostic QC tool for underlying fit."""
+    return _qqplot_figure(_qqplot_data(good, max_points), color)
+
+
+def plot_fit(good: Goodness,
+             color: str = "rgb(29, 105, 150)",
+             name: str = "f(x)",
+             max_points: Optional[int] = MAX_POINTS,
+             ):
+    return _fit_figure(_fit_data(good, max_points), color, name)
+
+
+def plot_residuals(good: Goodness,
+                   color: str = "rgb(56, 166, 165)",
+                   weighted: bool = True,
+                   max_points: Optional[int] = MAX_POINTS,
+                   ):
+    """Plots the Residuals of a Curve Fit Best Parameters."""
+    return _residuals_figure(_residuals_data(good, max_points, weighted), color)
+
+
+def plot_predicted(good: Goodness, color: str = "rgb(56, 166, 165)", max_points: Optional[int] = MAX_POINTS):
+    """Plots Predicted"""
+    return _predicted_figure(_predicted_data(good, max_points), color)
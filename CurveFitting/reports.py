@@ -0,0 +1,174 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/reports.py
+
+"""
+# Python Dependencies
+import os
+import json
+import tempfile
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from plotly import io as pio
+
+from . import plotting
+from .goodness_of_fit import Goodness
+
+
+FORMATS = ("html", "json")
+
+
+def _payload(good: Goodness, figures: Sequence[str], max_points: Optional[int]) -> Dict[str, dict]:
+    """Arrays of every figure of a report, computed from its Goodness of fit."""
+    return {kind: plotting._figures[kind][0](good, max_points) for kind in figures}
+
+
+def _render(name: str,
+            payload: Dict[str, dict],
+            directory: str,
+            formats: Sequence[str],
+            include_plotlyjs: Union[bool, str],
+            ) -> List[str]:
+    """Build the figures of one report from its arrays, writing each as soon as it is built."""
+    handles = {
+        fmt: tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) for fmt in formats
+    }
+    try:
+        if "html" in handles:
+            handles["html"].write('<html>\n<head><meta charset="utf-8" /></head>\n<body>\n')
+        if "json" in handles:
+            handles["json"].write("{")
+
+        for n, (kind, data) in enumerate(payload.items()):
+            figure = plotting._figures[kind][1](data)
+            if "html" in handles:
+                handles["html"].write(pio.to_html(
+                    figure, full_html=False, include_plotlyjs=include_plotlyjs if n == 0 else False
+                ))
+            if "json" in handles:
+                handles["json"].write(f"{', ' if n else ''}{json.dumps(kind)}: ")
+                handles["json"].write(pio.to_json(figure, validate=False))
+            del figure
+
+        if "html" in handles:
+            handles["html"].write("\n</body>\n</html>\n")
+        if "json" in handles:
+            handles["json"].write("}\n")
+    except BaseException:
+        # No partial report is left behind, neither as .tmp nor in place of a previous one
+        for handle in handles.values():
+            handle.close()
+            os.remove(handle.name)
+        raise
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    paths = []
+    for fmt, handle in handles.items():
+        path = os.path.join(directory, f"{name}.{fmt}")
+        os.replace(handle.name, path)
+        paths.append(path)
+    return paths
+
+
+def iter_render_reports(goods: Union[Mapping[str, Goodness], Iterable[Tuple[str, Goodness]]],
+                        directory: str,
+                        figures: Sequence[str] = tuple(plotting._figures),
+                        formats: Sequence[str] = ("html",),
+                        max_workers: Optional[int] = None,
+                        max_in_flight: Optional[int] = None,
+                        max_points: Optional[int] = plotting.MAX_POINTS,
+                        include_plotlyjs: Union[bool, str] = "cdn",
+                        ) -> Iterator[Tuple[str, List[str]]]:
+    """Render a report of figures for each of many fits across a pool of processes, as they complete.
+
+    Args:
+        goods (Mapping[str, Goodness]): Goodness of fit by report name, or (name, Goodness) pairs
+        directory (str): Directory to which reports are written, one file per report and format
+        figures (Sequence[str]): Figures of each report, any of fit, residuals, qqplot, predicted
+        formats (Sequence[str]): Formats written, any of html, json
+        max_workers (int): Number of worker processes, defaulting to the number of processors
+        max_in_flight (int): Maximum number of reports submitted but not yet written, defaulting to
+            twice the number of workers
+        max_points (int): Markers drawn per figure, decimated beyond (see plotting.MAX_POINTS)
+        include_plotlyjs (bool | str): How plotly.js is included in html reports (see plotly.io.to_html)
+
+    Yields:
+        (str, List[str]): Report name, and paths of the files written
+
+    Notes:
+        Only the arrays of each figure are computed in this process (fit functions are generally
+        not picklable), and sent to workers which build figures from prebuilt layouts, writing
+        them to disk as they go. Fits are consumed lazily from goods, and no more than max_in_flight
+        reports are held in memory at once.
+
+    """
+    unknown = set(figures) - set(plotting._figures)
+    if unknown:
+        available = ", ".join(plotting._figures)
+        raise ValueError(f"Unknown figures: {', '.join(sorted(unknown))}. Available: {available}")
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown formats: {', '.join(sorted(unknown))}. Available: {', '.join(FORMATS)}")
+
+    items = goods.items() if isinstance(goods, Mapping) else goods
+    os.makedirs(directory, exist_ok=True)
+    if max_in_flight is None:
+        max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        for name, good in items:
+            while len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+            payload = _payload(good, figures, max_points)
+            pending[executor.submit(_render, name, payload, directory, formats, include_plotlyjs)] = name
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
+
+def render_reports(goods: Union[Mapping[str, Goodness], Iterable[Tuple[str, Goodness]]],
+                   directory: str,
+                   **kwargs
+                   ) -> Dict[str, List[str]]:
+    """Render a report of figures for each of many fits across a pool of processes.
+
+    Args:
+        goods (Mapping[str, Goodness]): Goodness of fit by report name, or (name, Goodness) pairs
+        directory (str): Directory to which reports are written, one file per report and format
+        **kwargs: Keyword arguments passed to `iter_render_reports`
+
+    Returns:
+        Dict[str, List[str]]: Paths of the files written, by report name
+
+    """
+    return dict(iter_render_reports(goods, directory, **kwargs))
@@ -0,0 +1,174 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/resampling.py
+
+"""
+# Python Dependencies
+import warnings
+
+import numpy as np
+
+from typing import NamedTuple, Optional, TYPE_CHECKING
+from scipy.optimize import curve_fit
+from scipy.stats import norm
+
+from .batch import BatchGoodness
+
+if TYPE_CHECKING:
+    from .goodness_of_fit import Goodness
+
+
+class Bootstrap(NamedTuple):
+    """Bootstrap Distribution of Best Fit Parameters.
+
+    Attributes:
+        samples: Refit parameters of every resample, C-contiguous with shape (n_resamples, k)
+        lower: Lower Bound of each parameter's confidence interval, shape (k,)
+        upper: Upper Bound of each parameter's confidence interval, shape (k,)
+        converged: Whether each resample was fit successfully (NaN samples otherwise)
+
+    """
+    samples: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    converged: np.ndarray
+
+
+def resample(good: "Goodness",
+             indices: np.ndarray,
+             method: str = "residual",
+             ):
+    """Stacked resampled observations (x, y, yerror) of a fit, one row per row of indices.
+
+    Args:
+        good (Goodness): Fit Goodness, with best fit parameters
+        indices (np.ndarray): Indices of observations drawn with replacement, shape (n_resamples, n)
+        method (str): Resample (weighted) residuals about the best fit curve ("residual") or
+            whole observations ("pairs")
+
+    """
+    x = np.asarray(good.xdata, dtype=float)
+    yerror = None if good.yerror is None else np.asarray(good.yerror, dtype=float)
+    if method == "pairs":
+        y = np.asarray(good.ydata, dtype=float)
+        return x[indices], y[indices], yerror if yerror is None else yerror[indices]
+    if method != "residual":
+        raise ValueError(f"Unknown resampling method: {method}. Available: residual, pairs")
+
+    if yerror is None:
+        return x, good.expected + good.residuals[indices], None
+    return x, good.expected + yerror * (good.residuals / yerror)[indices], yerror
+
+
+def _refit(good: "Goodness", x: np.ndarray, y: np.ndarray, yerror: Optional[np.ndarray]) -> np.ndarray:
+    """Parameters refit to stacked observations, warm started from the best fit."""
+    equation = getattr(good, "equation", None)
+    if equation is not None:
+        batch = BatchGoodness(equation, x, y, yerror)
+        batch.fit(p0=good.best_fit)
+        return batch.best_fit
+
+    x, y = np.broadcast_arrays(x, y)
+    yerror = yerror if yerror is None else np.broadcast_to(yerror, y.shape)
+    params = np.full((y.shape[0], good.k), np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for n in range(y.shape[0]):
+            mask = np.isfinite(x[n]) & np.isfinite(y[n])
+            try:
+                params[n] = curve_fit(
+                    good.function, x[n][mask], y[n][mask], p0=good.best_fit,
+                    sigma=None if yerror is None else yerror[n][mask], jac=good.jacobian,
+                )[0]
+            except (RuntimeError, ValueError):
+                pass
+    return params
+
+
+def _jackknife(good: "Goodness") -> np.ndarray:
+    """Leave-one-out parameters, each observation dropped by NaN padding, shape (n, k)."""
+    n = len(good.ydata)
+    y = np.tile(np.asarray(good.ydata, dtype=float), (n, 1))
+    y[np.arange(n), np.arange(n)] = np.nan
+    return _refit(good, np.asarray(good.xdata, dtype=float), y, good.yerror)
+
+
+def bootstrap(good: "Goodness",
+              n_resamples: int = 2_000,
+              method: str = "residual",
+              level: float = 0.95,
+              interval: str = "bca",
+              seed: Optional[int] = None,
+              ) -> Bootstrap:
+    """Bootstrap Confidence Intervals of Best Fit Parameters.
+
+    Args:
+        good (Goodness): Fit Goodness, with best fit parameters
+        n_resamples (int): Number of resamples
+        method (str): Resample (weighted) residuals about the best fit curve ("residual") or
+            whole observations ("pairs")
+        level (float): Confidence Level
+        interval (str): Percentile ("percentile") or bias corrected and accelerated ("bca") intervals
+        seed (int): Seed of the random number generator, for reproducible resamples
+
+    Notes:
+        Resample indices are drawn as a single (n_resamples, n) array. Every refit is warm started
+        from the best fit; all resamples are refit at once by a vectorized Levenberg-Marquardt
+        batch when the fit was built from an Equation (see Goodness.from_equation), otherwise
+        one at a time with curve_fit. Resamples failing to converge are excluded from intervals.
+
+        BCa acceleration is estimated from a jackknife, refit in the same way.
+
+    References:
+        1. Efron, B. and Tibshirani, R.J. (1993) An Introduction to the Bootstrap, Chapter 14.
+
+    """
+    assert 0 < level < 1.0
+    if interval not in ("percentile", "bca"):
+        raise ValueError(f"Unknown interval: {interval}. Available: percentile, bca")
+
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(good.ydata), size=(n_resamples, len(good.ydata)))
+    samples = np.ascontiguousarray(_refit(good, *resample(good, indices, method)))
+    converged = np.all(np.isfinite(samples), axis=1)
+    finite = samples[converged]
+
+    alpha = np.array([(1 - level) / 2, (1 + level) / 2])
+    if interval == "percentile":
+        quantiles = np.broadcast_to(alpha, (good.k, 2))
+    else:
+        with np.errstate(all="ignore"):
+            bias = norm.ppf(np.mean(finite < good.best_fit, axis=0))
+            jackknife = _jackknife(good)
+            distance = np.nanmean(jackknife, axis=0) - jackknife
+            acceleration = np.nansum(distance ** 3, axis=0) / (6 * np.nansum(distance ** 2, axis=0) ** 1.5)
+            z = bias[:, None] + norm.ppf(alpha)
+            quantiles = norm.cdf(bias[:, None] + z / (1 - acceleration[:, None] * z))
+        quantiles = np.where(np.isfinite(quantiles), quantiles, alpha)
+
+    bounds = np.full((good.k, 2), np.nan)
+    if finite.shape[0]:
+        for j in range(good.k):
+            bounds[j] = np.quantile(finite[:, j], quantiles[j])
+
+    return Bootstrap(samples=samples, lower=bounds[:, 0], upper=bounds[:, 1], converged=converged)
@@ -0,0 +1,242 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/selection.py
+
+"""
+# Python Dependencies
+import warnings
+
+from contextlib import nullcontext
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from scipy.stats import f as fisher
+
+from .core import get_equation
+from .goodness_of_fit import Goodness
+
+
+SIGMOIDS = ("VariableSlopeDoseResponse", "BoltzmanSigmoidal", "LogisticGrowth", "GompertzGrowth")
+CRITERIA = ("aic", "aicc", "bic", "f")
+
+
+class Candidate(NamedTuple):
+    """One Row of a Model Selection Table.
+
+    Attributes:
+        name: Name of the registered expression
+        k: Number of Parameters
+        n: Number of (finite) observations
+        ssr: Sum of Squared Residuals (SSR)
+        aic: Akaike Information Criterion (AIC)
+        aicc: AIC with Correction for small sample sizes (AICc)
+        bic: Bayesian Information Criterion (BIC)
+        weight: Akaike weight (relative likelihood) by the ranking criterion (AICc for F-tests)
+        pvalue: Extra sum-of-squares F-test p-value against the winner, if their k differ
+        stopped: Whether the candidate was stopped early, clearly dominated on a subsample
+
+    """
+    name: str
+    k: int
+    n: int
+    ssr: float
+    aic: float
+    aicc: float
+    bic: float
+    weight: float
+    pvalue: float
+    stopped: bool
+
+
+class Selection(NamedTuple):
+    """Ranked Model Selection Table, and the Goodness of Fit of every fully fit candidate."""
+    table: List[Candidate]
+    best: Goodness
+    fits: Dict[str, Goodness]
+
+
+def _fit(name: str,
+         xdata: np.ndarray,
+         ydata: np.ndarray,
+         yerror: Optional[np.ndarray],
+         kwargs: dict,
+         quiet: bool = False,
+         ) -> Tuple[np.ndarray, np.ndarray]:
+    """Best fit and covariance of a registered expression, reusing its cached Equation.
+
+    Warnings are ignored here only when quiet (in a worker process), worker threads instead relying
+    on the filter set once by select_model, as catch_warnings is not thread safe.
+    """
+    good = Goodness.from_equation(get_equation(name), xdata, ydata, yerror)
+    with warnings.catch_warnings() if quiet else nullcontext():
+        if quiet:
+            warnings.simplefilter("ignore")
+        try:
+            good.fit(**kwargs)
+        except (ValueError, np.linalg.LinAlgError):
+            good.best_fit = np.full(good.k, np.nan)
+            good.covariance = np.full((good.k, good.k), np.nan)
+    return good.best_fit, good.covariance
+
+
+def f_test(ssr_null: float, k_null: int, ssr_alternative: float, k_alternative: int, n: int) -> float:
+    """P-value of the extra sum-of-squares F-test, of a simpler (null) versus alternative model."""
+    if k_alternative == k_null:
+        return np.nan
+    if k_alternative < k_null:
+        ssr_null, k_null, ssr_alternative, k_alternative = ssr_alternative, k_alternative, ssr_null, k_null
+    dfn, dfd = k_alternative - k_null, n - k_alternative
+    with np.errstate(all="ignore"):
+        statistic = ((ssr_null - ssr_alternative) / dfn) / (ssr_alternative / dfd)
+    return fisher.sf(statistic, dfn, dfd)
+
+
+def _score(summary, criterion: str) -> float:
+    value = getattr(summary, "aicc" if criterion == "f" else criterion)
+    return value if np.isfinite(value) else np.inf
+
+
+def select_model(xdata: np.ndarray,
+                 ydata: np.ndarray,
+                 yerror: Optional[np.ndarray] = None,
+                 candidates: Sequence[str] = SIGMOIDS,
+                 criterion: str = "aicc",
+                 alpha: float = 0.05,
+                 executor: str = "thread",
+                 max_workers: Optional[int] = None,
+                 early_stop: Optional[float] = None,
+                 **kwargs
+                 ) -> Selection:
+    """Fit each candidate expression concurrently, ranking them by an information criterion or F-test.
+
+    Args:
+        xdata (np.ndarray): Observed X Values
+        ydata (np.ndarray): Observed Y Values
+        yerror (np.ndarray): Observed Error (standard deviation) in Y Values
+        candidates (Sequence[str]): Names of registered expressions
+        criterion (str): Rank by lowest "aic", "aicc", or "bic", or by extra sum-of-squares "f" tests
+        alpha (float): Significance level of F-tests
+        executor (str): Fit candidates on a pool of "thread"s or "process"es
+        max_workers (int): Number of workers, defaulting to one per candidate
+        early_stop (float): Criterion margin, beyond which candidates clearly dominated on a
+            subsample are not fit to the full data (disabled by default)
+        **kwargs: Keyword arguments passed to `Goodness.fit`
+
+    Returns:
+        Selection: Candidates ranked best first, the winning Goodness, and every completed Goodness
+
+    Notes:
+        Equations are built once per process and reused across calls. With an F-test, candidates
+        are compared in order of increasing k, where a more complex model replaces the current
+        winner only when significantly better (p < alpha); the rest are ranked by AICc.
+
+        Early stopping first fits every candidate to every fourth observation. Those whose criterion
+        exceeds the best by more than early_stop are reported as stopped, and the rest are refit
+        to the full data, warm started from their subsample fit.
+
+    """
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown criterion: {criterion}. Available: {', '.join(CRITERIA)}")
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown executor: {executor}. Available: thread, process")
+    pool = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    candidates = list(candidates)
+
+    stopped = set()
+    warm = {}
+    quiet = executor == "process"
+    with warnings.catch_warnings(), pool(max_workers=max_workers or len(candidates)) as workers:
+        warnings.simplefilter("ignore")
+        if early_stop is not None:
+            sub = slice(None, None, 4)
+            subset = (xdata[sub], ydata[sub], None if yerror is None else yerror[sub])
+            futures = {name: workers.submit(_fit, name, *subset, kwargs, quiet) for name in candidates}
+            scores = {}
+            for name, future in futures.items():
+                warm[name] = future.result()[0]
+                good = Goodness.from_equation(get_equation(name), *subset, best_fit=warm[name])
+                scores[name] = _score(good.summary(), criterion)
+            lowest = min(scores.values())
+            stopped = {
+                name for name, score in scores.items() if np.isfinite(score) and score - lowest > early_stop
+            }
+
+        futures = {
+            name: workers.submit(_fit, name, xdata, ydata, yerror, (
+                dict(kwargs, p0=warm[name]) if np.all(np.isfinite(warm.get(name, np.nan))) else kwargs
+            ), quiet)
+            for name in candidates if name not in stopped
+        }
+        fits = {}
+        for name, future in futures.items():
+            best_fit, covariance = future.result()
+            fits[name] = Goodness.from_equation(
+                get_equation(name), xdata, ydata, yerror, best_fit=best_fit, covariance=covariance
+            )
+
+    summaries = {name: good.summary() for name, good in fits.items()}
+    order = sorted(fits, key=lambda name: _score(summaries[name], criterion))
+    if criterion == "f":
+        winner = None
+        for name in sorted(order, key=lambda name: fits[name].k):
+            if not np.all(np.isfinite(fits[name].best_fit)):
+                continue
+            if winner is None or (fits[name].k > fits[winner].k and f_test(
+                summaries[winner].ssr, fits[winner].k, summaries[name].ssr, fits[name].k, summaries[name].n
+            ) < alpha):
+                winner = name
+        if winner is not None:
+            order.remove(winner)
+            order.insert(0, winner)
+    best = order[0]
+
+    scores = np.array([_score(summaries[name], criterion) for name in order])
+    with np.errstate(all="ignore"):
+        weights = np.exp(-0.5 * (scores - scores.min()))
+        weights = weights / weights.sum()
+
+    table = [
+        Candidate(
+            name=name,
+            k=fits[name].k,
+            n=int(summaries[name].n),
+            ssr=float(summaries[name].ssr),
+            aic=float(summaries[name].aic),
+            aicc=float(summaries[name].aicc),
+            bic=float(summaries[name].bic),
+            weight=float(weight),
+            pvalue=np.nan if name == best else float(f_test(
+                summaries[best].ssr, fits[best].k, summaries[name].ssr, fits[name].k, summaries[name].n
+            )),
+            stopped=False,
+        )
+        for name, weight in zip(order, weights)
+    ]
+    for name in candidates:
+        if name in stopped:
+            k = len(get_equation(name).expression.constants)
+            table.append(Candidate(name, k, 0, np.nan, np.nan, np.nan, np.nan, 0.0, np.nan, True))
+
+    return Selection(table=table, best=fits[best], fits=fits)
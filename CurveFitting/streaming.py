@@ -0,0 +1,217 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/streaming.py
+
+"""
+# Python Dependencies
+import numpy as np
+
+from typing import Callable, Optional, TYPE_CHECKING
+
+from .goodness_of_fit import Goodness, _method
+
+if TYPE_CHECKING:
+    from .core import Equation
+
+
+class StreamingGoodness(Goodness):
+    """Goodness of Fit over a Growing Dataset, Refit Incrementally with Warm Starts.
+
+    Args:
+        function (Callable): function describing data
+        capacity (int): Initial number of observations preallocated, doubled as needed
+        refit_every (int): Refit after this many new observations (None disables)
+        drift (float): Also refit when the root mean squared residual of new observations
+            exceeds this multiple of syx at the last fit (None disables)
+        jacobian (Callable): Parameter Jacobian of function, returning an array of shape (n, k)
+        guess (Callable): Data driven initial parameters f(xdata, ydata), used for the first fit
+        **kwargs: Keyword arguments passed to `Goodness.fit` on every refit
+
+    Notes:
+        Observations are appended into preallocated buffers; xdata, ydata, and yerror are views
+        of the filled portion. Each refit starts from the previous best fit, scaling parameters by
+        their previous standard deviation. Degrees of freedom, SSE, and SSR are running statistics,
+        updated from new observations only; SSR is recomputed over the full history after a refit.
+
+    """
+    def __init__(self,
+                 function: Callable,
+                 capacity: int = 256,
+                 refit_every: Optional[int] = 1,
+                 drift: Optional[float] = None,
+                 jacobian: Optional[Callable] = None,
+                 guess: Optional[Callable] = None,
+                 **kwargs
+                 ) -> None:
+        self._x = np.empty(capacity)
+        self._y = np.empty(capacity)
+        self._e = None
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ssr = np.nan
+        self._pending = 0
+        self._pending_ssr = 0.0
+        self._scale = np.nan
+
+        self.refit_every = refit_every
+        self.drift = drift
+        self.fit_kwargs = kwargs
+        super().__init__(function, self._x[:0], self._y[:0], jacobian=jacobian, guess=guess)
+
+    @classmethod
+    def from_equation(cls, equation: "Equation", capacity: int = 256, **kwargs) -> "StreamingGoodness":
+        """Streaming Goodness of Fit for an Equation, fit using its analytic parameter jacobian.
+
+        When the expression carries an initial guess routine, it is used to start the first fit.
+
+        """
+        if equation.expression.guess is not None:
+            kwargs.setdefault("guess", equation.expression.initial_guess)
+        good = cls(equation.equation, capacity, jacobian=equation.jacobian, **kwargs)
+        good.equation = equation
+        return good
+
+    @classmethod
+    def from_npy(cls, *args, **kwargs):
+        """Not supported, observations are appended into growing in memory buffers instead."""
+        raise TypeError("StreamingGoodness cannot be memory mapped, append observations instead.")
+
+    @property
+    def capacity(self) -> int:
+        """Number of observations currently preallocated."""
+        return self._x.size
+
+    def _reserve(self, size: int) -> None:
+        capacity = self.capacity
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_x", "_y", "_e"):
+            old = getattr(self, name)
+            if old is not None:
+                new = np.empty(capacity)
+                new[:self._n] = old[:self._n]
+                setattr(self, name, new)
+
+    def append(self,
+               x: np.ndarray,
+               y: np.ndarray,
+               yerror: Optional[np.ndarray] = None,
+               ) -> bool:
+        """Append one or more observations, refitting when due. Returns whether a refit occurred."""
+        x, y = np.atleast_1d(x).astype(float), np.atleast_1d(y).astype(float)
+        assert x.shape == y.shape, "X and Y Data Must Be the Same Shape."
+        if self._n == 0 and yerror is not None:
+            self._e = np.empty(self.capacity)
+        assert (yerror is None) == (self._e is None), "Error must be provided for all observations, or none."
+
+        start, stop = self._n, self._n + x.size
+        self._reserve(stop)
+        self._x[start:stop] = x
+        self._y[start:stop] = y
+        if yerror is not None:
+            self._e[start:stop] = yerror
+        self._n = stop
+        self._update(x, y)
+
+        self.xdata = self._x[:stop]
+        self.ydata = self._y[:stop]
+        self.yerror = None if self._e is None else self._e[:stop]
+
+        if self._due():
+            self.refit()
+            return True
+        return False
+
+    def _update(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Update running statistics from new observations (Chan et al. parallel variance)."""
+        n, m = self._n - x.size, x.size
+        mean = y.mean()
+        delta = mean - self._mean
+        self._m2 += np.power(y - mean, 2).sum() + delta ** 2 * n * m / (n + m)
+        self._mean += delta * m / (n + m)
+
+        if self._fitted:
+            ssr = np.power(y - self.function(x, *self.best_fit), 2).sum()
+            self._ssr += ssr
+            self._pending_ssr += ssr
+        self._pending += m
+
+    @property
+    def _fitted(self) -> bool:
+        return self.best_fit is not None and bool(np.all(np.isfinite(self.best_fit)))
+
+    def _due(self) -> bool:
+        if self._n < self.k:
+            return False
+        if not self._fitted:
+            return True
+        if self.refit_every is not None and self._pending >= self.refit_every:
+            return True
+        if self.drift is not None and self._pending:
+            return (self._pending_ssr / self._pending) ** 0.5 > self.drift * self._scale
+        return False
+
+    def _warm_start(self, options: dict) -> dict:
+        """Fit keyword arguments (fit_kwargs updated by options) starting from the previous best fit."""
+        kwargs = dict(self.fit_kwargs)
+        if self._fitted:
+            kwargs["p0"] = self.best_fit
+        kwargs.update(options)
+        if not self._fitted:
+            return kwargs
+
+        std = self.std if self.covariance is not None else None
+        if std is not None and np.all(np.isfinite(std)) and np.all(std > 0):
+            # Parameter scales, named by the solver curve_fit resolves (lm for infinite bounds)
+            if _method(kwargs) == "lm":
+                kwargs.setdefault("diag", 1.0 / std)
+            else:
+                kwargs.setdefault("x_scale", std)
+        return kwargs
+
+    def refit(self, **kwargs) -> None:
+        """Refit all observations, warm started from the previous best fit."""
+        self.fit(**self._warm_start(kwargs))
+
+        self._ssr = np.power(self.residuals, 2).sum() if self._fitted else np.nan
+        self._scale = (self._ssr / (self._n - self.k)) ** 0.5 if self._n > self.k else np.inf
+        self._pending = 0
+        self._pending_ssr = 0.0
+
+    @property
+    def ssr(self) -> float:
+        """Sum of Squared Residuals (SSR), maintained incrementally."""
+        return self._ssr
+
+    @property
+    def sse(self) -> float:
+        """Sum of Squared Error (SSE), maintained incrementally."""
+        return self._m2
+
+    @property
+    def dof(self) -> int:
+        """Degrees of Freedom (DOF), n"""
+        return self._n
@@ -0,0 +1,210 @@
+# MIT License
+#
+# Copyright (c) 2022 Spill-Tea
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+    CurveFitting/telemetry.py
+
+"""
+# Python Dependencies
+import functools
+import threading
+import time
+
+import numpy as np
+
+from typing import Callable, Dict, List, NamedTuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .goodness_of_fit import Goodness
+
+
+class FitInfo(NamedTuple):
+    """Telemetry of a single fit, recorded by `Goodness.fit` as `Goodness.info`.
+
+    Attributes:
+        name (str): Name of the fit function
+        n (int): Number of observations
+        k (int): Number of parameters
+        nfev (int): Calls of the function, including those by curve_fit to validate its output
+        njev (int): Calls of the jacobian, zero when estimated by finite differences (within nfev)
+        status (int): Solver termination status (e.g. MINPACK's ier), None if the fit failed
+        message (str): Solver termination message, or the error raised if the fit failed
+        success (bool): Whether optimal parameters were found
+        elapsed (float): Wall time of the fit, in seconds
+        model_time (float): Wall time within the function and jacobian, in seconds
+
+    """
+    name: str
+    n: int
+    k: int
+    nfev: int
+    njev: int
+    status: Optional[int]
+    message: str
+    success: bool
+    elapsed: float
+    model_time: float
+
+    @property
+    def solver_time(self) -> float:
+        """Wall time within the solver itself, outside of the function and jacobian."""
+        return self.elapsed - self.model_time
+
+    @property
+    def iterations(self) -> int:
+        """Number of iterations, one jacobian each, estimated as nfev / (k + 1) by finite differences."""
+        return self.njev if self.njev else self.nfev // (self.k + 1)
+
+    @property
+    def iteration_time(self) -> float:
+        """Mean wall time of an iteration, in seconds."""
+        return self.elapsed / self.iterations if self.iterations else np.nan
+
+
+class Meter:
+    """Counts calls of, and accumulates wall time within, a wrapped callable."""
+    __slots__ = ("calls", "elapsed")
+
+    def __init__(self):
+        self.calls = 0
+        self.elapsed = 0.0
+
+    def wrap(self, function: Callable) -> Callable:
+        """Metered function, keeping its signature (e.g. for curve_fit to count parameters)."""
+        @functools.wraps(function)
+        def metered(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.elapsed += time.perf_counter() - start
+                self.calls += 1
+
+        return metered
+
+
+def function_name(good: "Goodness") -> str:
+    """Name of the function of a fit, the registered name of its expression when available."""
+    if good.equation is not None:
+        # Deferred, such that importing Goodness does not import sympy
+        from .expressions import name_of
+        name = name_of(good.equation.expression)
+        if name is not None:
+            return name
+    return getattr(good.function, "__name__", type(good.function).__name__)
+
+
+Hook = Callable[["Goodness", FitInfo], None]
+_hooks: List[Hook] = []
+
+
+def add_hook(hook: Hook) -> Hook:
+    """Register a hook, called with (good, info) after every fit in this process. Usable as a decorator."""
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook: Hook) -> None:
+    """Unregister a hook, if registered."""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def notify(good: "Goodness", info: FitInfo) -> None:
+    """Call every registered hook with a completed fit."""
+    for hook in tuple(_hooks):
+        hook(good, info)
+
+
+class Counters(NamedTuple):
+    """Aggregate telemetry of every fit of one function."""
+    name: str
+    fits: int
+    failures: int
+    nfev: int
+    njev: int
+    elapsed: float
+    model_time: float
+    max_elapsed: float
+
+    @property
+    def solver_time(self) -> float:
+        """Wall time within the solver itself, outside of the function and jacobian."""
+        return self.elapsed - self.model_time
+
+    @property
+    def mean_elapsed(self) -> float:
+        """Mean wall time of a fit, in seconds."""
+        return self.elapsed / self.fits if self.fits else np.nan
+
+
+class Telemetry:
+    """Aggregate counters across many fits, by function name.
+
+    A hook (or callback of `Goodness.fit`), thread safe, and registered as a hook for the
+    duration of a with block, e.g.
+
+        with Telemetry() as telemetry:
+            select_model(xdata, ydata)
+        telemetry.summary()[0]  # the function taking the most time overall
+
+    Notes:
+        Hooks are only called by fits within the same process, such that fits in the worker
+        processes of a pool (e.g. `fit_many`) are not counted.
+
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Counters] = {}
+
+    def __call__(self, good: "Goodness", info: FitInfo) -> None:
+        with self._lock:
+            counters = self._counters.get(info.name, Counters(info.name, 0, 0, 0, 0, 0.0, 0.0, 0.0))
+            self._counters[info.name] = Counters(
+                name=info.name,
+                fits=counters.fits + 1,
+                failures=counters.failures + (not info.success),
+                nfev=counters.nfev + info.nfev,
+                njev=counters.njev + info.njev,
+                elapsed=counters.elapsed + info.elapsed,
+                model_time=counters.model_time + info.model_time,
+                max_elapsed=max(counters.max_elapsed, info.elapsed),
+            )
+
+    def __enter__(self) -> "Telemetry":
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        remove_hook(self)
+
+    def __getitem__(self, name: str) -> Counters:
+        return self._counters[name]
+
+    def summary(self) -> List[Counters]:
+        """Counters of every function, by total wall time in descending order."""
+        with self._lock:
+            return sorted(self._counters.values(), key=lambda c: c.elapsed, reverse=True)
+
+    def reset(self) -> None:
+        """Clear every counter."""
+        with self._lock:
+            self._counters.clear()
@@ -26,7 +26,7 @@
 # Python Dependencies
 import numpy as np
 
-from typing import Optional
+from typing import Callable, NamedTuple, Optional
 from scipy.stats import norm
 
 
@@ -45,14 +45,189 @@ def ci_x(std, p: float):
 def weights(a: np.ndarray) -> np.ndarray:
     """Convert the error into a weighting paradigm"""
     alpha = np.nanmax(a) - a
-    omega = 1 - np.exp(- alpha / np.max(alpha) - 1)
-    return np.power(omega / omega.max(), 2)
+    if not np.nanmax(alpha) > 0:
+        # Equal (or no finite) errors, weight equally
+        return np.where(np.isnan(alpha), np.nan, 1.0)
+    omega = 1 - np.exp(- alpha / np.nanmax(alpha) - 1)
+    return np.power(omega / np.nanmax(omega), 2)
+
+
+class Regression(NamedTuple):
+    """Weighted least squares line, of each series, with standard errors."""
+    slope: np.ndarray
+    intercept: np.ndarray
+    slope_std: np.ndarray
+    intercept_std: np.ndarray
+    n: np.ndarray
+
+
+def linear_regression(x: np.ndarray, y: np.ndarray, w: Optional[np.ndarray] = None) -> Regression:
+    """Weighted least squares line of y on x, for each of a stack of series of shape (n_series, n_points).
+
+    Args:
+        x (np.ndarray): X Values, broadcastable against y
+        y (np.ndarray): Y Values, of shape (..., n_points)
+        w (np.ndarray): Relative weight of each point, defaulting to equal weights
+
+    Notes:
+        Closed form, from weighted sums over the last axis, about the weighted mean of x.
+        Points with a non-finite x, y, or weight, or a weight of zero, are excluded, and series
+        with fewer than two distinct x values result in nan. Standard errors assume weights are
+        relative, estimating the residual variance from the weighted residuals, with n - 2 degrees
+        of freedom.
+
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    w = np.ones(y.shape) if w is None else np.broadcast_to(np.asarray(w, dtype=float), y.shape)
+    valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(w) & (w != 0)
+    w = np.where(valid, w, 0.0)
+    x, y = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+
+    with np.errstate(all="ignore"):
+        s = w.sum(axis=-1)
+        xm = np.einsum("...i,...i->...", w, x) / s
+        ym = np.einsum("...i,...i->...", w, y) / s
+        dx = np.where(valid, x - xm[..., None], 0.0)
+        sxx = np.einsum("...i,...i,...i->...", w, dx, dx)
+        slope = np.einsum("...i,...i,...i->...", w, dx, y) / sxx
+        intercept = ym - slope * xm
+
+        n = valid.sum(axis=-1)
+        r = y - intercept[..., None] - slope[..., None] * x
+        variance = np.einsum("...i,...i,...i->...", w, r, r) / (n - 2)
+        slope_std = np.sqrt(variance / sxx)
+        intercept_std = np.sqrt(variance * (1 / s + xm ** 2 / sxx))
+
+    return Regression(slope, intercept, slope_std, intercept_std, n)
 
 
 def regression(x: np.ndarray, y: np.ndarray, z: Optional[np.ndarray] = None):
-    """Linear Regression weighted by z, defaulting to equal weights."""
-    if z is None:
-        z = np.ones(x.shape)
-    j = np.vstack((x, z)).T
-    params = np.linalg.lstsq(j, y, None)[0]
-    return params
+    """Linear Regression weighted by z, defaulting to equal weights, returning [slope, intercept]."""
+    result = linear_regression(x, y, z)
+    return np.array([result.slope, result.intercept])
+
+
+def lttb(x: np.ndarray, y: np.ndarray, size: int) -> np.ndarray:
+    """Indices of points selected by Largest-Triangle-Three-Buckets downsampling, in order of x.
+
+    Args:
+        x (np.ndarray): X Values
+        y (np.ndarray): Y Values
+        size (int): Number of points to select (at least three)
+
+    References:
+        1. Steinarsson, S. (2013) Downsampling Time Series for Visual Representation.
+
+    """
+    order = np.argsort(x, kind="stable")
+    order = order[np.isfinite(x[order]) & np.isfinite(y[order])]
+    if order.size <= size:
+        return order
+    assert size >= 3, "Must select at least three points."
+    xs, ys = x[order], y[order]
+
+    # First and last points are always kept, the rest are split evenly into buckets
+    edges = np.linspace(1, order.size - 1, size - 1).astype(int)
+    counts = np.diff(np.r_[edges, order.size])
+    cx = np.add.reduceat(xs, edges) / counts
+    cy = np.add.reduceat(ys, edges) / counts
+    selected = np.empty(size, dtype=int)
+    selected[0], selected[-1] = 0, order.size - 1
+    for n in range(size - 2):
+        start, stop = edges[n], edges[n + 1]
+        ax, ay = xs[selected[n]], ys[selected[n]]
+        area = np.abs((ax - cx[n + 1]) * (ys[start:stop] - ay) - (ax - xs[start:stop]) * (cy[n + 1] - ay))
+        selected[n + 1] = start + np.argmax(area)
+    return order[selected]
+
+
+def minmax(x: np.ndarray, y: np.ndarray, size: int) -> np.ndarray:
+    """Indices of the minimum and maximum y within each of size // 2 buckets along x, in order of x."""
+    order = np.argsort(x, kind="stable")
+    order = order[np.isfinite(x[order]) & np.isfinite(y[order])]
+    if order.size <= size:
+        return order
+    buckets = np.arange(order.size) * max(size // 2, 1) // order.size
+    ranked = order[np.lexsort((y[order], buckets))]
+    starts = np.flatnonzero(np.r_[True, np.diff(buckets) > 0])
+    stops = np.r_[starts[1:], order.size] - 1
+    selected = np.unique(np.concatenate((ranked[starts], ranked[stops])))
+    return selected[np.argsort(x[selected], kind="stable")]
+
+
+def outliers(residuals: np.ndarray, threshold: float = 3.5) -> np.ndarray:
+    """Indices of outlying residuals, by their robust (median absolute deviation) z-score."""
+    residuals = np.asarray(residuals, dtype=float)
+    median = np.nanmedian(residuals)
+    mad = np.nanmedian(np.abs(residuals - median))
+    if not mad > 0:
+        return np.flatnonzero(np.abs(residuals - median) > 0)
+    return np.flatnonzero(0.6745 * np.abs(residuals - median) / mad > threshold)
+
+
+def decimate(x: np.ndarray,
+             y: np.ndarray,
+             size: int,
+             method: str = "lttb",
+             keep: Optional[np.ndarray] = None,
+             ) -> np.ndarray:
+    """Sorted indices of a visually representative subset of points, always including keep.
+
+    Args:
+        x (np.ndarray): X Values
+        y (np.ndarray): Y Values
+        size (int): Number of points to select, in addition to those kept
+        method (str): Downsample by "lttb" or "minmax" bucketing
+        keep (np.ndarray): Indices of points to keep regardless, e.g. outliers
+
+    """
+    if method not in ("lttb", "minmax"):
+        raise ValueError(f"Unknown decimation method: {method}. Available: lttb, minmax")
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    selected = (lttb if method == "lttb" else minmax)(x, y, size)
+    if keep is not None:
+        selected = np.concatenate((selected, np.asarray(keep, dtype=int)))
+    return np.unique(selected)
+
+
+def adaptive_grid(function: Callable[[np.ndarray], np.ndarray],
+                  lower: float,
+                  upper: float,
+                  size: int = 1_000,
+                  initial: int = 65,
+                  tolerance: float = 1e-3,
+                  ) -> np.ndarray:
+    """Evaluation grid refined where a function is poorly approximated by straight lines.
+
+    Args:
+        function (Callable): f(x), vectorized over x
+        lower (float): Lower bound of the grid
+        upper (float): Upper bound of the grid
+        size (int): Maximum number of grid points
+        initial (int): Number of evenly spaced grid points to start with
+        tolerance (float): Tolerated deviation from linear interpolation, relative to the range of f
+
+    Notes:
+        Intervals whose midpoint deviates beyond tolerance are bisected (largest deviations first),
+        until none remain or the grid reaches size points.
+
+    """
+    x = np.linspace(lower, upper, min(initial, size))
+    with np.errstate(all="ignore"):
+        y = np.broadcast_to(function(x), x.shape)
+        finite = np.isfinite(y)
+        scale = np.ptp(y[finite]) if finite.any() else 0.0
+        scale = scale if scale > 0 else 1.0
+
+        while x.size < size:
+            middle = 0.5 * (x[:-1] + x[1:])
+            value = np.broadcast_to(function(middle), middle.shape)
+            error = np.abs(value - 0.5 * (y[:-1] + y[1:]))
+            error = np.where(np.isfinite(error), error, 0.0)
+            refine = np.flatnonzero(error > tolerance * scale)
+            if refine.size == 0:
+                break
+            refine = refine[np.argsort(-error[refine], kind="stable")[:size - x.size]]
+            x = np.insert(x, refine + 1, middle[refine])
+            y = np.insert(y, refine + 1, value[refine])
+    return x
@@ -0,0 +1,42 @@
+"""
+    CurveFitting/benchmarks/_models.py
+
+    Synthetic data for every built-in expression, shared among benchmarks.
+
+"""
+import numpy as np
+
+from CurveFitting import expressions as ex
+
+
+# name: (expression, true parameters (ordered as Expression.constants), x range)
+MODELS = {
+    "VariableSlopeDoseResponse": (ex.VariableSlopeDoseResponse, [1.2, 5.0, 5.0, 100.0], (0.0, 10.0)),
+    "BoltzmanSigmoidal": (ex.BoltzmanSigmoidal, [0.8, 5.0, 5.0, 100.0], (0.0, 10.0)),
+    "LogisticGrowth": (ex.LogisticGrowth, [0.8, 5.0, 100.0], (0.0, 15.0)),
+    "GompertzGrowth": (ex.GompertzGrowth, [0.5, 5.0, 100.0], (0.0, 15.0)),
+    "OneSiteTotalBinding": (ex.OneSiteTotalBinding, [100.0, 2.0, 3.0, 1.0], (0.0, 20.0)),
+    "OneSiteSpecificBinding": (ex.OneSiteSpecificBinding, [100.0, 2.0], (0.0, 20.0)),
+    "SlopedSpecificBinding": (ex.SlopedSpecificBinding, [100.0, 1.5, 2.0], (0.1, 20.0)),
+    "PadeApproximant": (ex.PadeApproximant, [1.0, 2.0, 0.5], (0.0, 10.0)),
+    "DissociationKinetics": (ex.DissociationKinetics, [0.3, 5.0, 100.0], (0.0, 20.0)),
+    "Parabola": (ex.Parabola, [0.5, -2.0, 1.0], (-5.0, 5.0)),
+    "Gaussian": (ex.Gaussian, [2.0, 1.5], (-5.0, 9.0)),
+    "Poisson": (ex.Poisson, [4.0], (0.0, 15.0)),
+}
+
+
+def synthetic(function, params, bounds, size: int = 96, noise: float = 0.02, seed: int = 0):
+    """Noisy observations of function, with noise relative to the range of the true curve."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(*bounds, size)
+    y = function(x, *params)
+    y = y + rng.normal(0.0, noise * np.ptp(y), size)
+    return x, y
+
+
+def perturbed(params, scale: float = 0.2, seed: int = 0):
+    """Starting parameters, perturbed from the true parameters by a relative scale."""
+    rng = np.random.default_rng(seed)
+    params = np.asarray(params, dtype=float)
+    return params * (1 + rng.uniform(-scale, scale, params.size))
@@ -0,0 +1,77 @@
+"""
+    CurveFitting/benchmarks/batch.py
+
+    Compares throughput of BatchGoodness with looping over Goodness,
+    fitting dose response plates (VariableSlopeDoseResponse) with ragged wells.
+
+    Usage:
+        python benchmarks/batch.py [--wells 384 1536] [--points 24] [--repeat 5]
+
+"""
+import time
+import argparse
+
+import numpy as np
+
+from CurveFitting.batch import BatchGoodness
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting import expressions as ex
+
+
+def plate(equation: Equation, wells: int, points: int, seed: int = 0):
+    """Synthetic plate of noisy dose response curves, with a third of wells missing points."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 10, points)
+    params = np.column_stack([
+        rng.uniform(0.8, 1.5, wells),
+        rng.uniform(0, 10, wells),
+        rng.uniform(3, 7, wells),
+        rng.uniform(80, 120, wells),
+    ])
+    y = equation.equation(x, *params.T[..., None]) + rng.normal(0, 2, (wells, points))
+    y[::3, -points // 5:] = np.nan
+    return x, y
+
+
+def loop(equation: Equation, x, y, p0):
+    for row in y:
+        mask = np.isfinite(row)
+        good = Goodness.from_equation(equation, x[mask], row[mask])
+        good.fit(p0=p0)
+
+
+def batch(equation: Equation, x, y, p0):
+    BatchGoodness(equation, x, y).fit(p0=p0)
+
+
+def best(function, *args, repeat: int) -> float:
+    """Fastest of repeated runs, in seconds."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+def main(wells, points: int, repeat: int):
+    equation = Equation(ex.VariableSlopeDoseResponse)
+    p0 = np.array([1.0, 5.0, 5.0, 100.0])
+    print(f"{'wells':>8}{'loop (s)':>12}{'batch (s)':>12}{'speedup':>10}")
+    for n in wells:
+        x, y = plate(equation, n, points)
+        batch(equation, x, y[:2], p0)  # Warm up lazily built kernels
+
+        t0 = best(loop, equation, x, y, p0, repeat=repeat)
+        t1 = best(batch, equation, x, y, p0, repeat=repeat)
+        print(f"{n:>8}{t0:>12.3f}{t1:>12.3f}{t0 / t1:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wells", type=int, nargs="+", default=[384, 1536], help="Wells per plate.")
+    parser.add_argument("--points", type=int, default=24, help="Points per well.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions, reporting the fastest.")
+    args = parser.parse_args()
+    main(args.wells, args.points, args.repeat)
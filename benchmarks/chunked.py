@@ -0,0 +1,70 @@
+"""
+    CurveFitting/benchmarks/chunked.py
+
+    Compares goodness of fit statistics over memory mapped data, streamed in chunks of
+    varying size, with statistics over the same data read into memory, reporting wall
+    time and peak (python heap) memory.
+
+    Usage:
+        python benchmarks/chunked.py [--size 10000000]
+
+"""
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+from pathlib import Path
+
+import numpy as np
+
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting.utils import line
+
+
+def run(good: Goodness):
+    tracemalloc.start()
+    start = time.perf_counter()
+    summary = good.summary()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return summary, elapsed, peak
+
+
+def main(size: int):
+    x = np.linspace(0, 10, size)
+    y = line(x, 2.0, -1.0) + np.random.default_rng(0).normal(0, 0.5, size)
+    params = np.array([2.0, -1.0])
+
+    with tempfile.TemporaryDirectory() as directory:
+        np.save(Path(directory, "x.npy"), x)
+        np.save(Path(directory, "y.npy"), y)
+        del x, y
+
+        print(f"n = {size} ({2 * size * 8 / 2 ** 20:.0f} MiB on disk)")
+        header = f"{'mode':<16}{'chunk':>10}{'s':>10}{'peak MiB':>10}{'ssr':>16}"
+        print(header)
+        print("-" * len(header))
+
+        in_memory = Goodness(
+            line, np.load(Path(directory, "x.npy")), np.load(Path(directory, "y.npy")), best_fit=params
+        )
+        summary, elapsed, peak = run(in_memory)
+        print(f"{'in memory':<16}{'-':>10}{elapsed:>10.3f}{peak / 2 ** 20:>10.1f}{summary.ssr:>16.6g}")
+        del in_memory
+
+        for exponent in range(14, 23, 2):
+            good = Goodness.from_npy(
+                line, Path(directory, "x.npy"), Path(directory, "y.npy"), best_fit=params, chunk_size=2 ** exponent
+            )
+            summary, elapsed, peak = run(good)
+            print(f"{'memory mapped':<16}{2 ** exponent:>10}{elapsed:>10.3f}{peak / 2 ** 20:>10.1f}{summary.ssr:>16.6g}")
+            del good
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000_000, help="Number of data points.")
+    args = parser.parse_args()
+    main(args.size)
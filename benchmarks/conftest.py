@@ -0,0 +1,28 @@
+"""
+    CurveFitting/benchmarks/conftest.py
+
+    Shared fixtures of the benchmark suite, parametrized over every built-in expression.
+
+"""
+import pytest
+
+from CurveFitting.core import Equation
+from _models import MODELS
+
+
+_equations = {}
+
+
+@pytest.fixture(params=list(MODELS))
+def model(request):
+    """Name, expression, true parameters, and x range of a built-in expression."""
+    return (request.param, *MODELS[request.param])
+
+
+@pytest.fixture
+def equation(model) -> Equation:
+    """Equation of the model, built once per session and shared among benchmarks."""
+    name, expression = model[:2]
+    if name not in _equations:
+        _equations[name] = Equation(expression)
+    return _equations[name]
@@ -0,0 +1,73 @@
+"""
+    CurveFitting/benchmarks/import_time.py
+
+    Measures import time (python -X importtime) of common entry points, checking the
+    fit-only path against a time budget and that it never imports sympy or plotly.
+
+    Usage:
+        python benchmarks/import_time.py [--budget 0.6] [--repeat 5]
+
+"""
+import sys
+import argparse
+import subprocess
+
+
+PATHS = {
+    "package": "import CurveFitting",
+    "fit-only": "from CurveFitting import Goodness",
+    "expressions": "import CurveFitting.expressions",
+    "equation": "from CurveFitting import Equation, expressions; expressions.get('Gaussian')",
+    "plotting": "from CurveFitting import Plotting",
+}
+
+FORBIDDEN = {"fit-only": ("sympy", "plotly")}
+
+
+def measure(statement: str):
+    """Total import time (seconds), and heaviest top level imports, of a statement."""
+    check = "import sys; print(','.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}; {check}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total, top = 0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        if not name.startswith("  "):
+            top.append((int(cumulative_us), name.strip()))
+    modules = set(result.stdout.strip().split(","))
+    return total / 1e6, sorted(top, reverse=True)[:3], modules
+
+
+def main(budget: float, repeat: int) -> int:
+    failed = False
+    print(f"{'path':<14}{'seconds':>9}  heaviest imports")
+    for name, statement in PATHS.items():
+        runs = [measure(statement) for _ in range(repeat)]
+        seconds, top, modules = min(runs, key=lambda run: run[0])
+        heaviest = ", ".join(f"{module} ({us / 1e6:.3f})" for us, module in top)
+        print(f"{name:<14}{seconds:>9.3f}  {heaviest}")
+
+        loaded = [m for m in FORBIDDEN.get(name, ()) if m in modules]
+        if loaded:
+            print(f"  FAIL: {name} imported {', '.join(loaded)}")
+            failed = True
+        if name == "fit-only" and seconds > budget:
+            print(f"  FAIL: {name} exceeded budget of {budget:.3f} seconds")
+            failed = True
+
+    return int(failed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.6, help="Fit-only import budget (seconds).")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions, reporting the fastest.")
+    args = parser.parse_args()
+    sys.exit(main(args.budget, args.repeat))
@@ -0,0 +1,66 @@
+"""
+    CurveFitting/benchmarks/initial_guess.py
+
+    Compares fitting from scipy's default starting point (all ones) with each expression's
+    data driven initial guess, reporting mean function evaluations (nfev) and failure rate
+    over many noisy synthetic datasets.
+
+    Usage:
+        python benchmarks/initial_guess.py [--trials 50] [--noise 0.02 0.1]
+
+"""
+import argparse
+import warnings
+
+import numpy as np
+from scipy.optimize import curve_fit, OptimizeWarning
+
+from CurveFitting.core import Equation
+from _models import MODELS, synthetic
+
+
+def trial(function, x, y, p0):
+    """Number of function evaluations, or None when the fit fails."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", OptimizeWarning)
+            warnings.simplefilter("ignore", RuntimeWarning)
+            popt, pcov, info, _, _ = curve_fit(function, x, y, p0=p0, full_output=True)
+    except RuntimeError:
+        return None
+    if not (np.all(np.isfinite(popt)) and np.all(np.isfinite(pcov))):
+        return None
+    return info["nfev"]
+
+
+def main(trials: int, noise_levels):
+    header = f"{'model':<28}{'noise':>7}{'nfev':>8}{'nfev*':>8}{'fail %':>8}{'fail* %':>9}"
+    print(header)
+    print("(* with initial guess)")
+    print("-" * len(header))
+    for name, (expression, params, bounds) in MODELS.items():
+        if expression.guess is None:
+            continue
+        equation = Equation(expression)
+        for noise in noise_levels:
+            default, guessed = [], []
+            for seed in range(trials):
+                x, y = synthetic(equation.equation, params, bounds, noise=noise, seed=seed)
+                default.append(trial(equation.equation, x, y, None))
+                guessed.append(trial(equation.equation, x, y, expression.initial_guess(x, y)))
+
+            def stats(results):
+                nfev = [r for r in results if r is not None]
+                return np.mean(nfev) if nfev else np.nan, 100 * (1 - len(nfev) / len(results))
+
+            nfev0, fail0 = stats(default)
+            nfev1, fail1 = stats(guessed)
+            print(f"{name:<28}{noise:>7.2f}{nfev0:>8.1f}{nfev1:>8.1f}{fail0:>8.1f}{fail1:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trials", type=int, default=50, help="Noisy datasets per model.")
+    parser.add_argument("--noise", type=float, nargs="+", default=[0.02, 0.1], help="Relative noise.")
+    args = parser.parse_args()
+    main(args.trials, args.noise)
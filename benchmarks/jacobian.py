@@ -0,0 +1,58 @@
+"""
+    CurveFitting/benchmarks/jacobian.py
+
+    Compares fitting with finite difference and analytic parameter jacobians,
+    reporting function evaluations (nfev), jacobian evaluations (njev), and wall time.
+
+    Usage:
+        python benchmarks/jacobian.py [--size 96]
+
+"""
+import time
+import argparse
+
+import numpy as np
+from scipy.optimize import curve_fit
+
+from CurveFitting.core import Equation
+from _models import MODELS, synthetic, perturbed
+
+
+def run(function, x, y, p0, jac=None, repeat: int = 20):
+    kwargs = dict(p0=p0, full_output=True, maxfev=10_000)
+    if jac is not None:
+        kwargs["jac"] = jac
+    try:
+        info = curve_fit(function, x, y, **kwargs)[2]
+    except RuntimeError:
+        return np.nan, np.nan, np.nan
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        curve_fit(function, x, y, **kwargs)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    # Minpack counts finite difference jacobian estimation within nfev
+    return info["nfev"], info.get("njev", 0), elapsed
+
+
+def main(size: int):
+    print(f"n = {size}")
+    header = f"{'model':<28}{'nfev':>8}{'nfev+J':>8}{'njev+J':>8}{'ms':>10}{'ms+J':>10}{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, (expression, params, bounds) in MODELS.items():
+        equation = Equation(expression)
+        x, y = synthetic(equation.equation, params, bounds, size)
+        p0 = perturbed(params)
+
+        nfev, _, t0 = run(equation.equation, x, y, p0)
+        nfev_j, njev_j, t1 = run(equation.equation, x, y, p0, equation.jacobian)
+        print(f"{name:<28}{nfev:>8}{nfev_j:>8}{njev_j:>8}{t0 * 1e3:>10.3f}{t1 * 1e3:>10.3f}{t0 / t1:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=96, help="Number of data points.")
+    args = parser.parse_args()
+    main(args.size)
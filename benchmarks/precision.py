@@ -0,0 +1,90 @@
+"""
+    CurveFitting/benchmarks/precision.py
+
+    Compares float32 with float64 evaluation of every built-in expression, reporting kernel
+    and jacobian throughput, the error of float32 evaluation relative to the scale of each
+    output, and the relative difference in best fit parameters, to choose a dtype per model.
+
+    Usage:
+        python benchmarks/precision.py [--size 1000000] [--repeat 5]
+
+"""
+import time
+import argparse
+import warnings
+
+import numpy as np
+
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from _models import MODELS, synthetic, perturbed
+
+
+def timed(function, x, params, repeat: int) -> float:
+    """Best wall time of repeated evaluations, in seconds."""
+    function(x[:2], *params)
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(x, *params)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def error(result: np.ndarray, expected: np.ndarray) -> float:
+    """Largest absolute error, relative to the largest finite magnitude of the expected output."""
+    with np.errstate(all="ignore"):
+        deviation = np.abs(np.asarray(result, dtype=float) - expected)
+        return np.nanmax(deviation / np.nanmax(np.abs(expected[np.isfinite(expected)])))
+
+
+def fitted(equation: Equation, x, y, p0) -> np.ndarray:
+    good = Goodness.from_equation(equation, x, y)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        good.fit(p0=p0, maxfev=10_000)
+    return good.best_fit
+
+
+def main(size: int, repeat: int):
+    print(f"n = {size}, best of {repeat}")
+    header = (
+        f"{'model':<28}{'kernel x':>10}{'jac x':>8}{'err f':>10}{'err kernel':>12}{'err jac':>10}{'err fit':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, (expression, params, bounds) in MODELS.items():
+        double, single = Equation(expression), Equation(expression, dtype=np.float32)
+        x = np.linspace(*bounds, size)
+        x32 = x.astype(np.float32)
+
+        speedup = []
+        for kernel in ("kernel", "jacobian"):
+            t64 = timed(getattr(double, kernel), x, params, repeat)
+            t32 = timed(getattr(single, kernel), x32, params, repeat)
+            speedup.append(t64 / t32)
+
+        # Error of float32 evaluation at the same (float32 representable) x values
+        errors = [
+            error(getattr(single, kernel)(x32, *params), getattr(double, kernel)(x32.astype(float), *params))
+            for kernel in ("equation", "kernel", "jacobian")
+        ]
+
+        xs, ys = synthetic(double.equation, params, bounds)
+        p0 = perturbed(params)
+        reference = fitted(double, xs, ys, p0)
+        with np.errstate(all="ignore"):
+            fit = np.nanmax(np.abs(fitted(single, xs, ys, p0) / reference - 1))
+
+        print(
+            f"{name:<28}{speedup[0]:>10.2f}{speedup[1]:>8.2f}"
+            f"{errors[0]:>10.1e}{errors[1]:>12.1e}{errors[2]:>10.1e}{fit:>10.1e}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000, help="Number of evaluated x values.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed evaluations.")
+    args = parser.parse_args()
+    main(args.size, args.repeat)
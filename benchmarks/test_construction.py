@@ -0,0 +1,26 @@
+"""
+    CurveFitting/benchmarks/test_construction.py
+
+    Equation construction, and the cost of materializing each lazily built kernel.
+
+"""
+import pytest
+
+from CurveFitting.core import Equation
+
+pytest.importorskip("pytest_benchmark")
+
+
+def test_equation(benchmark, model):
+    benchmark.group = "construction: equation"
+    benchmark(Equation, model[1])
+
+
+@pytest.mark.parametrize("kernel", ["derivative", "second_derivative", "jacobian", "integral_expression"])
+def test_kernel(benchmark, model, kernel):
+    benchmark.group = f"construction: {kernel}"
+
+    def setup():
+        return (Equation(model[1]), kernel), {}
+
+    benchmark.pedantic(getattr, setup=setup, rounds=3)
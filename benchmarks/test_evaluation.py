@@ -0,0 +1,26 @@
+"""
+    CurveFitting/benchmarks/test_evaluation.py
+
+    Evaluation throughput of each kernel with respect to array size.
+
+"""
+import pytest
+import numpy as np
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("size", [100, 10_000, 1_000_000])
+@pytest.mark.parametrize("kernel", ["equation", "derivative", "second_derivative", "integral", "jacobian", "kernel"])
+def test_evaluate(benchmark, model, equation, kernel, size):
+    benchmark.group = f"evaluate: {kernel} (n={size})"
+    benchmark.extra_info["size"] = size
+    params, bounds = model[2:]
+    x = np.linspace(*bounds, size)
+    try:
+        function = getattr(equation, kernel)
+        function(x[:2], *params)
+    except (NotImplementedError, NameError):
+        pytest.skip(f"{kernel} cannot be lambdified.")
+
+    benchmark(function, x, *params)
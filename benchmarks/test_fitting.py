@@ -0,0 +1,56 @@
+"""
+    CurveFitting/benchmarks/test_fitting.py
+
+    Goodness.fit wall time and function evaluations (recorded as extra info),
+    over several noise levels and dataset sizes.
+
+"""
+import inspect
+import warnings
+
+import pytest
+
+from CurveFitting.goodness_of_fit import Goodness
+from _models import synthetic
+
+pytest.importorskip("pytest_benchmark")
+
+
+class Counter:
+    """Callable wrapper counting function evaluations."""
+    def __init__(self, function):
+        self.function = function
+        self.__signature__ = inspect.signature(function)
+        self.__name__ = function.__name__
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.function(*args)
+
+
+@pytest.mark.parametrize("size", [24, 1_000])
+@pytest.mark.parametrize("noise", [0.01, 0.1])
+@pytest.mark.parametrize("jacobian", [False, True])
+def test_fit(benchmark, model, equation, noise, size, jacobian):
+    benchmark.group = f"fit: noise={noise}, n={size}"
+    params, bounds = model[2:]
+    x, y = synthetic(equation.equation, params, bounds, size, noise)
+    counter = Counter(equation.equation)
+    good = Goodness(
+        counter,
+        x,
+        y,
+        jacobian=equation.jacobian if jacobian else None,
+        guess=model[1].initial_guess if model[1].guess is not None else None,
+    )
+
+    def fit():
+        counter.calls = 0
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            good.fit()
+
+    benchmark(fit)
+    benchmark.extra_info["nfev"] = counter.calls
+    benchmark.extra_info["rsq"] = float(good.rsq)
@@ -0,0 +1,53 @@
+"""
+    CurveFitting/benchmarks/test_plotting.py
+
+    Figure construction and serialization time, and serialized size, of each plotting function.
+
+"""
+import pytest
+import numpy as np
+
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting import plotting
+from _models import synthetic
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("max_points", [plotting.MAX_POINTS, None], ids=["decimated", "full"])
+@pytest.mark.parametrize("size", [96, 10_000, 1_000_000])
+@pytest.mark.parametrize("function", ["plot_fit", "plot_residuals", "plot_predicted", "qqplot"])
+def test_plot(benchmark, model, equation, function, size, max_points):
+    if size <= plotting.MAX_POINTS and max_points is None:
+        pytest.skip("Not decimated at this size.")
+    benchmark.group = f"plotting: {function} (n={size})"
+    params, bounds = model[2:]
+    x, y = synthetic(equation.equation, params, bounds, size)
+    good = Goodness(
+        equation.equation,
+        x,
+        y,
+        yerror=np.linspace(0.05, 0.15, size),
+        best_fit=np.asarray(params),
+        covariance=np.eye(len(params)) * 1e-4,
+    )
+
+    def render():
+        # Serialized, as figures are shipped to a browser or written to disk
+        return getattr(plotting, function)(good, max_points=max_points).to_json()
+
+    benchmark.extra_info["size"] = size
+    benchmark.extra_info["bytes"] = len(benchmark(render))
+
+
+def test_fit_all(benchmark, model, equation):
+    benchmark.group = "plotting: fit_all"
+    params, bounds = model[2:]
+    try:
+        equation.kernel(np.asarray(bounds), *params)
+    except (NotImplementedError, NameError):
+        pytest.skip("Integral cannot be lambdified.")
+
+    x, y = synthetic(equation.equation, params, bounds)
+    good = Goodness(equation.equation, x, y, best_fit=np.asarray(params), covariance=np.eye(len(params)) * 1e-4)
+    benchmark(plotting.Plotting(good).fit_all, equation)
@@ -0,0 +1,62 @@
+"""
+    CurveFitting/benchmarks/test_statistics.py
+
+    Goodness of fit statistics, as individual properties and as a fused summary.
+
+"""
+import pytest
+import numpy as np
+
+from CurveFitting.batch import BatchGoodness
+from CurveFitting.goodness_of_fit import Goodness, summarize
+from _models import synthetic
+
+pytest.importorskip("pytest_benchmark")
+
+
+_statistics = ["ssr", "sse", "rmse", "syx", "rsq", "rsq_adj", "std"]
+
+
+def fitted(model, equation, size) -> Goodness:
+    params, bounds = model[2:]
+    x, y = synthetic(equation.equation, params, bounds, size)
+    return Goodness(equation.equation, x, y, best_fit=np.asarray(params), covariance=np.eye(len(params)))
+
+
+@pytest.mark.parametrize("size", [1_000, 1_000_000])
+def test_properties(benchmark, model, equation, size):
+    benchmark.group = f"statistics: n={size}"
+    good = fitted(model, equation, size)
+
+    def properties():
+        good.best_fit = good.best_fit  # Invalidate cache, as after a fit
+        return [getattr(good, name) for name in _statistics]
+
+    benchmark(properties)
+
+
+@pytest.mark.parametrize("size", [1_000, 1_000_000])
+def test_summary(benchmark, model, equation, size):
+    benchmark.group = f"statistics: n={size}"
+    good = fitted(model, equation, size)
+
+    def summary():
+        good.best_fit = good.best_fit
+        return good.summary()
+
+    benchmark(summary)
+
+
+@pytest.mark.parametrize("curves", [384, 1536])
+def test_summarize_batch(benchmark, model, equation, curves):
+    benchmark.group = f"statistics: batch of {curves}"
+    params, bounds = model[2:]
+    x, y = synthetic(equation.equation, params, bounds, 24 * curves)
+    batch = BatchGoodness(
+        equation,
+        x.reshape(curves, 24),
+        y.reshape(curves, 24),
+        best_fit=np.tile(params, (curves, 1)),
+    )
+    residuals = batch.residuals
+    benchmark(summarize, residuals, batch.ydata, batch.k)
@@ -94,6 +94,7 @@ setup(
     python_requires=">=3.8, <4",
     install_requires=[
         "numpy",
+        "pandas",
         "plotly",
         "scipy",
         "sympy",
@@ -0,0 +1,52 @@
+"""
+    CurveFitting/tests/test_batch.py
+
+"""
+import pytest
+import numpy as np
+
+from CurveFitting.batch import BatchGoodness
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting import expressions as ex
+
+
+@pytest.mark.parametrize("expression, params, p0", [
+    (ex.VariableSlopeDoseResponse, [[1.2, 5.0, 5.0, 100.0], [0.8, 0.0, 4.0, 90.0]], [1.0, 5.0, 5.0, 100.0]),
+    (ex.DissociationKinetics, [[0.3, 5.0, 100.0], [0.2, 10.0, 80.0]], [0.25, 5.0, 90.0]),
+])
+def test_fit(expression, params, p0):
+    eq = Equation(expression)
+    params = np.array(params)
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 24)
+    y = eq.equation(x, *params.T[..., None]) + rng.normal(0, 1.0, (2, x.size))
+    y[1, -4:] = np.nan
+
+    batch = BatchGoodness(eq, x, y)
+    batch.fit(p0=p0)
+    assert batch.converged.all()
+    assert batch.best_fit.shape == params.shape
+    assert batch.covariance.shape == (2, len(p0), len(p0))
+
+    for n in range(2):
+        mask = np.isfinite(y[n])
+        good = Goodness(eq.equation, x[mask], y[n][mask])
+        good.fit(p0=p0)
+        assert np.allclose(batch.best_fit[n], good.best_fit, rtol=1e-4)
+        assert np.allclose(batch.covariance[n], good.covariance, rtol=1e-3, atol=1e-8)
+        assert np.isclose(batch.rsq[n], good.rsq)
+        assert batch.dof[n] == good.dof
+        assert np.isclose(batch.summary().aicc[n], good.summary().aicc)
+
+
+def test_failure():
+    eq = Equation(ex.Parabola)
+    x = np.linspace(-1, 1, 5)
+    y = np.vstack([x ** 2, np.full(x.size, np.nan)])
+    batch = BatchGoodness(eq, x, y)
+    batch.fit()
+
+    assert batch.converged.tolist() == [True, False]
+    assert np.isnan(batch.best_fit[1]).all()
+    assert np.allclose(batch.best_fit[0], [1, 0, 0], atol=1e-6)
@@ -0,0 +1,68 @@
+"""
+    CurveFitting/tests/test_cache.py
+
+"""
+import os
+
+import pytest
+import numpy as np
+import sympy as sm
+
+from CurveFitting.cache import KernelCache
+from CurveFitting.core import Equation
+from CurveFitting import expressions as ex
+
+
+@pytest.mark.parametrize("expression, params", [
+    (ex.Gaussian, (0.5, 1.5)),
+    (ex.PadeApproximant, (1.0, 2.0, 0.5)),
+])
+def test_warm_cache(tmp_path, monkeypatch, expression, params):
+    cache = KernelCache(str(tmp_path))
+    cold = Equation(expression, cache=cache)
+    x = np.linspace(0.1, 2, 7)
+    expected = [cold.equation(x, *params), cold.derivative(x, *params), cold.integral(x, *params)]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Symbolic work on a warm cache.")
+
+    monkeypatch.setattr(sm, "integrate", fail)
+    monkeypatch.setattr(sm, "Derivative", fail)
+    monkeypatch.setattr(Equation, "_lambdify", fail)
+    warm = Equation(expression, cache=cache)
+    result = [warm.equation(x, *params), warm.derivative(x, *params), warm.integral(x, *params)]
+
+    assert np.allclose(result, expected)
+    assert warm.integral.__doc__ == cold.integral.__doc__
+    assert warm.integral_expression == cold.integral_expression
+
+
+def test_integration_timeout(tmp_path):
+    # A timed out integral is not stored, for a later budget to integrate
+    cache = KernelCache(str(tmp_path))
+    expression = ex.Expression(ex.Poisson.expression)
+    assert Equation(expression, cache=cache, integration_timeout=0.2).numeric_integral
+    assert cache.get(cache.key(expression, None, "integral")) is None
+
+    eq = Equation(expression, cache=cache, integration_timeout=30)
+    assert eq.integral_expression.has(sm.Integral)
+    assert cache.get(cache.key(expression, None, "integral")) is not None
+
+
+def test_key():
+    a = KernelCache.key(ex.Gaussian, None, "equation")
+    assert a == KernelCache.key(ex.Gaussian, None, "equation")
+    assert a != KernelCache.key(ex.Gaussian, ["numpy"], "equation")
+    assert a != KernelCache.key(ex.Gaussian, None, "integral")
+    assert a != KernelCache.key(ex.Parabola, None, "equation")
+
+
+def test_eviction(tmp_path):
+    cache = KernelCache(str(tmp_path), max_size=250)
+    for n in range(4):
+        cache.put(str(n), dict(source="x" * 100))
+        os.utime(cache.path(str(n)), (n, n))
+
+    assert cache.size <= 250
+    assert cache.get("0") is None
+    assert cache.get("3") is not None
@@ -0,0 +1,100 @@
+"""
+    CurveFitting/tests/test_dataframes.py
+
+"""
+import pytest
+import numpy as np
+import pandas as pd
+
+from CurveFitting.batch import BatchGoodness
+from CurveFitting.core import get_equation
+from CurveFitting.dataframes import fit_csv, fit_grouped, fit_parquet, group_arrays
+
+
+DOSE = "VariableSlopeDoseResponse"
+
+
+def _plate(wells=6, size=16):
+    eq = get_equation(DOSE)
+    rng = np.random.default_rng(0)
+    x = np.tile(np.linspace(0, 10, size), wells)
+    pec50 = np.repeat(rng.uniform(3, 7, wells), size)
+    df = pd.DataFrame(dict(
+        plate=np.repeat(["A", "B"], wells * size // 2),
+        well=np.repeat(np.arange(wells), size),
+        x=x,
+        y=eq.equation(x, 1.2, 5.0, pec50, 100.0) + rng.normal(0, 2.0, x.size),
+        error=np.full(x.size, 2.0),
+    ))
+    return df.sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+
+def test_group_arrays():
+    df = pd.DataFrame(dict(g=["b", "a", "b", None, "b"], x=[1.0, 2.0, 3.0, 4.0, 5.0]))
+    keys, arrays = group_arrays(df, ["x"], ["g"])
+
+    assert keys["g"].tolist() == ["a", "b"]
+    assert np.array_equal(arrays["x"], [[2.0, np.nan, np.nan], [1.0, 3.0, 5.0]], equal_nan=True)
+
+
+def test_fit_grouped():
+    df = _plate()
+    result = fit_grouped(df, DOSE, "x", "y", "error", by=["plate", "well"])
+
+    assert len(result) == 6
+    assert result[["plate", "well"]].values.tolist() == [["A", 0], ["A", 1], ["A", 2], ["B", 3], ["B", 4], ["B", 5]]
+    assert {"HillSlope", "HillSlope_std", "pEC50", "pEC50_std", "rsq", "aicc", "n"} <= set(result.columns)
+    assert result.converged.all()
+
+    group = df[df.well == 4]
+    batch = BatchGoodness(get_equation("VariableSlopeDoseResponse"), group.x.to_numpy(), group.y.to_numpy(), 2.0)
+    batch.fit()
+    row = result[result.well == 4].iloc[0]
+    assert np.allclose(row[["HillSlope", "baseline", "pEC50", "peak"]].to_numpy(float), batch.best_fit[0])
+    assert np.allclose(row["rsq"], batch.rsq[0])
+    assert row["n"] == 16
+
+
+def test_parallel():
+    df = _plate()
+    batch = fit_grouped(df, DOSE, "x", "y", by="well")
+    parallel = fit_grouped(df, DOSE, "x", "y", by="well", parallel=True, max_workers=2)
+
+    assert np.allclose(batch.pEC50, parallel.pEC50, rtol=1e-4)
+    assert np.allclose(batch.pEC50_std, parallel.pEC50_std, rtol=1e-3)
+
+
+def test_fit_csv(tmp_path):
+    df = _plate()
+    df["ignored"] = "text"
+    path = tmp_path / "plate.csv"
+    df.to_csv(path, index=False)
+
+    result = fit_csv(str(path), DOSE, "x", "y", by=["plate", "well"], chunksize=10)
+    assert np.allclose(result.pEC50, fit_grouped(df, DOSE, "x", "y", by=["plate", "well"]).pEC50)
+
+
+def test_fit_csv_keys(tmp_path):
+    df = _plate()
+    df.loc[[0, 5], "plate"] = None
+    path = tmp_path / "plate.csv"
+    df.to_csv(path, index=False)
+
+    result = fit_csv(str(path), DOSE, "x", "y", "error", by=["plate", "well"], chunksize=7)
+    expected = fit_grouped(df, DOSE, "x", "y", "error", by=["plate", "well"])
+    assert result[["plate", "well"]].equals(expected[["plate", "well"]])
+    assert np.allclose(result.drop(columns="plate").to_numpy(dtype=float),
+                       expected.drop(columns="plate").to_numpy(dtype=float), equal_nan=True)
+
+    single = fit_csv(str(path), DOSE, "x", "y", chunksize=7)
+    assert len(single) == 1 and "plate" not in single
+
+
+def test_fit_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = _plate()
+    path = tmp_path / "plate.parquet"
+    df.to_parquet(path)
+
+    result = fit_parquet(str(path), DOSE, "x", "y", by=["plate", "well"], batch_size=10)
+    assert np.allclose(result.pEC50, fit_grouped(df, DOSE, "x", "y", by=["plate", "well"]).pEC50)
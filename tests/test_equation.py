@@ -2,9 +2,15 @@
     CurveFitting/tests/test_expressions.py
 
 """
+import time
+
 import pytest
+import numpy as np
+import sympy as sm
+from scipy import integrate
+from scipy.integrate import quad
 
-from CurveFitting.core import Equation
+from CurveFitting.core import INTEGRATION_TIMEOUT, Equation, _cumulative_simpson
 from CurveFitting import expressions as ex
 
 
@@ -20,3 +26,180 @@ def test_equation(expression):
     assert callable(eq.derivative)
     assert callable(eq.second_derivative)
     assert callable(eq.integral)
+
+
+_expressions = [
+    ex.VariableSlopeDoseResponse,
+    ex.BoltzmanSigmoidal,
+    ex.LogisticGrowth,
+    ex.GompertzGrowth,
+    ex.OneSiteTotalBinding,
+    ex.OneSiteSpecificBinding,
+    ex.SlopedSpecificBinding,
+    ex.PadeApproximant,
+    ex.DissociationKinetics,
+    ex.Parabola,
+    ex.Gaussian,
+    ex.Poisson,
+]
+
+
+@pytest.mark.parametrize("expression", _expressions)
+def test_lazy(expression):
+    eq = Equation(expression)
+
+    assert eq._derivative_expression is None
+    assert eq._second_derivative_expression is None
+    assert eq._integral_expression is None
+
+    assert eq.derivative is eq.derivative
+    assert eq.derivative_expression is eq.derivative_expression
+    assert eq._integral_expression is None
+
+
+@pytest.mark.parametrize("expression", _expressions)
+def test_startup(expression):
+    start = time.perf_counter()
+    eq = Equation(expression)
+    lazy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    eq = Equation(expression)
+    eq.derivative, eq.second_derivative, eq.integral_expression
+    eager = time.perf_counter() - start
+
+    assert lazy < eager
+
+
+@pytest.mark.parametrize("expression, params", [
+    (ex.Gaussian, (0.5, 1.5)),
+    (ex.VariableSlopeDoseResponse, (1.2, 5.0, 5.0, 100.0)),
+    (ex.Parabola, (0.5, -2.0, 1.0)),
+])
+def test_jacobian(expression, params):
+    eq = Equation(expression)
+    x = np.linspace(0.1, 9, 11)
+    result = eq.jacobian(x, *params)
+
+    h = 1e-6
+    expected = np.column_stack([
+        (eq.equation(x, *(params + h * e)) - eq.equation(x, *(params - h * e))) / (2 * h)
+        for e in np.eye(len(params))
+    ])
+    assert result.shape == (x.size, len(params))
+    assert np.allclose(result, expected, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("expression, params", [
+    (ex.VariableSlopeDoseResponse, (1.2, 5.0, 5.0, 100.0)),
+    (ex.Parabola, (0.5, -2.0, 1.0)),
+])
+def test_kernel(expression, params):
+    eq = Equation(expression)
+    x = np.linspace(0.1, 9, 11)
+    result = eq.kernel(x, *params)
+
+    assert result.shape == (4, x.size)
+    for value, function in zip(result, [eq.equation, eq.derivative, eq.second_derivative, eq.integral]):
+        assert np.allclose(value, function(x, *params))
+
+
+@pytest.mark.parametrize("expression, params", [
+    (ex.VariableSlopeDoseResponse, (1.2, 5.0, 5.0, 100.0)),
+    (ex.BoltzmanSigmoidal, (0.8, 5.0, 5.0, 100.0)),
+    (ex.LogisticGrowth, (0.8, 2.0, 50.0)),
+    (ex.GompertzGrowth, (0.8, 2.0, 50.0)),
+    (ex.OneSiteTotalBinding, (10.0, 2.0, 0.5, 1.0)),
+    (ex.SlopedSpecificBinding, (10.0, 1.5, 2.0)),
+    (ex.PadeApproximant, (1.0, 2.0, 0.5)),
+    (ex.DissociationKinetics, (0.5, 1.0, 10.0)),
+    (ex.Gaussian, (5.0, 1.5)),
+])
+def test_closed_form(expression, params):
+    eq = Equation(expression)
+    x = np.linspace(0.5, 9, 11)
+    h = 1e-5
+
+    assert not eq.numeric_integral
+    assert np.allclose(
+        (eq.integral(x + h, *params) - eq.integral(x - h, *params)) / (2 * h), eq.equation(x, *params)
+    )
+    assert np.allclose(
+        (eq.equation(x + h, *params) - eq.equation(x - h, *params)) / (2 * h), eq.derivative(x, *params)
+    )
+
+
+def test_numeric_integral():
+    eq = Equation(ex.Poisson)
+    x = np.random.default_rng(0).permutation(np.r_[np.linspace(0, 9, 61), 3.0, 4.5])
+    result = eq.integral(x, 3.0)
+    expected = [quad(eq.equation, 0, i, args=(3.0,))[0] for i in x]
+
+    assert eq.numeric_integral
+    assert np.allclose(result, expected, atol=1e-5)
+    assert np.allclose(eq.kernel(x, 3.0)[3], result)
+
+
+@pytest.mark.parametrize("n", [3, 4, 7, 50])
+def test_cumulative_simpson(n):
+    if not hasattr(integrate, "cumulative_simpson"):
+        pytest.skip("scipy.integrate.cumulative_simpson requires SciPy 1.12")
+    x = np.sort(np.random.default_rng(n).uniform(0, 5, n))
+    y = x * np.sin(x)
+    assert np.allclose(_cumulative_simpson(y, x), integrate.cumulative_simpson(y, x=x, initial=0))
+
+
+@pytest.mark.parametrize("process", [False, True])
+def test_integration_timeout(process):
+    expression = ex.Expression(ex.Poisson.expression)
+    eq = Equation(expression, integration_timeout=0.2, integration_process=process)
+
+    start = time.perf_counter()
+    assert eq.numeric_integral
+    assert time.perf_counter() - start < 5
+    assert eq.integral_expression.has(sm.Integral)
+    assert eq.integral(np.array([0.0, 1.0]), 3.0)[0] == 0
+
+
+def test_integration_symbolic():
+    eq = Equation(ex.Expression(ex.a * ex.x ** 2 + ex.b), integration_timeout=30)
+
+    assert not eq.numeric_integral
+    assert np.allclose(eq.integral(np.array([0.0, 3.0]), 2.0, 1.0), [0.0, 21.0])
+
+
+def test_integration_thread(monkeypatch):
+    def spawn():
+        raise AssertionError("Integration started a child process.")
+
+    # Bounded by default, yet without starting a child process
+    monkeypatch.setattr("CurveFitting.core.multiprocessing.get_context", spawn)
+    eq = Equation(ex.Expression(ex.a * ex.x ** 2 + ex.b))
+    assert eq.integration_timeout == INTEGRATION_TIMEOUT
+    assert not eq.numeric_integral
+    assert np.allclose(eq.integral(np.array([0.0, 3.0]), 2.0, 1.0), [0.0, 21.0])
+
+
+def test_unresolved_backend():
+    eq = Equation(ex.SlopedSpecificBinding, backend=["numpy"])
+    x = np.linspace(0, 9, 21)
+
+    assert eq.numeric_integral
+    assert np.isfinite(eq.integral(x, 10.0, 1.5, 2.0)).all()
+
+
+@pytest.mark.parametrize("expression, params", [
+    (ex.VariableSlopeDoseResponse, (1.2, 5.0, 5.0, 100.0)),
+    (ex.SlopedSpecificBinding, (10.0, 1.5, 2.0)),
+    (ex.Parabola, (0.5, -2.0, 1.0)),
+    (ex.Gaussian, (5.0, 1.5)),
+    (ex.Poisson, (4.0,)),
+])
+def test_dtype(expression, params):
+    eq, reference = Equation(expression, dtype=np.float32), Equation(expression)
+    x = np.linspace(0.5, 9, 11)
+
+    for name in ("equation", "derivative", "second_derivative", "integral", "jacobian", "kernel"):
+        result, expected = getattr(eq, name)(x, *params), getattr(reference, name)(x, *params)
+        assert result.dtype == np.float32, name
+        assert np.allclose(result, expected, rtol=1e-5, atol=1e-5 * np.abs(expected).max()), name
@@ -3,6 +3,9 @@
 
 """
 import pytest
+import numpy as np
+import sympy as sm
+
 from CurveFitting import expressions as ex
 
 
@@ -44,3 +47,28 @@ def test_args(exp: ex.Expression, args: list):
 ])
 def test_names(exp: ex.Expression, names: list):
     assert exp.names == names
+
+
+@pytest.mark.parametrize("exp, params, bounds", [
+    (ex.VariableSlopeDoseResponse, [1.2, 5.0, 5.0, 100.0], (0, 10)),
+    (ex.BoltzmanSigmoidal, [0.8, 5.0, 5.0, 100.0], (0, 10)),
+    (ex.LogisticGrowth, [0.8, 5.0, 100.0], (0, 15)),
+    (ex.DissociationKinetics, [0.3, 5.0, 100.0], (0, 20)),
+    (ex.Gaussian, [2.0, 1.5], (-5, 9)),
+])
+def test_initial_guess(exp: ex.Expression, params: list, bounds: tuple):
+    function = sm.lambdify(exp.args, exp.expression)
+    x = np.linspace(*bounds, 41)
+    y = function(x, *params)
+    guess = exp.initial_guess(x, y)
+    assert guess.shape == (len(params),)
+    assert np.allclose(guess, params, rtol=0.5)
+
+    stacked = exp.initial_guess(x, np.vstack([y, y]))
+    assert stacked.shape == (2, len(params))
+    assert np.allclose(stacked[1], guess)
+
+
+def test_initial_guess_default():
+    guess = ex.Parabola.initial_guess(np.arange(3), np.arange(3))
+    assert np.array_equal(guess, np.ones(3))
@@ -0,0 +1,75 @@
+"""
+    CurveFitting/tests/test_global_fit.py
+
+"""
+import pytest
+import numpy as np
+from scipy import sparse
+
+from CurveFitting.core import Equation
+from CurveFitting.global_fit import GlobalGoodness
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting import expressions as ex
+
+
+def _datasets(eq, pec50, sizes):
+    rng = np.random.default_rng(0)
+    xdata = [np.linspace(0, 10, size) for size in sizes]
+    ydata = [eq.equation(x, 1.2, 5.0, p, 100.0) + rng.normal(0, 1.0, x.size) for x, p in zip(xdata, pec50)]
+    return xdata, ydata
+
+
+def test_shared():
+    eq = Equation(ex.VariableSlopeDoseResponse)
+    pec50 = [3.0, 5.0, 7.0]
+    xdata, ydata = _datasets(eq, pec50, [24, 18, 30])
+    good = GlobalGoodness(eq, xdata, ydata, shared=["HillSlope", "baseline", "peak"])
+    good.fit()
+
+    assert good.k == 3 + 3
+    assert good.best_fit.shape == (3, 4)
+    assert np.allclose(good.best_fit[:, [0, 1, 3]], good.best_fit[0, [0, 1, 3]])
+    assert np.allclose(good.best_fit[:, 2], pec50, atol=0.1)
+    assert np.allclose(good.std[:, 0], good.std[0, 0])
+    assert good.summary().n == 24 + 18 + 30
+
+    # Covariance from the sparse jacobian, as from its dense equivalent
+    assert sparse.issparse(good.result.jac)
+    dense = good.result.jac.toarray()
+    expected = np.linalg.pinv(dense.T @ dense) * 2 * good.result.cost / (good.dof - good.k)
+    assert np.allclose(good.covariance, expected)
+
+
+def test_local():
+    eq = Equation(ex.DissociationKinetics)
+    rng = np.random.default_rng(1)
+    x = np.linspace(0, 10, 25)
+    ydata = [eq.equation(x, 0.3, 5.0, 100.0) + rng.normal(0, 1.0, x.size) for _ in range(2)]
+    good = GlobalGoodness(eq, [x, x], ydata)
+    good.fit(p0=[0.25, 5.0, 90.0])
+
+    for n, y in enumerate(ydata):
+        single = Goodness(eq.equation, x, y)
+        single.fit(p0=[0.25, 5.0, 90.0])
+        assert np.allclose(good.best_fit[n], single.best_fit, rtol=1e-4)
+
+
+def test_jacobian():
+    eq = Equation(ex.VariableSlopeDoseResponse)
+    xdata, ydata = _datasets(eq, [4.0, 6.0], [10, 12])
+    good = GlobalGoodness(eq, xdata, ydata, yerror=[np.full(10, 0.5), np.full(12, 2.0)], shared=["HillSlope"])
+    theta = good.reduce([[1.0, 4.0, 4.5, 90.0], [1.0, 6.0, 5.5, 110.0]])
+
+    h = 1e-6
+    expected = np.column_stack([
+        (good._residual(theta + h * e) - good._residual(theta - h * e)) / (2 * h) for e in np.eye(good.k)
+    ])
+    result = good._jacobian(theta)
+    assert result.nnz == 22 * 4
+    assert np.allclose(result.toarray(), expected, rtol=1e-5, atol=1e-6)
+
+
+def test_unknown():
+    eq = Equation(ex.Parabola)
+    with pytest.raises(AssertionError):
+        GlobalGoodness(eq, [np.arange(3.0)], [np.arange(3.0)], shared=["HillSlope"])
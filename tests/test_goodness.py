@@ -4,6 +4,12 @@
 """
 import pytest
 import numpy as np
+from scipy.stats import t
+
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness, numeric_jacobian, summarize
+from CurveFitting.utils import line
+from CurveFitting import expressions as ex
 from ._setup import good_line
 
 
@@ -21,3 +27,216 @@ def test_dofk(good, k):
 def test_fit(good, expected):
     good.fit()
     assert np.alltrue(np.isclose(good.best_fit, expected))
+
+
+@pytest.mark.parametrize("expression, params", [
+    (ex.VariableSlopeDoseResponse, np.array([1.2, 5.0, 5.0, 100.0])),
+    (ex.DissociationKinetics, np.array([0.3, 5.0, 100.0])),
+])
+def test_from_equation(expression, params):
+    eq = Equation(expression)
+    x = np.linspace(0, 10, 25)
+    good = Goodness.from_equation(eq, x, eq.equation(x, *params))
+    assert good.jacobian is eq.jacobian
+
+    good.fit(p0=params * 1.1)
+    assert np.allclose(good.best_fit, params)
+
+    # Self starting from the expression's initial guess
+    good.best_fit = None
+    good.fit()
+    assert np.allclose(good.best_fit, params)
+
+
+def test_guess_bounds():
+    # A noisy baseline guessed below zero is clipped into the bounds
+    eq = Equation(ex.VariableSlopeDoseResponse)
+    x = np.linspace(0, 10, 48)
+    y = eq.equation(x, 1.2, 0.0, 5.0, 100.0) + np.random.default_rng(0).normal(0, 2.0, x.size)
+    good = Goodness.from_equation(eq, x, y)
+    assert good.guess(x, y)[1] < 0
+
+    good.fit(bounds=(0, np.inf))
+    assert np.all(good.best_fit >= 0)
+    assert np.allclose(good.best_fit[[0, 2, 3]], [1.2, 5.0, 100.0], rtol=0.1)
+
+
+def test_cache():
+    calls = []
+
+    def function(x, m, b):
+        calls.append(m)
+        return x * m + b
+
+    good = Goodness(function, np.arange(5.0), np.arange(5.0) * 2 - 1, best_fit=np.array([2.0, -1.0]))
+    good.rsq_adj, good.syx, good.rmse, good.expected
+    assert len(calls) == 1
+
+    good.best_fit = np.array([1.0, 0.0])
+    assert np.allclose(good.expected, np.arange(5.0))
+    assert len(calls) == 2
+
+    good.ydata = np.zeros(5)
+    assert np.allclose(good.residuals, -np.arange(5.0))
+    assert len(calls) == 3
+
+
+def test_summary():
+    x = np.linspace(0, 4, 9)
+    y = 2 * x - 1 + np.random.default_rng(0).normal(0, 0.1, x.size)
+    good = Goodness(line, x, y, yerror=np.full(x.size, 0.1))
+    good.fit()
+    summary = good.summary()
+
+    for name in ["ssr", "sse", "rmse", "syx", "rsq", "rsq_adj", "std"]:
+        assert np.allclose(getattr(summary, name), getattr(good, name))
+    assert summary.n == good.dof and summary.k == good.k
+    assert np.isclose(summary.chisq, good.ssr / 0.01 / (good.dof - good.k))
+    assert np.isclose(summary.aic, good.dof * np.log(good.ssr / good.dof) + 2 * good.k)
+
+
+def test_summarize_stacked():
+    residuals = np.array([[0.1, -0.2, 0.1, np.nan], [0.3, -0.1, -0.2, 0.0]])
+    ydata = np.array([[1.0, 2.0, 3.0, np.nan], [1.0, 2.0, 3.0, 4.0]])
+    summary = summarize(residuals, ydata, 2)
+    assert summary.n.tolist() == [3, 4]
+
+    for n in range(2):
+        single = summarize(residuals[n][:summary.n[n]], ydata[n][:summary.n[n]], 2)
+        assert np.allclose(summary.ssr[n], single.ssr)
+        assert np.allclose(summary.bic[n], single.bic)
+
+
+def test_confidence_band():
+    x = np.linspace(0, 4, 12)
+    y = 2 * x - 1 + np.random.default_rng(1).normal(0, 0.2, x.size)
+    good = Goodness(line, x, y)
+    good.fit()
+    grid = np.linspace(-1, 5, 7)
+    lower, upper = good.confidence_band(grid, 0.9)
+
+    # Exact for linear regression
+    n = x.size
+    error = t.ppf(0.95, n - 2) * good.syx * np.sqrt(1 / n + (grid - x.mean()) ** 2 / ((x - x.mean()) ** 2).sum())
+    assert np.allclose(upper - good.expect(grid), error)
+    assert np.allclose(good.expect(grid) - lower, error)
+
+    lower_p, upper_p = good.prediction_band(grid, 0.9)
+    assert np.allclose((upper_p - good.expect(grid)) ** 2, error ** 2 + (t.ppf(0.95, n - 2) * good.syx) ** 2)
+    assert (lower_p < lower).all() and (upper_p > upper).all()
+
+
+@pytest.mark.parametrize("expression, params", [
+    (ex.VariableSlopeDoseResponse, np.array([1.2, 5.0, 5.0, 100.0])),
+    (ex.Gaussian, np.array([5.0, 1.5])),
+])
+def test_numeric_jacobian(expression, params):
+    eq = Equation(expression)
+    x = np.linspace(0, 10, 25)
+
+    assert np.allclose(numeric_jacobian(eq.equation, x, params), eq.jacobian(x, *params), rtol=1e-6, atol=1e-8)
+
+    y = eq.equation(x, *params) + np.random.default_rng(2).normal(0, 0.01, x.size)
+    analytic = Goodness.from_equation(eq, x, y)
+    analytic.fit(p0=params)
+    numeric = Goodness(eq.equation, x, y, best_fit=analytic.best_fit, covariance=analytic.covariance)
+    grid = np.linspace(0, 10, 100_000)
+    assert np.allclose(analytic.confidence_band(grid), numeric.confidence_band(grid), rtol=1e-5)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 10_000])
+def test_chunked(chunk_size):
+    rng = np.random.default_rng(5)
+    x = np.linspace(0, 10, 200)
+    y = line(x, 2.0, -1.0) + rng.normal(0, 0.5, x.size)
+    y[[3, 50]] = np.nan
+    error = rng.uniform(0.5, 1.5, x.size)
+
+    full = Goodness(line, x, y, error, best_fit=np.array([2.0, -1.0]), covariance=np.eye(2))
+    chunked = Goodness(line, x, y, error, best_fit=np.array([2.0, -1.0]), covariance=np.eye(2),
+                       chunk_size=chunk_size)
+    assert chunked.chunked and not full.chunked
+
+    expected, actual = full.summary(), chunked.summary()
+    for name in expected._fields:
+        assert np.allclose(getattr(expected, name), getattr(actual, name), equal_nan=True), name
+    assert np.isclose(expected.rsq, chunked.rsq)
+
+    # Changing chunk_size, or parameters, invalidates accumulated statistics
+    chunked.chunk_size = 3
+    assert np.isclose(expected.ssr, chunked.ssr)
+    chunked.best_fit = np.array([2.0, 0.0])
+    assert not np.isclose(expected.ssr, chunked.ssr)
+
+
+def test_from_npy(tmp_path):
+    x = np.linspace(0, 10, 1001)
+    y = line(x, 2.0, -1.0) + np.random.default_rng(6).normal(0, 0.5, x.size)
+    np.save(tmp_path / "x.npy", x)
+    np.save(tmp_path / "y.npy", y)
+
+    good = Goodness.from_npy(line, tmp_path / "x.npy", tmp_path / "y.npy", chunk_size=100)
+    assert isinstance(good.xdata, np.memmap) and isinstance(good.ydata, np.memmap)
+    assert good.yerror is None and good.chunked
+
+    good.fit()
+    full = Goodness(line, x, y, best_fit=good.best_fit)
+    assert np.isclose(good.ssr, full.ssr)
+    assert np.isclose(good.sse, full.sse)
+    assert np.isclose(good.summary().aicc, full.summary().aicc)
+
+
+@pytest.mark.parametrize("jacobian", [True, False])
+def test_dtype(jacobian):
+    eq = Equation(ex.VariableSlopeDoseResponse, dtype=np.float32)
+    params = np.array([1.2, 5.0, 5.0, 100.0])
+    x = np.linspace(0, 10, 1_000)
+    y = eq.equation(x, *params) + np.random.default_rng(7).normal(0, 1.0, x.size)
+
+    good = Goodness.from_equation(eq, x, y)
+    if not jacobian:
+        good = Goodness(eq.equation, x, y, dtype=np.float32)
+    assert good.xdata.dtype == good.ydata.dtype == np.float32
+    assert good.k == 4
+    good.fit(p0=params * 1.1)
+
+    reference = Goodness.from_equation(Equation(ex.VariableSlopeDoseResponse), x, y.astype(float))
+    reference.fit(p0=params * 1.1)
+    assert np.allclose(good.best_fit, reference.best_fit, rtol=1e-4)
+
+    assert good.expected.dtype == good.residuals.dtype == np.float32
+    assert all(band.dtype == np.float32 for band in good.confidence_band(x[:10]))
+
+    # Sums of squares are accumulated in float64
+    good.best_fit = reference.best_fit
+    assert np.isclose(good.ssr, reference.ssr, rtol=1e-5)
+    assert np.isclose(good.summary().sse, reference.summary().sse, rtol=1e-6)
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(bounds=([0, -5], [5, 5])),
+    dict(method="trf"),
+    dict(method="dogbox"),
+    dict(),
+])
+def test_dtype_solver(kwargs):
+    x = np.linspace(0, 10, 50)
+    y = line(x, 2.0, -1.0) + np.random.default_rng(8).normal(0, 0.1, x.size)
+    good = Goodness(line, x, y, dtype=np.float32)
+    good.fit(**kwargs)
+    assert good.info.success
+    assert np.allclose(good.best_fit, [2.0, -1.0], atol=0.1)
+
+
+def test_rsq_adj():
+    x = np.arange(6.0)
+    y = np.array([0.0, 1.0, 1.0, 4.0, 3.0, 5.0])
+    good = Goodness(line, x, y, best_fit=np.array([1.0, 0.0]))
+
+    # SSR = 3, SSE = 58 / 3, R2 = 1 - 9 / 58, adjusted R2 = 1 - (9 / 58) * (6 - 1) / (6 - 2), as by OLS
+    expected = 187 / 232
+    assert np.isclose(good.rsq_adj, expected)
+    assert np.isclose(good.summary().rsq_adj, expected)
+
+    perfect = Goodness(line, x, x, best_fit=np.array([1.0, 0.0]))
+    assert np.isclose(perfect.rsq_adj, 1.0) and np.isclose(perfect.summary().rsq_adj, 1.0)
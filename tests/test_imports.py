@@ -0,0 +1,44 @@
+"""
+    CurveFitting/tests/test_imports.py
+
+"""
+import sys
+import subprocess
+
+import pytest
+
+import CurveFitting
+from CurveFitting import expressions as ex
+
+
+@pytest.mark.parametrize("statement, forbidden", [
+    ("import CurveFitting", ["numpy", "sympy", "plotly"]),
+    ("from CurveFitting import Goodness", ["sympy", "plotly", "scipy.stats"]),
+    ("from CurveFitting import BatchGoodness", ["plotly"]),
+])
+def test_lazy_imports(statement, forbidden):
+    check = f"import sys; assert not [m for m in {forbidden!r} if m in sys.modules]"
+    subprocess.run([sys.executable, "-c", f"{statement}; {check}"], check=True)
+
+
+def test_lazy_expressions():
+    check = ("from CurveFitting import expressions as ex; assert not ex._built; "
+             "ex.Gaussian; assert [*ex._built] == ['Gaussian']")
+    subprocess.run([sys.executable, "-c", check], check=True)
+
+
+def test_registry():
+    assert ex.get("Gaussian") is ex.Gaussian
+    assert "VariableSlopeDoseResponse" in ex.available()
+    assert "Gaussian" in dir(ex)
+    with pytest.raises(KeyError):
+        ex.get("Unknown")
+    with pytest.raises(AttributeError):
+        ex.Unknown
+
+
+def test_package_attributes():
+    assert CurveFitting.Goodness is CurveFitting.goodness_of_fit.Goodness
+    assert CurveFitting.Equation is CurveFitting.core.Equation
+    with pytest.raises(AttributeError):
+        CurveFitting.Unknown
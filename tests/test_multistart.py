@@ -0,0 +1,85 @@
+"""
+    CurveFitting/tests/test_multistart.py
+
+"""
+import warnings
+
+import pytest
+import numpy as np
+
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting.multistart import SPREAD, _box, multistart, sample_starts
+from CurveFitting.utils import line
+from CurveFitting import expressions as ex
+
+
+def _gompertz() -> Goodness:
+    eq = Equation(ex.GompertzGrowth)
+    x = np.linspace(0, 15, 96)
+    y = eq.equation(x, 0.5, 5.0, 100.0)
+    y = y + np.random.default_rng(0).normal(0, 0.02 * np.ptp(y), x.size)
+    return Goodness.from_equation(eq, x, y)
+
+
+@pytest.mark.parametrize("sampler", ["sobol", "lhs"])
+def test_sample_starts(sampler):
+    lower, upper = np.array([0.0, -5.0, 10.0]), np.array([1.0, 5.0, 1000.0])
+    starts = sample_starts(lower, upper, 10, sampler, seed=1)
+    assert starts.shape == (10, 3)
+    assert np.all((starts >= lower) & (starts <= upper))
+    assert np.array_equal(starts, sample_starts(lower, upper, 10, sampler, seed=1))
+
+    with pytest.raises(ValueError):
+        sample_starts(lower, upper, 10, "grid")
+
+
+def test_box():
+    x = np.linspace(0, 10, 20)
+    good = Goodness(line, x, 2 * x, best_fit=np.array([2.0, -30.0]))
+    lower, upper = _box(good, ([0.0, -np.inf], np.inf))
+    assert np.allclose(lower, [0.0, -30.0 - SPREAD * 30.0])
+    assert np.allclose(upper, [2.0 + SPREAD * 2.0, -30.0 + SPREAD * 30.0])
+
+
+def test_fallback():
+    good = _gompertz()
+    with pytest.warns(UserWarning), np.errstate(all="ignore"):
+        good.fit(p0=[100.0, 100.0, 100.0])
+    assert np.isnan(good.best_fit).all()
+
+    with pytest.warns(UserWarning), np.errstate(all="ignore"):
+        good.fit(p0=[100.0, 100.0, 100.0], fallback=dict(bounds=(0, 200), seed=0))
+    assert np.allclose(good.best_fit, [0.5, 5.0, 100.0], rtol=0.1)
+    assert good.info.success and np.all(np.isfinite(good.covariance))
+
+
+def test_early_stop():
+    good = _gompertz()
+    result = good.multistart(bounds=(0, 200), n_starts=8, max_workers=1, seed=0)
+    assert result.stopped
+    assert 2 <= result.converged.sum() <= result.completed.sum() < 8
+    assert np.isnan(result.ssr[~result.completed]).all()
+    assert good.best_fit is not None and np.isclose(good.summary().ssr, result.ssr[result.best])
+
+    result = good.multistart(bounds=(0, 200), n_starts=8, tolerance=None, seed=0)
+    assert not result.stopped and result.completed.all()
+    assert result.ssr[result.best] == np.nanmin(result.ssr)
+
+
+def test_process():
+    x = np.linspace(0, 10, 20)
+    good = Goodness(line, x, 2 * x - 1)
+    result = multistart(good, bounds=(-10, 10), n_starts=4, executor="process", max_workers=2)
+    assert result.converged.any()
+    assert np.allclose(good.best_fit, [2.0, -1.0])
+
+    with pytest.raises(ValueError):
+        multistart(good, executor="cluster")
+
+
+def test_warning_filters():
+    # Worker threads leave the process wide filters as they found them
+    filters = list(warnings.filters)
+    _gompertz().multistart(bounds=(0, 200), n_starts=16, max_workers=8, tolerance=None, seed=0)
+    assert warnings.filters == filters
@@ -0,0 +1,38 @@
+"""
+    CurveFitting/tests/test_parallel.py
+
+"""
+import pytest
+import numpy as np
+
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting.parallel import fit_many, iter_fit_many
+from CurveFitting import expressions as ex
+
+
+eq = Equation(ex.DissociationKinetics)
+params = np.array([[0.3, 5.0, 100.0], [0.2, 10.0, 80.0], [0.5, 0.0, 50.0]])
+x = np.linspace(0, 20, 16)
+y = eq.equation(x, *params.T[..., None]) + np.random.default_rng(0).normal(0, 1.0, (3, x.size))
+y[1, -3:] = np.nan
+
+
+def test_fit_many():
+    best_fit, covariance = fit_many(ex.DissociationKinetics, x, y, max_workers=2, p0=[0.25, 5.0, 90.0])
+    assert best_fit.shape == (3, 3)
+    assert covariance.shape == (3, 3, 3)
+
+    for n in range(3):
+        mask = np.isfinite(y[n])
+        good = Goodness.from_equation(eq, x[mask], y[n][mask])
+        good.fit(p0=[0.25, 5.0, 90.0])
+        assert np.allclose(best_fit[n], good.best_fit)
+        assert np.allclose(covariance[n], good.covariance)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_chunks(ordered):
+    chunks = iter_fit_many(ex.DissociationKinetics, x, y, max_workers=2, chunksize=2, ordered=ordered)
+    rows = sorted((s.start, s.stop) for s, _, _ in chunks)
+    assert rows == [(0, 2), (2, 3)]
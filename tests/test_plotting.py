@@ -3,9 +3,14 @@
 
 """
 import pytest
+import numpy as np
 import plotly.graph_objects as go
 
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting import plotting
 from CurveFitting.plotting import Plotting
+from CurveFitting import expressions as ex
 from ._setup import good_line
 
 
@@ -42,3 +47,57 @@ def test_residuals(plotting):
 def test_predicted(plotting):
     figure = plotting.predicted()
     assert isinstance(figure, go.Figure)
+
+
+@pytest.mark.parametrize("expression, params", [
+    (ex.Parabola, [0.5, -2.0, 1.0]),
+    (ex.DissociationKinetics, [0.3, 5.0, 100.0]),
+])
+def test_fit_all(expression, params):
+    eq = Equation(expression)
+    x = np.linspace(0.5, 10, 12)
+    good = Goodness.from_equation(eq, x, eq.equation(x, *params) + np.sin(x))
+    good.fit()
+
+    figure = Plotting(good).fit_all(eq)
+    assert isinstance(figure, go.Figure)
+    assert len(figure.data) == 9
+
+    fits = [trace.y for trace in figure.data if trace.name.endswith("Fit")]
+    grid = figure.data[1].x
+    expected = [eq.equation, eq.derivative, eq.second_derivative, eq.integral]
+    for y, function in zip(fits, expected):
+        assert np.allclose(y, function(grid, *good.best_fit))
+
+
+@pytest.mark.parametrize("kind", ["fit", "residuals", "qqplot", "predicted"])
+def test_dtype(kind):
+    eq = Equation(ex.Gaussian, dtype=np.float32)
+    x = np.linspace(0, 10, 200)
+    good = Goodness.from_equation(eq, x, eq.equation(x, 5.0, 1.5) + np.sin(x) / 100)
+    good.fit(p0=[5.0, 1.5])
+
+    data, figure = plotting._figures[kind]
+    result = data(good)
+    assert result["x"].dtype == result["y"].dtype == np.float32
+    assert isinstance(figure(result), go.Figure)
+
+
+@pytest.mark.parametrize("function", ["plot_fit", "plot_residuals", "plot_predicted", "qqplot"])
+def test_large(function):
+    eq = Equation(ex.Parabola)
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, 50_000)
+    y = eq.equation(x, 0.5, -2.0, 1.0) + rng.normal(0, 1.0, x.size)
+    y[123] += 100.0
+    good = Goodness.from_equation(eq, x, y, best_fit=np.array([0.5, -2.0, 1.0]), covariance=np.eye(3) * 1e-4)
+
+    figure = getattr(plotting, function)(good, max_points=1_000)
+    markers = figure.data[0]
+    assert isinstance(markers, go.Scattergl)
+    assert markers.x.size < 1_000 + 500
+    if function == "plot_fit":
+        assert y[123] in markers.y
+
+    full = getattr(plotting, function)(good, max_points=None)
+    assert full.data[0].x.size == x.size
@@ -0,0 +1,68 @@
+"""
+    CurveFitting/tests/test_reports.py
+
+"""
+import os
+import json
+
+import pytest
+import numpy as np
+
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting.reports import _render, iter_render_reports, render_reports
+from CurveFitting import expressions as ex
+
+
+def _goods(n):
+    eq = Equation(ex.Parabola)
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 24)
+    for i in range(n):
+        good = Goodness.from_equation(eq, x, eq.equation(x, 0.5, -2.0, i) + rng.normal(0, 1.0, x.size))
+        good.fit()
+        yield f"well_{i}", good
+
+
+def test_render_reports(tmp_path):
+    paths = render_reports(_goods(3), str(tmp_path), formats=("html", "json"), max_workers=2)
+
+    assert sorted(paths) == ["well_0", "well_1", "well_2"]
+    assert sorted(os.listdir(tmp_path)) == sorted(f"well_{i}.{fmt}" for i in range(3) for fmt in ["html", "json"])
+    with open(paths["well_1"][1]) as handle:
+        figures = json.load(handle)
+    assert list(figures) == ["fit", "residuals", "qqplot", "predicted"]
+    assert figures["fit"]["layout"]["yaxis"]["title"]["text"] == "Y"
+    with open(paths["well_1"][0]) as handle:
+        assert handle.read().count('class="plotly-graph-div"') == 4
+
+
+def test_bounded(tmp_path):
+    consumed = []
+
+    def goods():
+        for name, good in _goods(4):
+            consumed.append(name)
+            yield name, good
+
+    # At most one report in flight, and the next fit consumed while waiting
+    reports = iter_render_reports(goods(), str(tmp_path), figures=["fit"], max_workers=1, max_in_flight=1)
+    for n, (name, paths) in enumerate(reports):
+        assert name == f"well_{n}"
+        assert len(consumed) <= n + 2
+        assert os.path.exists(paths[0])
+    assert n == 3
+
+
+def test_unknown(tmp_path):
+    with pytest.raises(ValueError):
+        render_reports({}, str(tmp_path), figures=["histogram"])
+    with pytest.raises(ValueError):
+        render_reports({}, str(tmp_path), formats=["png"])
+
+
+def test_render_failure(tmp_path):
+    # A figure failing to build removes the temporary files of its report
+    with pytest.raises(Exception):
+        _render("well_0", {"fit": {}}, str(tmp_path), ("html", "json"), "cdn")
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,65 @@
+"""
+    CurveFitting/tests/test_resampling.py
+
+"""
+import pytest
+import numpy as np
+
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting.resampling import resample
+from CurveFitting.utils import ci_x, line
+from CurveFitting import expressions as ex
+
+
+def _dose_response():
+    eq = Equation(ex.VariableSlopeDoseResponse)
+    x = np.linspace(0, 10, 96)
+    y = eq.equation(x, 1.2, 5.0, 5.0, 100.0) + np.random.default_rng(0).normal(0, 3.0, x.size)
+    good = Goodness.from_equation(eq, x, y)
+    good.fit()
+    return good
+
+
+@pytest.mark.parametrize("method", ["residual", "pairs"])
+@pytest.mark.parametrize("interval", ["percentile", "bca"])
+def test_bootstrap(method, interval):
+    good = _dose_response()
+    result = good.bootstrap(500, method=method, interval=interval, seed=0)
+
+    assert result.samples.shape == (500, good.k)
+    assert result.samples.flags.c_contiguous
+    assert result.converged.all()
+    assert np.all(result.lower < good.best_fit) and np.all(good.best_fit < result.upper)
+
+    # Comparable to the covariance based interval
+    width = result.upper - result.lower
+    assert np.allclose(width, 2 * ci_x(good.std, 0.95), rtol=0.3)
+
+    again = good.bootstrap(500, method=method, interval=interval, seed=0)
+    assert np.array_equal(result.samples, again.samples)
+
+
+def test_bootstrap_function():
+    x = np.linspace(0, 4, 30)
+    good = Goodness(line, x, 2 * x - 1 + np.random.default_rng(1).normal(0, 0.2, x.size))
+    good.fit()
+    result = good.bootstrap(100, interval="percentile", seed=1)
+
+    assert result.converged.all()
+    assert np.allclose(result.samples.mean(axis=0), good.best_fit, atol=0.05)
+
+
+def test_resample():
+    good = _dose_response()
+    indices = np.array([[0, 0, 1], [2, 1, 0]])
+    good.xdata, good.ydata, good.yerror = good.xdata[:3], good.ydata[:3], np.array([1.0, 2.0, 4.0])
+
+    x, y, yerror = resample(good, indices, "pairs")
+    assert np.array_equal(x, good.xdata[indices]) and np.array_equal(yerror, good.yerror[indices])
+
+    x, y, yerror = resample(good, indices, "residual")
+    assert np.allclose(y[1], good.expected + good.yerror * (good.residuals / good.yerror)[[2, 1, 0]])
+
+    with pytest.raises(ValueError):
+        resample(good, indices, "wild")
@@ -0,0 +1,60 @@
+"""
+    CurveFitting/tests/test_selection.py
+
+"""
+import warnings
+
+import pytest
+import numpy as np
+
+from CurveFitting.core import get_equation
+from CurveFitting.selection import f_test, select_model
+
+
+def _data():
+    x = np.linspace(0, 10, 48)
+    y = get_equation("VariableSlopeDoseResponse").equation(x, 1.2, 5.0, 5.0, 100.0)
+    return x, y + np.random.default_rng(0).normal(0, 2.0, x.size)
+
+
+def test_get_equation():
+    assert get_equation("Gaussian") is get_equation("Gaussian")
+    assert get_equation("Gaussian") is not get_equation("Gaussian", ["numpy"])
+
+
+@pytest.mark.parametrize("criterion", ["aic", "aicc", "bic", "f"])
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_select_model(criterion, executor):
+    x, y = _data()
+    candidates = ["Parabola", "VariableSlopeDoseResponse", "PadeApproximant", "Gaussian"]
+    selection = select_model(x, y, candidates=candidates, criterion=criterion, executor=executor)
+
+    assert [row.name for row in selection.table][0] == "VariableSlopeDoseResponse"
+    assert sorted(row.name for row in selection.table) == sorted(candidates)
+    assert selection.best is selection.fits["VariableSlopeDoseResponse"]
+    assert np.allclose(selection.best.best_fit, [1.2, 5.0, 5.0, 100.0], atol=1.0)
+    assert np.isclose(sum(row.weight for row in selection.table), 1.0)
+    assert all(row.pvalue < 0.05 for row in selection.table[1:])
+
+
+def test_early_stop():
+    x, y = _data()
+    selection = select_model(x, y, candidates=["VariableSlopeDoseResponse", "Parabola"], early_stop=10.0)
+
+    assert [row.stopped for row in selection.table] == [False, True]
+    assert list(selection.fits) == ["VariableSlopeDoseResponse"]
+    assert selection.table[0].n == x.size
+
+
+def test_f_test():
+    assert np.isnan(f_test(1.0, 3, 0.5, 3, 20))
+    assert f_test(1.0, 3, 0.5, 4, 20) == f_test(0.5, 4, 1.0, 3, 20) < 0.05
+    assert f_test(1.0, 3, 0.99, 4, 20) > 0.05
+
+
+def test_warning_filters():
+    # Worker threads leave the process wide filters as they found them
+    filters = list(warnings.filters)
+    for _ in range(6):
+        select_model(*_data())
+    assert warnings.filters == filters
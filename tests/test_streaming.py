@@ -0,0 +1,74 @@
+"""
+    CurveFitting/tests/test_streaming.py
+
+"""
+import pytest
+import numpy as np
+
+from CurveFitting.core import Equation
+from CurveFitting.streaming import StreamingGoodness
+from CurveFitting import expressions as ex
+
+
+eq = Equation(ex.DissociationKinetics)
+x = np.linspace(0, 20, 60)
+y = eq.equation(x, 0.3, 5.0, 100.0) + np.random.default_rng(0).normal(0, 1.0, x.size)
+yerror = np.full(x.size, 1.0)
+
+
+def stream(**kwargs) -> StreamingGoodness:
+    good = StreamingGoodness(eq.equation, capacity=4, jacobian=eq.jacobian, guess=eq.expression.initial_guess, **kwargs)
+    for n in range(0, x.size, 5):
+        good.append(x[n:n + 5], y[n:n + 5], yerror[n:n + 5])
+    return good
+
+
+@pytest.mark.parametrize("kwargs", [
+    dict(refit_every=1),
+    dict(refit_every=20),
+    dict(refit_every=None, drift=1.5),
+])
+def test_running_statistics(kwargs):
+    good = stream(**kwargs)
+    assert good.capacity >= x.size
+    assert np.array_equal(good.xdata, x)
+    assert np.array_equal(good.yerror, yerror)
+
+    assert good.dof == x.size
+    assert np.isclose(good.sse, np.power(y - y.mean(), 2).sum())
+    assert np.isclose(good.ssr, np.power(good.residuals, 2).sum())
+
+
+def test_refit_every():
+    good = stream(refit_every=20)
+    good.refit()
+    expected = good.best_fit
+
+    refit = good.append(21.0, eq.equation(21.0, *expected), 1.0)
+    assert not refit
+    assert np.allclose(good.best_fit, expected, rtol=1e-3)
+
+
+@pytest.mark.parametrize("bounds", [(-np.inf, np.inf), (0, np.inf)])
+def test_warm_start_bounds(bounds):
+    # Infinite bounds resolve to lm, scaled by diag rather than x_scale
+    good = StreamingGoodness.from_equation(eq, capacity=4, refit_every=20, bounds=bounds)
+    for n in range(0, x.size, 5):
+        good.append(x[n:n + 5], y[n:n + 5])
+    expected = stream(refit_every=20)
+    good.refit()
+    expected.refit()
+    assert np.allclose(good.best_fit, expected.best_fit, rtol=1e-3)
+
+
+def test_from_equation(tmp_path):
+    good = StreamingGoodness.from_equation(eq, capacity=4, refit_every=20)
+    assert good.jacobian is eq.jacobian and good.equation is eq
+    for n in range(0, x.size, 5):
+        good.append(x[n:n + 5], y[n:n + 5])
+    assert good.refit_every == 20
+    assert np.allclose(good.best_fit, stream(refit_every=20).best_fit, rtol=1e-3)
+
+    np.save(tmp_path / "x.npy", x)
+    with pytest.raises(TypeError):
+        StreamingGoodness.from_npy(eq.equation, tmp_path / "x.npy", tmp_path / "x.npy")
@@ -0,0 +1,94 @@
+"""
+    CurveFitting/tests/test_telemetry.py
+
+"""
+import pytest
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+
+from CurveFitting.core import Equation
+from CurveFitting.goodness_of_fit import Goodness
+from CurveFitting.telemetry import Telemetry, add_hook, remove_hook
+from CurveFitting.utils import line
+from CurveFitting import expressions as ex
+
+
+def _good(**kwargs) -> Goodness:
+    eq = Equation(ex.VariableSlopeDoseResponse)
+    x = np.linspace(0, 10, 96)
+    y = eq.equation(x, 1.2, 5.0, 5.0, 100.0) + np.random.default_rng(0).normal(0, 3.0, x.size)
+    return Goodness.from_equation(eq, x, y, **kwargs)
+
+
+def test_info():
+    good = _good()
+    assert good.info is None
+    good.fit()
+    info = good.info
+
+    assert info.name == "VariableSlopeDoseResponse"
+    assert info.success and info.status in (1, 2, 3, 4)
+    assert (info.n, info.k) == (96, 4)
+    assert info.nfev > 0 and info.njev > 0
+    assert info.iterations == info.njev
+    assert 0 < info.model_time < info.elapsed
+    assert np.isclose(info.solver_time + info.model_time, info.elapsed)
+
+
+def test_finite_difference():
+    x = np.linspace(0, 10, 50)
+    good = Goodness(line, x, 2 * x - 1)
+    good.fit()
+    assert good.info.name == "line"
+    assert good.info.njev == 0 and good.info.nfev > 0
+    assert good.info.iterations == good.info.nfev // 3
+
+
+def test_failure():
+    good = _good()
+    with pytest.warns(UserWarning):
+        good.fit(p0=[1.0, 1.0, 1.0, 1.0], maxfev=2)
+    assert not good.info.success
+    assert good.info.status is None
+    assert "Optimal parameters not found" in good.info.message
+    assert np.isnan(good.best_fit).all()
+
+
+def test_hooks():
+    calls = []
+
+    @add_hook
+    def hook(good, info):
+        calls.append(("hook", info))
+
+    try:
+        good = _good()
+        good.fit(callback=lambda g, info: calls.append(("callback", info)))
+        assert [name for name, _ in calls] == ["hook", "callback"]
+        assert calls[0][1] is calls[1][1] is good.info
+    finally:
+        remove_hook(hook)
+
+    good.fit()
+    assert len(calls) == 2
+
+
+def test_telemetry():
+    with Telemetry() as telemetry:
+        with ThreadPoolExecutor(4) as executor:
+            goods = list(executor.map(lambda _: _good(), range(8)))
+            list(executor.map(lambda good: good.fit(), goods))
+        x = np.linspace(0, 10, 50)
+        Goodness(line, x, 2 * x - 1).fit()
+    _good().fit()
+
+    counters = telemetry["VariableSlopeDoseResponse"]
+    assert counters.fits == 8 and counters.failures == 0
+    assert counters.nfev == sum(good.info.nfev for good in goods)
+    assert np.isclose(counters.elapsed, sum(good.info.elapsed for good in goods))
+    assert counters.max_elapsed == max(good.info.elapsed for good in goods)
+    assert [c.name for c in telemetry.summary()] == ["VariableSlopeDoseResponse", "line"]
+
+    telemetry.reset()
+    assert telemetry.summary() == []
@@ -35,3 +35,80 @@ def test_line(x, m, b, expected):
 def test_linalg(x, y, expected):
     result = utils.regression(x, y)
     assert np.alltrue(np.isclose(result, expected))
+
+
+def test_linear_regression():
+    rng = np.random.default_rng(3)
+    x = np.linspace(0, 10, 50)
+    y = rng.normal(0, 1, (200, x.size)) + 2.0 * x - 1.0
+    w = rng.uniform(0.1, 1.0, y.shape)
+    y[0, [4, 9]] = np.nan
+    result = utils.linear_regression(x, y, w)
+    assert result.slope.shape == result.intercept_std.shape == (200,)
+    assert result.n[0] == 48 and result.n[1] == 50
+
+    for i in (0, 1, 199):
+        valid = np.isfinite(y[i])
+        params, cov = np.polyfit(x[valid], y[i, valid], 1, w=np.sqrt(w[i, valid]), cov="unscaled")
+        r = y[i, valid] - np.polyval(params, x[valid])
+        cov *= (w[i, valid] * r ** 2).sum() / (valid.sum() - 2)
+        assert np.allclose([result.slope[i], result.intercept[i]], params)
+        assert np.allclose([result.slope_std[i], result.intercept_std[i]], np.sqrt(np.diag(cov)))
+
+    # Weights apply to rows, a zero weight excluding the point entirely
+    y = 2.0 * x - 1.0
+    y[0] = 100.0
+    z = np.ones(x.size)
+    z[0] = 0.0
+    assert np.allclose(utils.regression(x, y, z), [2.0, -1.0])
+    assert np.isnan(utils.linear_regression(np.ones(5), np.arange(5.0)).slope)
+
+
+def test_weights():
+    assert np.array_equal(utils.weights(np.full(4, 0.5)), np.ones(4))
+    result = utils.weights(np.array([0.1, 0.2, np.nan, 0.4]))
+    assert np.isnan(result[2]) and result[0] == 1.0 and result[0] > result[1] > result[3] > 0
+
+
+@pytest.mark.parametrize("method", [utils.lttb, utils.minmax])
+def test_downsample(method):
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, 10_000)
+    y = np.sin(x)
+    result = method(x, y, 100)
+
+    assert 50 <= result.size <= 100
+    assert np.all(np.diff(x[result]) >= 0)
+    assert np.argmin(x) in result and np.argmax(x) in result
+    assert method(x[:50], y[:50], 100).size == 50
+
+
+def test_decimate():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 10_000)
+    residuals = rng.normal(0, 1, x.size)
+    residuals[[10, 5000]] = [40.0, -40.0]
+    keep = utils.outliers(residuals)
+    result = utils.decimate(x, x + residuals, 100, keep=keep)
+
+    assert 10 in keep and 5000 in keep
+    assert set(keep) <= set(result)
+    assert np.all(np.diff(result) > 0)
+
+
+def test_adaptive_grid():
+    def sigmoid(x):
+        return 1 / (1 + np.exp(-10 * (x - 5)))
+
+    grid = utils.adaptive_grid(sigmoid, 0, 10, size=500)
+    assert grid[0] == 0 and grid[-1] == 10
+    assert np.all(np.diff(grid) > 0)
+    assert grid.size <= 500
+
+    # Denser where the function is curved
+    spacing = np.diff(grid)
+    assert spacing[np.abs(grid[:-1] - 5) < 1].min() < spacing[np.abs(grid[:-1] - 5) > 3].min()
+    x = np.linspace(0, 10, 1001)
+    assert np.allclose(np.interp(x, grid, sigmoid(grid)), sigmoid(x), atol=5e-3)
+
+    assert utils.adaptive_grid(lambda x: 2 * x, 0, 10, initial=9).size == 9